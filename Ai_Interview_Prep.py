@@ -7,15 +7,14 @@ import os
 from typing import Tuple
 from PyPDF2 import PdfReader
 import docx
-import requests
-import json
+
+from llm.ollama_client import get_client
 
 # ------------------------------------------
 # CONFIG DEFAULTS
 # ------------------------------------------
 DEFAULT_MODEL = "llama3"
-OLLAMA_METHOD = "http"      # default to HTTP
-OLLAMA_HTTP_URL = "http://localhost:11434/api/generate"
+OLLAMA_METHOD = "http"      # default to HTTP (URL: config.OLLAMA_HTTP_URL)
 
 # ------------------------------------------
 # STREAMLIT PAGE CONFIG
@@ -138,38 +137,11 @@ Now generate the final formatted interview preparation following ALL rules above
 # ------------------------------------------
 def call_ollama_http(model_name: str, prompt_text: str, timeout: int = 300):
     """
-    Proper streaming-safe implementation for Ollama.
+    Streams from Ollama through the shared, pooled client.
     """
     try:
-        payload = {
-            "model": model_name,
-            "prompt": prompt_text,
-            "stream": True
-        }
-
-        r = requests.post(
-            OLLAMA_HTTP_URL,
-            json=payload,
-            timeout=timeout,
-            stream=True
-        )
-
-        if r.status_code != 200:
-            return False, f"[HTTP ERROR {r.status_code}: {r.text}]"
-
-        full = ""
-
-        for line in r.iter_lines():
-            if not line:
-                continue
-            try:
-                data = json.loads(line.decode("utf-8"))
-                if "response" in data:
-                    full += data["response"]
-            except:
-                continue
-
-        return True, full
+        # Failures already come back as (False, message)
+        return get_client().generate(model_name, prompt_text, timeout=timeout)
 
     except Exception as e:
         return False, f"[HTTP ERROR: {e}]"
@@ -1,16 +1,24 @@
 # app.py
 
 import streamlit as st
-import re
 
-from config import DEFAULT_MODEL
+from config import STT_RECORDING_MODE, STT_MAX_DURATION_SEC
 from loaders.file_loader import load_file_text
-from llm.prompt_builder import build_prompt
-from llm.ollama_client import call_ollama_http, call_ollama_cli
-from tts.speaker import speak_text
-from stt.whisper_stt import record_audio, transcribe
+from llm.prompt_builder import build_prompt_parts
+from llm.compaction import prepare_inputs
+from llm.generation_cache import generation_key, get_cached_generation, store_generation
+from tts.speaker import speak_text, prefetch
+from stt.whisper_stt import record_audio, record_until_silence, transcribe, warm_up
 from utils.storage import create_new_session
-from utils.storage import add_answer
+from utils.storage import add_answer, discard_session
+from llm.generation_job import GenerationJob
+from llm.router import primary_model, TASK_GENERATION
+from interview.question_bank import get_bank, format_report
+from interview.skill_matcher import fit_summary, format_fit_summary
+from interview.question_parser import parse_questions, SECTION_TECHNICAL, SECTION_BEHAVIORAL
+from utils.analytics import percentile_rank
+from utils.tracing import Tracer
+from llm.ollama_client import get_client
 import time
 
 
@@ -44,6 +52,27 @@ if "interview_started" not in st.session_state:
 if "session" not in st.session_state:
     st.session_state.session = None
 
+if "generation_job" not in st.session_state:
+    st.session_state.generation_job = None
+
+if "expected_count" not in st.session_state:
+    st.session_state.expected_count = 0
+
+if "candidate_name" not in st.session_state:
+    st.session_state.candidate_name = None
+
+# Per-stage timing spans, saved into session["meta"] at finalize
+if "tracer" not in st.session_state:
+    st.session_state.tracer = Tracer()
+
+# Models that condensed the inputs, saved into session["meta"]["models"]
+if "condense_models" not in st.session_state:
+    st.session_state.condense_models = []
+
+# Dictionary-based JD/resume skill overlap, shown while the report streams
+if "fit_summary" not in st.session_state:
+    st.session_state.fit_summary = None
+
 # Optional: since you don’t have role selection yet
 if "selected_role" not in st.session_state:
     st.session_state.selected_role = "Mock Interview Role"
@@ -58,18 +87,99 @@ if "phase" not in st.session_state:
 # ------------------------------------------
 if st.session_state.interview_started and st.session_state.session is None:
     st.session_state.session = create_new_session(
-        role=st.session_state.selected_role
+        role=st.session_state.selected_role,
+        candidate=st.session_state.candidate_name
     )
 
 
+# ------------------------------------------
+# DIAGNOSTICS (OPTIONAL)
+# ------------------------------------------
+if st.sidebar.checkbox("Show diagnostics", value=False):
+    spans = st.session_state.tracer.to_list()
+    st.sidebar.caption(f"{len(spans)} spans recorded")
+    if spans:
+        st.sidebar.dataframe(
+            [{"stage": s["name"], "ms": s["duration_ms"]} for s in spans],
+            use_container_width=True
+        )
+        st.sidebar.download_button(
+            "Download trace (JSONL)",
+            st.session_state.tracer.to_jsonl(),
+            file_name="trace.jsonl",
+            mime="application/x-ndjson"
+        )
+    st.sidebar.json(get_client().metrics, expanded=False)
+    st.sidebar.json(get_client().scheduler.status(), expanded=False)
+
+
 # ------------------------------------------
 # HELPERS
 # ------------------------------------------
-def extract_all_questions(model_output: str):
+def sync_questions_from_job():
+    """
+    Refreshes st.session_state.questions from the (possibly still running)
+    generation job, which parses typed question records as they complete.
+    """
+    job = st.session_state.generation_job
+    if job is None:
+        return
+
+    records = job.questions[:st.session_state.expected_count]
+    st.session_state.questions = [r.text for r in records]
+
+
+def start_interview():
+    # A fallback model would regenerate the questions from scratch; once
+    # the candidate is answering them the job fails instead
+    if st.session_state.generation_job is not None:
+        st.session_state.generation_job.lock_questions()
+        sync_questions_from_job()
+
+    if st.session_state.session is not None:
+        st.write("Session ID:", st.session_state.session["session_id"])
+
+    # Create fresh session
+    discard_session(st.session_state.session)
+    st.session_state.session = create_new_session(
+        role=st.session_state.selected_role,
+        candidate=st.session_state.candidate_name
+    )
+
+    # Reset interview state
+    st.session_state.current_q_index = 0
+    st.session_state.interview_started = True
+    st.session_state.phase = "instructions"
+    st.session_state.spoken = False
+    st.session_state.instructions_spoken = False
+
+    st.rerun()
+
+
+def remember_generation(cache_key, text):
+    """
+    Caches a finished report and adds its questions to the question bank.
+    """
+    store_generation(cache_key, text)
+    get_bank().add(parse_questions(text))
+
+
+def render_question_feedback(q):
     """
-    Extracts all numbered questions from the LLM output.
+    Renders one answered question and its evaluation.
     """
-    return re.findall(r"\n\d+\.\s+(.*)", model_output)
+    st.write("**Question:**", q["question"])
+    st.write("**Your Answer:**", q["answer_text"])
+
+    eval_data = q.get("evaluation", {})
+    if eval_data.get("status") == "failed":
+        st.warning(f"This answer could not be scored: {eval_data.get('error') or 'unknown error'}")
+    elif eval_data:
+        st.metric("Clarity", eval_data.get("clarity", 0))
+        st.metric("Confidence", eval_data.get("confidence", 0))
+        st.metric("Technical Depth", eval_data.get("technical_depth", 0))
+        st.write("**Strength:**", eval_data.get("strength", ""))
+        st.write("**Improvement:**", eval_data.get("improvement", ""))
 
 INSTRUCTION_TEXT = (
     "Before we begin, here is how the mock interview will work. "
@@ -88,6 +198,7 @@ with st.form("generation_form"):
     jd_text_area = st.text_area("Paste Job Description", height=200)
     jd_file = st.file_uploader("Or upload JD", type=["pdf", "docx", "txt"])
     resume_file = st.file_uploader("Upload Resume", type=["pdf", "docx", "txt"])
+    candidate_name = st.text_input("Candidate name (optional)")
 
     #model = st.text_input("Local model name", value=DEFAULT_MODEL)
     #method = st.selectbox("Ollama call method", ["http", "cli"])
@@ -96,6 +207,11 @@ with st.form("generation_form"):
     n_behavioral = st.slider("Behavioral questions", 0, 5, 2)
     difficulty = st.selectbox("Difficulty", ["mixed", "easy", "medium", "hard"])
     include_answers = st.checkbox("Include answer outlines", value=False)
+    force_regenerate = st.checkbox("Force regenerate (ignore cache)", value=False)
+    fast_mode = st.checkbox(
+        "⚡ Fast mode (reuse matching questions from the question bank, generate only the rest)",
+        value=False
+    )
 
     submitted = st.form_submit_button("Generate Interview")
 
@@ -103,8 +219,14 @@ with st.form("generation_form"):
 # GENERATE + DISPLAY (REVIEW PHASE)
 # ------------------------------------------
 if submitted:
-    jd_text = jd_text_area.strip() or load_file_text(jd_file)
-    resume_text = load_file_text(resume_file)
+    st.session_state.candidate_name = candidate_name.strip() or None
+    st.session_state.tracer = tracer = Tracer()
+    st.session_state.condense_models = []
+
+    with tracer.span("load", source="jd"):
+        jd_text = jd_text_area.strip() or load_file_text(jd_file)
+    with tracer.span("load", source="resume"):
+        resume_text = load_file_text(resume_file)
 
     if not jd_text:
         st.error("Please provide a Job Description.")
@@ -114,65 +236,156 @@ if submitted:
         st.error("Please upload a resume.")
         st.stop()
 
-    prompt = build_prompt(
+    # Matched on the original texts, before any compaction
+    with tracer.span("skills") as skills_span:
+        st.session_state.fit_summary = skills = fit_summary(jd_text, resume_text)
+        skills_span["coverage_pct"] = skills["coverage_pct"]
+
+    cache_key = generation_key(
         jd_text,
         resume_text,
         n_technical,
         n_behavioral,
         difficulty,
-        include_answers
+        include_answers,
+        primary_model(TASK_GENERATION)
     )
+    output = None if force_regenerate else get_cached_generation(cache_key)
+
+    banked = []
+    if output is None and fast_mode:
+        with tracer.span("bank") as bank_span:
+            banked = get_bank().select(jd_text, resume_text, n_technical, n_behavioral, difficulty)
+            bank_span["questions"] = len(banked)
+    gap_technical = n_technical - sum(q.section == SECTION_TECHNICAL for q in banked)
+    gap_behavioral = n_behavioral - sum(q.section == SECTION_BEHAVIORAL for q in banked)
+
+    if output is not None:
+        st.caption("⚡ Loaded from cache — tick “Force regenerate” for a fresh set.")
+        job = GenerationJob.completed(output)
+    elif banked and not gap_technical and not gap_behavioral:
+        st.caption("⚡ Assembled from the question bank — untick “Fast mode” for a freshly generated set.")
+        job = GenerationJob.completed(format_report(banked, include_answers))
+    else:
+        if banked:
+            st.caption(
+                f"⚡ {len(banked)} questions from the question bank; "
+                f"generating {gap_technical + gap_behavioral} more."
+            )
 
-    #st.subheader("🧠 LLM Prompt (Preview)")
-    #st.code(prompt[:1500] + ("..." if len(prompt) > 1500 else ""))
-
-    
-    ok, output = call_ollama_http(DEFAULT_MODEL, prompt)
-
-    if not ok:
-        st.error(output)
-        st.stop()
+        with st.spinner("Preparing inputs..."), tracer.span("build") as build_span:
+            jd_text, resume_text, savings = prepare_inputs(jd_text, resume_text)
+            build_span.update(savings)
+        st.session_state.condense_models = savings["condense_models"]
 
-    # Display everything (silent)
-    st.subheader("📋 Interview Preparation")
-    st.markdown(output)
+        st.caption(
+            f"Input tokens: ~{savings['original_tokens']} → ~{savings['final_tokens']} "
+            f"(saved {savings['saved_pct']}%"
+            + (", condensed" if savings["condensed"] else "")
+            + ")"
+        )
 
-    # Parse and store questions
-    all_questions = extract_all_questions(output)
+        # Stable prefix (instructions + JD + resume) is reused by Ollama
+        # across regenerations; only the parameters suffix changes
+        with tracer.span("build", step="prompt"):
+            prompt_prefix, prompt_suffix = build_prompt_parts(
+                jd_text,
+                resume_text,
+                gap_technical,
+                gap_behavioral,
+                difficulty,
+                include_answers,
+                avoid=[q.text for q in banked],
+                skills=skills,
+                tech_start=n_technical - gap_technical + 1,
+                behav_start=n_behavioral - gap_behavioral + 1
+            )
 
-    expected_count = n_technical + n_behavioral
-    st.session_state.questions = all_questions[:expected_count]
+        #st.subheader("🧠 LLM Prompt (Preview)")
+        #st.code(prompt_prefix[:1500] + ("..." if len(prompt_prefix) > 1500 else ""))
+
+        # A gap-filling report isn't the full request, so it only feeds the bank
+        if banked:
+            on_complete = lambda text: get_bank().add(parse_questions(text))
+        else:
+            on_complete = lambda text: remember_generation(cache_key, text)
+
+        job = GenerationJob(
+            None,
+            prompt_suffix,
+            prefix=prompt_prefix,
+            on_complete=on_complete,
+            tracer=tracer,
+            seed_text=format_report(banked, include_answers) if banked else "",
+            seed_questions=banked
+        ).start()
+
+    st.session_state.generation_job = job
+    st.session_state.expected_count = n_technical + n_behavioral
+    st.session_state.questions = []
     st.session_state.phase = "review"
     st.session_state.current_q_index = 0
     st.session_state.spoken = False
 
 
 # ------------------------------------------
-# START MOCK INTERVIEW BUTTON (AFTER REVIEW)
+# STREAMED REPORT + START MOCK INTERVIEW (REVIEW PHASE)
 # ------------------------------------------
+# The report is rendered as tokens arrive; the start button unlocks as
+# soon as the first complete question is in, while generation continues
+# in the background.
+if st.session_state.generation_job is not None and st.session_state.phase == "review":
+    job = st.session_state.generation_job
 
-if st.session_state.questions and st.session_state.phase == "review":
-    st.divider()
-
-    if st.button("🎙 Start Mock Interview"):
-        if st.session_state.session is not None:
-            st.write("Session ID:", st.session_state.session["session_id"])
+    if st.session_state.fit_summary is not None:
+        st.subheader("🧩 Skill Match")
+        st.markdown(format_fit_summary(st.session_state.fit_summary))
 
-        # Create fresh session
-        st.session_state.session = create_new_session(
-            role=st.session_state.selected_role
+    st.subheader("📋 Interview Preparation")
+    report = st.empty()
+    st.divider()
+    start_slot = st.empty()
+
+    start_clicked = False
+    button_shown = False
+
+    while True:
+        if job.queue_position and not job.parts:
+            report.info(f"⏳ Waiting for the model: position {job.queue_position} in queue")
+        else:
+            report.markdown(job.text)
+        sync_questions_from_job()
+
+        if st.session_state.questions and not button_shown:
+            # Interview is one click away: load Whisper and synthesize the
+            # opening speech in the background
+            warm_up()
+            prefetch(INSTRUCTION_TEXT)
+            prefetch(st.session_state.questions[0])
+            start_clicked = start_slot.button("🎙 Start Mock Interview", key="start_interview")
+            button_shown = True
+
+        if start_clicked or job.done:
+            break
+        job.wait(0.2)
+
+    if job.error:
+        st.error(job.error)
+    elif job.done and job.stats:
+        st.caption(
+            f"{job.stats.get('model')} · prompt eval: {job.stats.get('prompt_eval_count', 0)} tokens in "
+            f"{job.stats.get('prompt_eval_duration', 0) / 1e9:.2f}s"
         )
+        if job.stats.get("fallbacks"):
+            st.caption(
+                "Fell back from " + ", ".join(f["model"] for f in job.stats["fallbacks"])
+                + " (slow or unavailable)"
+            )
+    elif job.done and not st.session_state.questions:
+        st.warning("No questions could be parsed from the model output.")
 
-        # Reset interview state
-        st.session_state.current_q_index = 0
-        st.session_state.interview_started = True
-        st.session_state.phase = "instructions"
-        st.session_state.spoken = False
-        st.session_state.instructions_spoken = False
-
-        st.rerun()
-
-
+    if start_clicked:
+        start_interview()
 
 
 # ------------------------------------------
@@ -182,10 +395,11 @@ if st.session_state.phase == "instructions":
 
     st.subheader("📢 Interview Instructions")
     st.write(INSTRUCTION_TEXT)
+    warm_up()
 
     # Speak instructions only once
     if not st.session_state.instructions_spoken:
-        speak_text(INSTRUCTION_TEXT)
+        speak_text(INSTRUCTION_TEXT, tracer=st.session_state.tracer)
         st.session_state.instructions_spoken = True
 
     if st.button("Continue to Interview"):
@@ -197,8 +411,16 @@ if st.session_state.phase == "instructions":
 # MOCK INTERVIEW PHASE (VOICE STARTS HERE)
 # ------------------------------------------
 if st.session_state.phase == "interview":
+    sync_questions_from_job()
     questions = st.session_state.questions
     q_idx = st.session_state.current_q_index
+    job = st.session_state.generation_job
+
+    if q_idx >= len(questions) and job is not None and not job.done:
+        # Candidate caught up with the generator; wait for the next question
+        with st.spinner("Preparing the next question..."):
+            job.wait(0.5)
+        st.rerun()
 
     if q_idx < len(questions):
         question = questions[q_idx]
@@ -208,18 +430,34 @@ if st.session_state.phase == "interview":
 
         # Speak only once per question
         if not st.session_state.spoken:
-            speak_text(question)
+            speak_text(question, tracer=st.session_state.tracer)
             st.session_state.spoken = True
 
+            # Synthesize the next question while the candidate answers this one
+            if q_idx + 1 < len(questions):
+                prefetch(questions[q_idx + 1])
+
         st.subheader("🧑 Your Answer")
         if "last_answer" not in st.session_state and st.button("Start Recording"):
-            st.info("Recording... Speak now.")
-
             start_time = time.time()
-            audio_path = record_audio(duration=60)
-            transcript = transcribe(audio_path)
+            stt_stats = {}
+            if STT_RECORDING_MODE == "vad":
+                st.info("Recording... Speak now. Recording stops when you pause.")
+                transcript = record_until_silence(stats=stt_stats)
+            else:
+                st.info("Recording... Speak now.")
+                audio = record_audio(duration=STT_MAX_DURATION_SEC)
+                transcript = transcribe(audio, stats=stt_stats)
             duration_sec = round(time.time() - start_time, 2)
 
+            st.session_state.tracer.add(
+                "transcribe",
+                stt_stats.get("transcribe_sec", 0) * 1000,
+                question=q_idx,
+                mode=STT_RECORDING_MODE,
+                **stt_stats
+            )
+
             st.session_state.last_answer = transcript
             st.session_state.last_duration = duration_sec
 
@@ -242,7 +480,8 @@ if st.session_state.phase == "interview":
                 question=question,
                 answer_text=st.session_state.last_answer,
                 duration_sec=st.session_state.last_duration,
-                transcript_conf=1.0  # placeholder for now
+                transcript_conf=1.0,  # placeholder for now
+                tracer=st.session_state.tracer
                 )
 
             # Move to next question
@@ -260,7 +499,33 @@ if st.session_state.phase == "interview":
     else:
         from utils.storage import finalize_session
 
-        path = finalize_session(st.session_state.session)
+        if job is not None and job.error:
+            st.warning(f"Question generation stopped early: {job.error}")
+
+        st.subheader("📝 Evaluating your answers...")
+        total = len(st.session_state.session["questions"])
+        progress = st.progress(0.0)
+        cards = st.container()
+        completed = []
+
+        def show_result(idx, q):
+            completed.append(idx)
+            progress.progress(len(completed) / max(total, 1))
+            with cards.expander(f"Question {idx + 1}"):
+                render_question_feedback(q)
+
+        job = st.session_state.generation_job
+        st.session_state.session["meta"]["models"] = {
+            "generation": job.stats.get("model", "cache") if job is not None else None,
+            "generation_fallbacks": job.stats.get("fallbacks", []) if job is not None else [],
+            "condense": st.session_state.condense_models,
+        }
+
+        path = finalize_session(
+            st.session_state.session,
+            on_result=show_result,
+            tracer=st.session_state.tracer
+        )
 
         st.success("🎉 Mock Interview Complete")
         st.write("Great job completing the interview!")
@@ -291,6 +556,14 @@ if st.session_state.phase == "feedback":
     col3.metric("Technical Depth ( /10)", feedback.get("avg_technical_depth", 0))
     col4.metric("Overall Score ( /10)", feedback.get("overall_score", 0))
 
+    if feedback:
+        rank = percentile_rank(feedback.get("overall_score", 0), role=session.get("role"))
+        st.caption(f"Scored at or above {rank}% of finalized sessions for this role.")
+    if feedback.get("failed_evaluations"):
+        st.warning(
+            f"{feedback['failed_evaluations']} answer(s) could not be scored and are left out of the averages."
+        )
+
     st.divider()
 
     # -------------------------
@@ -323,16 +596,7 @@ if st.session_state.phase == "feedback":
 
     for idx, q in enumerate(session["questions"], start=1):
         with st.expander(f"Question {idx}"):
-            st.write("**Question:**", q["question"])
-            st.write("**Your Answer:**", q["answer_text"])
-
-            eval_data = q.get("evaluation", {})
-            if eval_data:
-                st.metric("Clarity", eval_data.get("clarity", 0))
-                st.metric("Confidence", eval_data.get("confidence", 0))
-                st.metric("Technical Depth", eval_data.get("technical_depth", 0))
-                st.write("**Strength:**", eval_data.get("strength", ""))
-                st.write("**Improvement:**", eval_data.get("improvement", ""))
+            render_question_feedback(q)
 
     st.divider()
 
@@ -340,161 +604,6 @@ if st.session_state.phase == "feedback":
     # ACTION BUTTONS
     # -------------------------
     if st.button("🔁 Start New Interview"):
+        discard_session(st.session_state.session)
         st.session_state.clear()
         st.rerun()
-
-# ------------------------------------------
-# HELPERS
-# ------------------------------------------
-def extract_all_questions(model_output: str):
-    """
-    Extracts all numbered questions from the LLM output.
-    """
-    return re.findall(r"\n\d+\.\s+(.*)", model_output)
-
-INSTRUCTION_TEXT = (
-    "Before we begin, here is how the mock interview will work. "
-    "I will ask you one question at a time. "
-    "After each question, click the start recording button and you will have up to one minute to answer. "
-    "Once you finish answering, press the continue button to move to the next question. "
-    "When you are ready, we will begin with the first question."
-)
-
-
-
-# ------------------------------------------
-# INPUT FORM (GENERATION)
-# ------------------------------------------
-with st.form("generation_form"):
-    jd_text_area = st.text_area("Paste Job Description", height=200)
-    jd_file = st.file_uploader("Or upload JD", type=["pdf", "docx", "txt"])
-    resume_file = st.file_uploader("Upload Resume", type=["pdf", "docx", "txt"])
-
-    model = st.text_input("Local model name", value=DEFAULT_MODEL)
-    method = st.selectbox("Ollama call method", ["http", "cli"])
-
-    n_technical = st.slider("Technical questions", 1, 10, 5)
-    n_behavioral = st.slider("Behavioral questions", 0, 5, 2)
-    difficulty = st.selectbox("Difficulty", ["mixed", "easy", "medium", "hard"])
-    include_answers = st.checkbox("Include answer outlines", value=False)
-
-    submitted = st.form_submit_button("Generate Interview")
-
-# ------------------------------------------
-# GENERATE + DISPLAY (REVIEW PHASE)
-# ------------------------------------------
-if submitted:
-    jd_text = jd_text_area.strip() or load_file_text(jd_file)
-    resume_text = load_file_text(resume_file)
-
-    if not jd_text:
-        st.error("Please provide a Job Description.")
-        st.stop()
-
-    if not resume_text:
-        st.error("Please upload a resume.")
-        st.stop()
-
-    prompt = build_prompt(
-        jd_text,
-        resume_text,
-        n_technical,
-        n_behavioral,
-        difficulty,
-        include_answers
-    )
-
-    st.subheader("🧠 LLM Prompt (Preview)")
-    st.code(prompt[:1500] + ("..." if len(prompt) > 1500 else ""))
-
-    if method == "cli":
-        ok, output = call_ollama_cli(model, prompt)
-    else:
-        ok, output = call_ollama_http(model, prompt)
-
-    if not ok:
-        st.error(output)
-        st.stop()
-
-    # Display everything (silent)
-    st.subheader("📋 Interview Preparation")
-    st.markdown(output)
-
-    # Parse and store questions
-    st.session_state.questions = extract_all_questions(output)
-    st.session_state.phase = "review"
-    st.session_state.current_q_index = 0
-    st.session_state.spoken = False
-
-# ------------------------------------------
-# START MOCK INTERVIEW BUTTON (AFTER REVIEW)
-# ------------------------------------------
-if st.session_state.questions and st.session_state.phase == "review":
-    st.divider()
-    if st.button("🎙 Start Mock Interview"):
-        st.session_state.phase = "instructions"
-        st.rerun()
-
-# ------------------------------------------
-# INSTRUCTION PHASE (VOICE STARTS HERE)
-# ------------------------------------------
-if st.session_state.phase == "instructions":
-
-    st.subheader("📢 Interview Instructions")
-    st.write(INSTRUCTION_TEXT)
-
-    # Speak instructions only once
-    if not st.session_state.instructions_spoken:
-        speak_text(INSTRUCTION_TEXT)
-        st.session_state.instructions_spoken = True
-
-    if st.button("Continue to Interview"):
-        st.session_state.phase = "interview"
-        st.session_state.spoken = False
-        st.rerun()
-
-# ------------------------------------------
-# MOCK INTERVIEW PHASE (VOICE STARTS HERE)
-# ------------------------------------------
-if st.session_state.phase == "interview":
-    questions = st.session_state.questions
-    q_idx = st.session_state.current_q_index
-
-    if q_idx < len(questions):
-        question = questions[q_idx]
-
-        st.subheader(f"🎙 Interviewer — Question {q_idx + 1}")
-        st.write(question)
-
-        # Speak only once per question
-        if not st.session_state.spoken:
-            speak_text(question)
-            st.session_state.spoken = True
-
-        st.subheader("🧑 Your Answer")
-        if "last_answer" not in st.session_state and st.button("Start Recording"):
-            st.info("Recording... Speak now.")
-            audio_path = record_audio(duration=60)
-            transcript = transcribe(audio_path)
-
-            st.session_state.last_answer = transcript
-            st.success("Recording complete")
-
-        if "last_answer" in st.session_state:
-            st.text_area(
-                "Transcribed Answer",
-                value=st.session_state.last_answer,
-                height=150,
-                key=f"transcript_{q_idx}"
-            )
-
-        if st.button("Next Question"):
-            st.session_state.current_q_index += 1
-            st.session_state.spoken = False
-            st.session_state.pop("last_answer", None)  # 👈 ADD THIS
-            st.rerun()
-
-
-    else:
-        st.success("🎉 Mock Interview Complete")
-        st.write("Great job completing the interview!")
@@ -0,0 +1,144 @@
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def sample_report(n_tech: int = 5, n_behav: int = 2, include_answers: bool = True) -> str:
+    """
+    A Format B report shaped like real llama3 output.
+    """
+    lines = [
+        "### Candidate Fit Summary",
+        "- Strong fit: 6 years of Python backend work, Kafka and PostgreSQL at scale",
+        "- Weak fit: limited Kubernetes exposure",
+        "",
+        "---",
+        "",
+        f"### Technical Questions (Mandatory: Generate exactly {n_tech})",
+    ]
+    for i in range(1, n_tech + 1):
+        lines += [
+            f"{i}. How would you design component {i} of a high-throughput ingestion pipeline in Python?",
+            "- Difficulty: medium",
+            "- Follow-up: How would you handle back-pressure and retries?",
+        ]
+        if include_answers:
+            lines += [
+                "- Expected Answer Outline:",
+                "  - Partition the stream by key",
+                "  - Idempotent consumers",
+                "  - Dead-letter queue for poison messages",
+            ]
+        lines.append("")
+    lines += ["---", "", f"### Behavioral Questions (Mandatory: Generate exactly {n_behav})"]
+    for i in range(1, n_behav + 1):
+        lines += [
+            f"{i}. Tell me about a time you disagreed with a technical decision ({i}).",
+            "- Follow-up: What would you do differently now?",
+            "",
+        ]
+    return "\n".join(lines)
+
+
+EVALUATION_REPLY = (
+    'Sure! Here is my evaluation:\n'
+    '{"clarity": 7, "confidence": 6, "technical_depth": 8, '
+    '"strength": "Concrete example", "improvement": "Quantify the impact"}\n'
+    'Let me know if you need anything else.'
+)
+
+
+def _tokens(text: str) -> list:
+    return re.findall(r"\s*\S+", text)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        server = self.server
+
+        if body.get("model") in server.missing_models:
+            # What Ollama answers for a model that isn't pulled
+            payload = json.dumps({"error": f"model '{body['model']}' not found"}).encode()
+            self.send_response(404)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+            return
+
+        prompt = body.get("prompt", "")
+        reply = EVALUATION_REPLY if "interview evaluator" in prompt or "Answer:" in prompt else server.response
+        tokens = _tokens(reply)
+        final = {
+            "model": body.get("model"),
+            "done": True,
+            "context": list(range(len(prompt) // 4)),
+            "prompt_eval_count": len(prompt) // 4,
+            "prompt_eval_duration": int(server.latency * 1e9),
+            "eval_count": len(tokens),
+            "eval_duration": int(len(tokens) / server.tokens_per_sec * 1e9) if server.tokens_per_sec else 0,
+        }
+
+        time.sleep(server.latency)
+
+        if body.get("stream") is False:
+            payload = json.dumps({**final, "response": reply}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+            return
+
+        delay = 1.0 / server.tokens_per_sec if server.tokens_per_sec else 0.0
+        try:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for token in tokens:
+                self._chunk(json.dumps({"model": body.get("model"), "response": token, "done": False}))
+                if delay:
+                    time.sleep(delay)
+            self._chunk(json.dumps(final))
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            # Client gave up (deadline / cancelled stream); Ollama stops
+            # generating at this point
+            server.dropped += 1
+            self.close_connection = True
+
+    def _chunk(self, line: str):
+        data = (line + "\n").encode()
+        self.wfile.write(f"{len(data):X}\r\n".encode() + data + b"\r\n")
+
+
+def start_fake_ollama(tokens_per_sec: float = 0, latency: float = 0.0, response: str = None, missing_models=()):
+    """
+    Starts a local stand-in for /api/generate on a free port.
+
+    tokens_per_sec = 0 streams as fast as possible; requests for a model in
+    missing_models get Ollama's 404 "not found" error. Returns (server, url);
+    call server.shutdown() when done.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.daemon_threads = True
+    server.tokens_per_sec = tokens_per_sec
+    server.latency = latency
+    server.response = response if response is not None else sample_report()
+    server.missing_models = set(missing_models)
+    # Streams the client disconnected from before the end
+    server.dropped = 0
+
+    threading.Thread(target=server.serve_forever, daemon=True, name="fake-ollama").start()
+    host, port = server.server_address
+    return server, f"http://{host}:{port}/api/generate"
@@ -0,0 +1,336 @@
+"""
+Offline component benchmarks.
+
+    python -m benchmarks.run_benchmarks --out bench.json
+    python -m benchmarks.run_benchmarks --compare bench.json
+
+All LLM traffic goes to a local fake Ollama server, so no network or
+model is needed. Results are written as JSON for comparison across commits.
+"""
+import argparse
+import io
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from benchmarks.fake_ollama import sample_report, start_fake_ollama, EVALUATION_REPLY
+
+WORDS = (
+    "python kafka postgres latency throughput design ownership mentoring api "
+    "distributed systems reliability on-call migration observability team"
+).split()
+
+
+def timed(fn, repeat: int, setup=None):
+    """
+    Runs fn `repeat` times and returns timing stats in milliseconds.
+    """
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {
+        "repeat": repeat,
+        "min_ms": round(min(samples), 3),
+        "median_ms": round(statistics.median(samples), 3),
+        "mean_ms": round(statistics.fmean(samples), 3),
+    }
+
+
+def lorem(n_words: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    lines, line = [], []
+    for _ in range(n_words):
+        line.append(rng.choice(WORDS))
+        if len(line) == 12:
+            lines.append(" ".join(line))
+            line = []
+    lines.append(" ".join(line))
+    return "\n".join(lines)
+
+
+def make_pdf(pages) -> bytes:
+    """
+    Minimal text-only PDF (one Helvetica text block per page).
+    """
+    objects = []
+    n_pages = len(pages)
+    page_ids = [3 + 2 * i for i in range(n_pages)]
+    font_id = 3 + 2 * n_pages
+
+    objects.append("<< /Type /Catalog /Pages 2 0 R >>")
+    objects.append(f"<< /Type /Pages /Kids [{' '.join(f'{p} 0 R' for p in page_ids)}] /Count {n_pages} >>")
+    for i, text in enumerate(pages):
+        lines = [ln.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") for ln in text.splitlines()]
+        stream = "BT /F1 10 Tf 12 TL 50 780 Td " + " ".join(f"({ln}) '" for ln in lines) + " ET"
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 {font_id} 0 R >> >> /Contents {page_ids[i] + 1} 0 R >>"
+        )
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+    objects.append("<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for num, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(f"{num} 0 obj\n{body}\nendobj\n".encode("latin-1"))
+    xref = out.tell()
+    out.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode())
+    for off in offsets:
+        out.write(f"{off:010d} 00000 n \n".encode())
+    out.write(f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode())
+    return out.getvalue()
+
+
+def make_docx(n_paragraphs: int) -> bytes:
+    import docx
+
+    doc = docx.Document()
+    for i in range(n_paragraphs):
+        doc.add_paragraph(lorem(40, seed=i))
+    out = io.BytesIO()
+    doc.save(out)
+    return out.getvalue()
+
+
+class FakeUpload:
+    """
+    Stands in for Streamlit's UploadedFile.
+    """
+
+    def __init__(self, data: bytes, mime: str):
+        self._data = data
+        self.type = mime
+
+    def getvalue(self):
+        return self._data
+
+
+def bench_build_prompt(repeat):
+    from llm.prompt_builder import build_prompt
+
+    jd, resume = lorem(1500, seed=1), lorem(2500, seed=2)
+    return timed(lambda: build_prompt(jd, resume, 10, 5, "mixed", True), repeat)
+
+
+def bench_ollama_client(repeat, tokens_per_sec, latency):
+    from llm.ollama_client import OllamaClient
+
+    report = sample_report(10, 5)
+    results = {}
+
+    # Parsing overhead: server streams as fast as it can
+    server, url = start_fake_ollama(response=report)
+    client = OllamaClient(url=url)
+    try:
+        results["parse_overhead"] = timed(lambda: client.generate("fake", "prompt"), repeat)
+    finally:
+        server.shutdown()
+
+    # Realistic stream: time to first token and total
+    server, url = start_fake_ollama(tokens_per_sec=tokens_per_sec, latency=latency, response=report)
+    client = OllamaClient(url=url)
+    try:
+        ttft = []
+
+        def run():
+            start = time.perf_counter()
+            first = None
+            for _ in client.stream("fake", "prompt"):
+                if first is None:
+                    first = time.perf_counter() - start
+            ttft.append(first * 1000)
+
+        stats = timed(run, max(1, repeat // 10))
+        stats["ttft_median_ms"] = round(statistics.median(ttft), 3)
+        stats["tokens_per_sec"] = tokens_per_sec
+        stats["latency_sec"] = latency
+        results["stream"] = stats
+    finally:
+        server.shutdown()
+    return results
+
+
+def bench_parse_questions(repeat):
+    from interview.question_parser import FormatBStreamParser, parse_questions
+
+    report = sample_report(10, 5)
+    chunks = [report[i:i + 4] for i in range(0, len(report), 4)]
+
+    def streamed():
+        parser = FormatBStreamParser()
+        for chunk in chunks:
+            parser.feed(chunk)
+        parser.close()
+
+    return {
+        "whole_text": timed(lambda: parse_questions(report), repeat),
+        "streamed_4_char_chunks": timed(streamed, repeat),
+    }
+
+
+def bench_evaluation_json(repeat):
+    from utils.evaluator import parse_evaluation
+
+    return timed(lambda: parse_evaluation(EVALUATION_REPLY), repeat)
+
+
+def bench_load_file_text(repeat):
+    from loaders import file_loader
+
+    pdf = FakeUpload(make_pdf([lorem(300, seed=p) for p in range(30)]), "application/pdf")
+    docx_file = FakeUpload(
+        make_docx(200),
+        "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+    )
+
+    def cold():
+        file_loader._memo._items.clear()
+
+    results = {}
+    for name, upload in (("pdf_30_pages", pdf), ("docx_200_paragraphs", docx_file)):
+        results[f"{name}_cold"] = timed(lambda: file_loader.load_file_text(upload), max(1, repeat // 10), setup=cold)
+        results[f"{name}_memoized"] = timed(lambda: file_loader.load_file_text(upload), repeat)
+    return results
+
+
+def bench_aggregate_feedback(repeat, n_questions=10_000):
+    from utils.aggregator import aggregate_feedback
+
+    rng = random.Random(0)
+    questions = [
+        {
+            "evaluation": {
+                "clarity": rng.randint(0, 10),
+                "confidence": rng.randint(0, 10),
+                "technical_depth": rng.randint(0, 10),
+                "strength": rng.choice(WORDS),
+                "improvement": rng.choice(WORDS),
+            }
+        }
+        for _ in range(n_questions)
+    ]
+    stats = timed(lambda: aggregate_feedback(questions), repeat)
+    stats["n_questions"] = n_questions
+    return stats
+
+
+def bench_question_bank(repeat, n_questions=5000):
+    from interview.question_bank import QuestionBank
+    from interview.question_parser import QuestionRecord
+
+    rng = random.Random(0)
+    records = [
+        QuestionRecord(
+            section=rng.choice(("technical", "technical", "behavioral")),
+            number=i,
+            text=" ".join(rng.choice(WORDS) for _ in range(12)) + f" q{i}?",
+            difficulty=rng.choice(("easy", "medium", "hard")),
+        )
+        for i in range(n_questions)
+    ]
+    jd, resume = lorem(1500, seed=1), lorem(2500, seed=2)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        bank = QuestionBank(f"{tmp}/bank.db")
+        start = time.perf_counter()
+        added = bank.add(records)
+        add_ms = (time.perf_counter() - start) * 1000
+
+        stats = timed(lambda: bank.select(jd, resume, 10, 5, "mixed"), repeat)
+    stats.update({"n_questions": n_questions, "added": added, "add_all_ms": round(add_ms, 1)})
+    return stats
+
+
+def bench_skill_match(repeat):
+    from interview.skill_matcher import SKILL_GROUPS, fit_summary
+
+    rng = random.Random(0)
+    aliases = [alias for skills in SKILL_GROUPS.values() for names in skills.values() for alias in names]
+
+    def document(n_words):
+        return " ".join(rng.choice(aliases) if rng.random() < 0.05 else rng.choice(WORDS) for _ in range(n_words))
+
+    jd, resume = document(1500), document(2500)
+    return timed(lambda: fit_summary(jd, resume), repeat)
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current, baseline):
+    """
+    Prints median ratios (current / baseline) for every shared benchmark.
+    """
+    def flatten(results, prefix=""):
+        for name, value in results.items():
+            if isinstance(value, dict) and "median_ms" not in value:
+                yield from flatten(value, f"{prefix}{name}.")
+            elif isinstance(value, dict):
+                yield f"{prefix}{name}", value["median_ms"]
+
+    base = dict(flatten(baseline["results"]))
+    for name, median in flatten(current["results"]):
+        if name in base and base[name]:
+            print(f"{name:55s} {base[name]:10.3f} -> {median:10.3f} ms  x{median / base[name]:.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline component benchmarks")
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--tokens-per-sec", type=float, default=200)
+    parser.add_argument("--latency", type=float, default=0.05, help="fake server latency before the first token (s)")
+    parser.add_argument("--out", help="write results JSON here (default: stdout)")
+    parser.add_argument("--compare", help="baseline results JSON to compare against")
+    args = parser.parse_args()
+
+    results = {
+        "build_prompt": bench_build_prompt(args.repeat),
+        "ollama_client": bench_ollama_client(args.repeat, args.tokens_per_sec, args.latency),
+        "parse_questions": bench_parse_questions(args.repeat),
+        "evaluation_json": bench_evaluation_json(args.repeat),
+        "load_file_text": bench_load_file_text(args.repeat),
+        "aggregate_feedback": bench_aggregate_feedback(max(1, args.repeat // 5)),
+        "question_bank_select": bench_question_bank(args.repeat),
+        "skill_match": bench_skill_match(args.repeat),
+    }
+    report = {
+        "commit": git_commit(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(report, json.load(f))
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+    elif not args.compare:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
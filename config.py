@@ -2,3 +2,118 @@ DEFAULT_MODEL = "llama3"
 
 OLLAMA_METHOD = "http"
 OLLAMA_HTTP_URL = "http://localhost:11434/api/generate"
+
+# Shared keep-alive connection pool for the Ollama HTTP client.
+# Roughly the number of concurrent calls the Ollama host should see.
+OLLAMA_POOL_SIZE = 8
+
+# Answers evaluated in parallel at the end of an interview.
+# Match this to the Ollama server's OLLAMA_NUM_PARALLEL slots.
+EVAL_CONCURRENCY = 4
+
+# Evaluate answers while the interview runs, overlapping the LLM work with
+# the candidate answering the next questions: each answer is scored in the
+# background as soon as it is saved. Answers saved while the previous one
+# is still being scored are batched and sent when it finishes.
+EVAL_IN_BACKGROUND = True
+
+# Most answers scored per LLM call (when the combined transcripts fit the
+# model's context). finalize_session batches whatever is left over the
+# same way; 1 scores every answer on its own.
+EVAL_BATCH_SIZE = 5
+
+# Context window of the evaluation model, used to decide whether a batch fits.
+MODEL_CONTEXT_TOKENS = 8192
+
+# On-disk caches (generated reports, ...)
+CACHE_DIR = "cache"
+GENERATION_CACHE_MAX_MB = 200
+GENERATION_CACHE_MAX_AGE_DAYS = 30
+
+# Memoised answer evaluations: in-memory LRU size, plus an optional disk tier
+EVAL_CACHE_SIZE = 2048
+EVAL_CACHE_DISK = True
+EVAL_CACHE_MAX_MB = 50
+EVAL_CACHE_MAX_AGE_DAYS = 90
+
+# Speech-to-text (faster-whisper), loaded lazily once per process
+WHISPER_MODEL_SIZE = "base"
+WHISPER_DEVICE = "cpu"
+WHISPER_COMPUTE_TYPE = "int8"
+WHISPER_CPU_THREADS = 0   # 0 = library default
+
+# Answer recording: "vad" stops after trailing silence and transcribes while
+# the candidate talks; "fixed" records the full STT_MAX_DURATION_SEC window.
+STT_RECORDING_MODE = "vad"
+STT_MAX_DURATION_SEC = 60
+STT_TRAILING_SILENCE_SEC = 2.5
+STT_VAD_THRESHOLD = 0.01     # RMS level (float32 audio) that counts as speech
+STT_CHUNK_SEC = 8            # target length of chunks handed to Whisper
+STT_ARCHIVE_DIR = None       # e.g. "recordings" to keep each answer as WAV
+
+# Text-to-speech: "auto" picks the first available of "say" (macOS) and
+# "espeak-ng" (Linux). Synthesized audio is cached on disk by text + voice.
+TTS_BACKEND = "auto"
+TTS_VOICE = None
+TTS_CACHE_MAX_MB = 100
+TTS_CACHE_MAX_AGE_DAYS = 30
+
+# Document loading
+LOADER_CACHE_SIZE = 64            # uploads memoized by content hash
+LOADER_MAX_PAGES = 40
+LOADER_MAX_CHARS = 200_000
+LOADER_PROBE_PAGES = 3            # no text in these -> treat PDF as image-only
+
+# Prompt input compaction: JD + resume are condensed (map-reduce over
+# chunks) when they still exceed this many tokens after cleanup.
+INPUT_TOKEN_BUDGET = 3000
+CONDENSE_CHUNK_TOKENS = 1200
+CONDENSE_CONCURRENCY = 4
+
+# Keep the model loaded between calls, so Ollama's KV cache for a shared
+# prompt prefix (instructions + JD + resume, evaluator preamble) survives.
+OLLAMA_KEEP_ALIVE = "30m"
+
+# Session storage: SQLite (WAL) is the primary store; finalized sessions
+# are also exported as sessions/session_<id>.json when enabled.
+SESSIONS_DB_PATH = "sessions/sessions.db"
+SESSION_JSON_EXPORT = True
+
+# Headless batch generation (python -m llm.batch_generate): parallel
+# generations sent to Ollama at once.
+BATCH_CONCURRENCY = 2
+
+# LLM scheduler: requests sent to Ollama at once across all sessions.
+# Others wait, evaluations first, then generations, then batch jobs.
+LLM_MAX_IN_FLIGHT = 2
+
+# Per-task model routing. Each task tries its models in order and falls
+# back to the next one when a call fails or misses a deadline (seconds,
+# counted from when the scheduler admits it): time to first token (streamed
+# calls only), total.
+MODEL_ROUTES = {
+    "generation": {"models": [DEFAULT_MODEL, "llama3.2:3b"], "ttft_sec": 60, "total_sec": 240},
+    "evaluation": {"models": [DEFAULT_MODEL, "llama3.2:1b"], "ttft_sec": 15, "total_sec": 45},
+    "condense": {"models": ["llama3.2:3b", DEFAULT_MODEL], "ttft_sec": 30, "total_sec": 90},
+}
+
+# Evaluator output: replies are constrained to a JSON schema and capped at
+# this many tokens per scored answer; unparseable replies are retried this
+# many times before the answer is recorded as failed.
+EVAL_NUM_PREDICT = 160
+EVAL_MAX_RETRIES = 2
+
+# Question bank: generated questions are kept (in the sessions database)
+# with hashed TF-IDF vectors. Fast mode picks questions whose terms are at
+# least QUESTION_BANK_MIN_SCORE (technical) / QUESTION_BANK_MIN_SCORE_BEHAVIORAL
+# covered (IDF-weighted share) by the JD + resume; questions closer than
+# QUESTION_BANK_DUP_THRESHOLD (cosine) to one already kept are dropped.
+# A word counts as generic once questions generated for at least
+# QUESTION_BANK_GENERIC_SOURCES different reports use it; a question with
+# any other word (an employer, a project name, ...) is only reused when
+# the current JD or resume contains that word.
+QUESTION_BANK_DIM = 1024
+QUESTION_BANK_MIN_SCORE = 0.15
+QUESTION_BANK_MIN_SCORE_BEHAVIORAL = 0.05
+QUESTION_BANK_DUP_THRESHOLD = 0.9
+QUESTION_BANK_GENERIC_SOURCES = 3
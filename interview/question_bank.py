@@ -0,0 +1,376 @@
+import json
+import re
+import threading
+import uuid
+import zlib
+from datetime import datetime
+
+import numpy as np
+
+from config import (
+    SESSIONS_DB_PATH,
+    QUESTION_BANK_DIM,
+    QUESTION_BANK_MIN_SCORE,
+    QUESTION_BANK_MIN_SCORE_BEHAVIORAL,
+    QUESTION_BANK_DUP_THRESHOLD,
+    QUESTION_BANK_GENERIC_SOURCES,
+)
+from interview.question_parser import QuestionRecord, SECTION_TECHNICAL, SECTION_BEHAVIORAL
+from utils.session_db import connect
+
+BANK_SCHEMA = """
+CREATE TABLE IF NOT EXISTS question_bank (
+    id         INTEGER PRIMARY KEY,
+    text       TEXT NOT NULL,
+    section    TEXT,
+    difficulty TEXT,
+    follow_up  TEXT,
+    outline    TEXT,
+    vector     BLOB NOT NULL,
+    created    TEXT NOT NULL,
+    times_used INTEGER NOT NULL DEFAULT 0,
+    source     TEXT
+);
+"""
+
+# Columns added after the table first shipped: (column, type)
+BANK_MIGRATIONS = [
+    ("source", "TEXT"),
+]
+
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#]*")
+_STOPWORDS = frozenset(
+    "a about an and are as at be been by can describe did do does for from had "
+    "has have how i if in into is it me my not of on or our so than that the "
+    "their then there they this to was were what when where which who why will "
+    "with would you your".split()
+)
+
+
+def _tokens(text: str) -> list:
+    return [t for t in _TOKEN.findall(text.lower()) if t not in _STOPWORDS and not t.isdigit()]
+
+
+def _question_terms(text: str, follow_up: str = None, outline=None) -> frozenset:
+    """
+    Every word a reused question would show the candidate.
+    """
+    return frozenset(_tokens(" ".join([text, follow_up or "", *(outline or [])])))
+
+
+def hash_vector(text: str, dim: int = QUESTION_BANK_DIM) -> np.ndarray:
+    """
+    Log-scaled term frequencies of unigrams and bigrams, hashed into dim
+    buckets (crc32, so vectors are stable across processes).
+    """
+    tokens = _tokens(text)
+    features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    vec = np.zeros(dim, dtype=np.float32)
+    if not features:
+        return vec
+    buckets = np.fromiter(
+        (zlib.crc32(f.encode("utf-8")) % dim for f in features),
+        dtype=np.int64,
+        count=len(features)
+    )
+    counts = np.bincount(buckets, minlength=dim)
+    present = counts > 0
+    vec[present] = 1.0 + np.log(counts[present])
+    return vec
+
+
+class QuestionBank:
+    """
+    Generated questions kept across sessions, with an in-memory index.
+
+    Rows live in SQLite with their hashed term-frequency vectors; the index
+    is an (n, dim) NumPy matrix re-weighted by IDF over the bank, so a
+    lookup is one matrix-vector product. Questions whose cosine similarity
+    to one already in the bank reaches QUESTION_BANK_DUP_THRESHOLD are not
+    added.
+
+    Relevance to a JD + resume is coverage: the IDF-weighted share of a
+    question's terms that appear in the documents (0..1). Unlike cosine
+    it doesn't shrink as the documents get longer.
+
+    Questions were generated from other candidates' resumes, so each row
+    records the report (source) it came from. Words used by fewer than
+    QUESTION_BANK_GENERIC_SOURCES reports are treated as specific to those
+    candidates, and a question containing one is only selected when the
+    current JD or resume contains it too.
+    """
+
+    def __init__(self, path=SESSIONS_DB_PATH, dim: int = QUESTION_BANK_DIM):
+        self.path = str(path)
+        self.dim = dim
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._ids = []
+        self._sections = []
+        self._difficulties = []
+        self._terms = []
+        # word -> sources (reports) whose questions use it
+        self._term_sources = {}
+        self._schema_ready = False
+        self._tf = np.zeros((0, dim), dtype=np.float32)
+        self._df = np.zeros(dim, dtype=np.float64)
+        self._weighted = None
+        self._coverage = None
+
+    def _conn(self):
+        conn = connect(self.path)
+        if not self._schema_ready:
+            conn.executescript(BANK_SCHEMA)
+            existing = {row["name"] for row in conn.execute("PRAGMA table_info(question_bank)")}
+            for column, col_type in BANK_MIGRATIONS:
+                if column not in existing:
+                    conn.execute(f"ALTER TABLE question_bank ADD COLUMN {column} {col_type}")
+            conn.commit()
+            self._schema_ready = True
+        return conn
+
+    def _index_terms(self, terms: frozenset, source: str):
+        self._terms.append(terms)
+        for term in terms:
+            self._term_sources.setdefault(term, set()).add(source)
+
+    def _specific_terms(self, i: int) -> set:
+        return {
+            term for term in self._terms[i]
+            if len(self._term_sources[term]) < QUESTION_BANK_GENERIC_SOURCES
+        }
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        rows = self._conn().execute(
+            """
+            SELECT id, text, section, difficulty, follow_up, outline, vector, created, source
+            FROM question_bank ORDER BY id
+            """
+        ).fetchall()
+        vectors = []
+        for row in rows:
+            vec = np.frombuffer(row["vector"], dtype=np.float32)
+            if len(vec) != self.dim:
+                vec = hash_vector(row["text"], self.dim)
+            vectors.append(vec)
+            self._ids.append(row["id"])
+            self._sections.append(row["section"])
+            self._difficulties.append(row["difficulty"])
+            # Rows from before sources were stored: one add() shares a timestamp
+            self._index_terms(
+                _question_terms(row["text"], row["follow_up"], json.loads(row["outline"] or "[]")),
+                row["source"] or row["created"]
+            )
+        if vectors:
+            self._tf = np.vstack(vectors)
+            self._df = (self._tf > 0).sum(axis=0).astype(np.float64)
+        self._loaded = True
+
+    def _idf(self) -> np.ndarray:
+        idf = np.log((1.0 + len(self._ids)) / (1.0 + self._df)) + 1.0
+        return idf.astype(np.float32)
+
+    def _normalized(self, tf: np.ndarray) -> np.ndarray:
+        weighted = tf * self._idf()
+        norms = np.linalg.norm(weighted, axis=-1, keepdims=True)
+        return weighted / np.where(norms == 0, 1.0, norms)
+
+    def _matrix(self) -> np.ndarray:
+        """
+        IDF-weighted rows with unit L2 norm (cosine similarity).
+        """
+        if self._weighted is None:
+            self._weighted = self._normalized(self._tf)
+        return self._weighted
+
+    def _coverage_matrix(self) -> np.ndarray:
+        """
+        IDF-weighted rows summing to 1 (dot with a 0/1 presence vector = coverage).
+        """
+        if self._coverage is None:
+            weighted = self._tf * self._idf()
+            totals = weighted.sum(axis=1, keepdims=True)
+            self._coverage = weighted / np.where(totals == 0, 1.0, totals)
+        return self._coverage
+
+    def __len__(self):
+        with self._lock:
+            self._ensure_loaded()
+            return len(self._ids)
+
+    def add(self, records, source: str = None) -> int:
+        """
+        Adds QuestionRecords, skipping near-duplicates of questions already
+        in the bank (or earlier in records). Returns how many were added.
+        source identifies the report they came from (one per call by default).
+        """
+        records = list(records)
+        source = source or uuid.uuid4().hex
+        with self._lock:
+            self._ensure_loaded()
+            # IDF is held fixed for the duplicate checks of one call; the
+            # index is re-weighted on the next lookup
+            idf = self._idf()
+            n = len(self._ids)
+            index = np.empty((n + len(records), self.dim), dtype=np.float32)
+            index[:n] = self._matrix()
+            new_tf = []
+
+            conn = self._conn()
+            now = datetime.now().isoformat()
+            with conn:
+                for record in records:
+                    tf = hash_vector(record.text, self.dim)
+                    if not tf.any():
+                        continue
+                    row = tf * idf
+                    row /= np.linalg.norm(row)
+                    if n and float((index[:n] @ row).max()) >= QUESTION_BANK_DUP_THRESHOLD:
+                        continue
+
+                    cur = conn.execute(
+                        """
+                        INSERT INTO question_bank (text, section, difficulty, follow_up, outline, vector, created, source)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                        """,
+                        (
+                            record.text,
+                            record.section,
+                            record.difficulty,
+                            record.follow_up,
+                            json.dumps(record.outline),
+                            tf.tobytes(),
+                            now,
+                            source,
+                        )
+                    )
+                    index[n] = row
+                    n += 1
+                    new_tf.append(tf)
+                    self._ids.append(cur.lastrowid)
+                    self._sections.append(record.section)
+                    self._difficulties.append(record.difficulty)
+                    self._index_terms(
+                        _question_terms(record.text, record.follow_up, record.outline),
+                        source
+                    )
+
+            if new_tf:
+                new_tf = np.vstack(new_tf)
+                self._tf = np.vstack([self._tf, new_tf])
+                self._df += (new_tf > 0).sum(axis=0)
+                self._weighted = None
+                self._coverage = None
+            return len(new_tf)
+
+    def select(self, jd_text: str, resume_text: str, n_tech: int, n_behav: int, difficulty: str = "mixed"):
+        """
+        Up to n_tech technical and n_behav behavioral questions ranked by
+        coverage of the JD + resume, without near-duplicates among them.
+
+        Questions need coverage >= the section's floor (behavioral ones are
+        mostly role-agnostic, so theirs is lower), may not contain words
+        specific to other candidates' reports unless the JD or resume has
+        them, and technical ones must match difficulty unless it is "mixed".
+        Returns QuestionRecords numbered per section (technical first).
+        """
+        wanted = {SECTION_TECHNICAL: n_tech, SECTION_BEHAVIORAL: n_behav}
+        floors = {SECTION_TECHNICAL: QUESTION_BANK_MIN_SCORE, SECTION_BEHAVIORAL: QUESTION_BANK_MIN_SCORE_BEHAVIORAL}
+        chosen = {SECTION_TECHNICAL: [], SECTION_BEHAVIORAL: []}
+
+        with self._lock:
+            self._ensure_loaded()
+            if not self._ids:
+                return []
+            matrix = self._matrix()
+            documents = f"{jd_text}\n{resume_text}"
+            present = (hash_vector(documents, self.dim) > 0).astype(np.float32)
+            scores = self._coverage_matrix() @ present
+            document_terms = set(_tokens(documents))
+
+            picked = []
+            for i in np.argsort(-scores, kind="stable"):
+                section = self._sections[i]
+                if section not in wanted or len(chosen[section]) >= wanted[section]:
+                    continue
+                if scores[i] < floors[section]:
+                    continue
+                if section == SECTION_TECHNICAL and (
+                    difficulty != "mixed" and self._difficulties[i] and self._difficulties[i] != difficulty
+                ):
+                    continue
+                if self._specific_terms(i) - document_terms:
+                    continue
+                if picked and float((matrix[picked] @ matrix[i]).max()) >= QUESTION_BANK_DUP_THRESHOLD:
+                    continue
+                picked.append(i)
+                chosen[section].append(self._ids[i])
+                if all(len(chosen[s]) >= wanted[s] for s in wanted):
+                    break
+
+        ids = chosen[SECTION_TECHNICAL] + chosen[SECTION_BEHAVIORAL]
+        if not ids:
+            return []
+
+        conn = self._conn()
+        placeholders = ", ".join("?" * len(ids))
+        with conn:
+            conn.execute(f"UPDATE question_bank SET times_used = times_used + 1 WHERE id IN ({placeholders})", ids)
+        rows = {
+            row["id"]: row
+            for row in conn.execute(f"SELECT * FROM question_bank WHERE id IN ({placeholders})", ids)
+        }
+
+        records = []
+        for section in (SECTION_TECHNICAL, SECTION_BEHAVIORAL):
+            for number, qid in enumerate(chosen[section], start=1):
+                row = rows[qid]
+                records.append(QuestionRecord(
+                    section=section,
+                    number=number,
+                    text=row["text"],
+                    difficulty=row["difficulty"],
+                    follow_up=row["follow_up"],
+                    outline=json.loads(row["outline"] or "[]")
+                ))
+        return records
+
+
+def format_report(records, include_answers: bool = False) -> str:
+    """
+    Format B markdown for bank questions, so they render and parse like
+    generated ones.
+    """
+    lines = []
+    for section, title in ((SECTION_TECHNICAL, "Technical"), (SECTION_BEHAVIORAL, "Behavioral")):
+        section_records = [r for r in records if r.section == section]
+        if not section_records:
+            continue
+        lines += [f"### {title} Questions (from question bank)", ""]
+        for r in section_records:
+            lines.append(f"{r.number}. {r.text}")
+            if r.difficulty:
+                lines.append(f"- Difficulty: {r.difficulty}")
+            if r.follow_up:
+                lines.append(f"- Follow-up: {r.follow_up}")
+            if include_answers and r.outline:
+                lines.append("- Expected Answer Outline:")
+                lines += [f"  - {point}" for point in r.outline]
+            lines.append("")
+        lines += ["---", ""]
+    return "\n".join(lines)
+
+
+_bank = None
+_bank_lock = threading.Lock()
+
+
+def get_bank() -> QuestionBank:
+    global _bank
+    if _bank is None:
+        with _bank_lock:
+            if _bank is None:
+                _bank = QuestionBank()
+    return _bank
@@ -1,7 +1,197 @@
 import re
+from dataclasses import dataclass, field
+
+SECTION_TECHNICAL = "technical"
+SECTION_BEHAVIORAL = "behavioral"
+SECTION_OTHER = "other"
+
+_HEADER = re.compile(r"^\s*(?:#{1,6}\s*(.+)|\*\*([^*]+)\*\*\s*:?)\s*$")
+# "Technical Questions:" etc. written as a plain line (common with small models)
+_PLAIN_HEADER = re.compile(
+    r"^\s*(technical|behaviou?ral)(?:\s+interview)?\s+questions?\s*(?:\([^)]*\))?\s*:?\s*$",
+    re.IGNORECASE
+)
+_SEPARATOR = re.compile(r"^\s*(?:-{3,}|={3,}|\*{3,})\s*$")
+_NUMBERED = re.compile(r"^(\s*)(?:\*\*)?(\d+)[.)](?:\*\*)?\s+(.*)$")
+_FIELD = re.compile(
+    r"^\s*(?:[-*•]\s*)?(?:\*\*)?"
+    r"(difficulty|follow[- ]?up(?: question)?|expected answer outline|answer outline)"
+    r"\s*(?:\*\*)?\s*:\s*(?:\*\*)?\s*(.*)$",
+    re.IGNORECASE
+)
+_BULLET = re.compile(r"^\s*[-*•]\s+(.*)$")
+
+
+@dataclass
+class QuestionRecord:
+    section: str | None
+    number: int
+    text: str
+    difficulty: str | None = None
+    follow_up: str | None = None
+    outline: list = field(default_factory=list)
+
+
+def _clean(text: str) -> str:
+    return text.replace("**", "").strip()
+
+
+def _section_for(title: str) -> str:
+    title = title.lower()
+    if "technical" in title:
+        return SECTION_TECHNICAL
+    if "behavioral" in title or "behavioural" in title:
+        return SECTION_BEHAVIORAL
+    return SECTION_OTHER
+
+
+class FormatBStreamParser:
+    """
+    Incremental parser for the Format B report.
+
+    feed() takes arbitrary token chunks and returns the QuestionRecords
+    completed by them. Each line is examined exactly once when its newline
+    arrives, so the whole stream is parsed in linear time. A record is
+    complete when the next question, section header or separator starts
+    (or at close()).
+
+    Numbered items are only questions inside the technical / behavioral
+    sections (or before any section header, for outputs without headers);
+    indented numbered items under an answer outline are outline points.
+    Headers may be markdown (### / **bold**) or plain "Technical Questions:"
+    lines. If no question section appears at all, numbered items from other
+    sections are returned as questions at close().
+    """
+
+    def __init__(self):
+        self.records = []
+        self._partial = []
+        self._section = None
+        self._current = None
+        self._in_outline = False
+        self._has_fields = False
+        self._seen_question_section = False
+        # Numbered items outside the question sections, kept for close()
+        self._other = []
+
+    def feed(self, chunk: str) -> list:
+        completed = []
+        start = 0
+        while True:
+            nl = chunk.find("\n", start)
+            if nl == -1:
+                if start < len(chunk):
+                    self._partial.append(chunk[start:])
+                break
+            line = "".join(self._partial) + chunk[start:nl]
+            self._partial = []
+            record = self._process_line(line)
+            if record is not None:
+                completed.append(record)
+            start = nl + 1
+        return completed
+
+    def close(self) -> list:
+        completed = []
+        if self._partial:
+            record = self._process_line("".join(self._partial))
+            self._partial = []
+            if record is not None:
+                completed.append(record)
+        record = self._finish()
+        if record is not None:
+            completed.append(record)
+        if not self._seen_question_section and not self.records:
+            for record in self._other:
+                record.section = None
+                self.records.append(record)
+                completed.append(record)
+        self._other = []
+        return completed
+
+    def _finish(self):
+        record = self._current
+        self._current = None
+        self._in_outline = False
+        self._has_fields = False
+        if record is None or not record.text:
+            return None
+        if record.section == SECTION_OTHER:
+            self._other.append(record)
+            return None
+        self.records.append(record)
+        return record
+
+    def _start_section(self, title: str):
+        self._section = _section_for(title)
+        if self._section != SECTION_OTHER:
+            self._seen_question_section = True
+        return self._finish()
+
+    def _process_line(self, line: str):
+        if not line.strip():
+            return None
+
+        if _SEPARATOR.match(line):
+            return self._finish()
+
+        header = _HEADER.match(line)
+        if header and not _FIELD.match(line):
+            return self._start_section(header.group(1) or header.group(2))
+        plain = _PLAIN_HEADER.match(line)
+        if plain:
+            return self._start_section(plain.group(1))
+
+        numbered = _NUMBERED.match(line)
+        if numbered:
+            indent, number, text = numbered.groups()
+            if self._current is not None and self._in_outline and indent:
+                self._current.outline.append(_clean(text))
+                return None
+            finished = self._finish()
+            self._current = QuestionRecord(
+                section=self._section,
+                number=int(number),
+                text=_clean(text)
+            )
+            return finished
+
+        if self._current is None:
+            return None
+
+        fld = _FIELD.match(line)
+        if fld:
+            name, value = fld.group(1).lower(), _clean(fld.group(2))
+            self._has_fields = True
+            self._in_outline = False
+            if name.startswith("difficulty"):
+                self._current.difficulty = value.lower() or None
+            elif name.startswith("follow"):
+                self._current.follow_up = value or None
+            else:
+                self._in_outline = True
+                if value:
+                    self._current.outline.append(value)
+            return None
+
+        bullet = _BULLET.match(line)
+        if bullet and self._in_outline:
+            self._current.outline.append(_clean(bullet.group(1)))
+        elif not self._has_fields and not bullet:
+            # Question text wrapped onto a second line
+            self._current.text = f"{self._current.text} {_clean(line)}"
+        return None
+
+
+def parse_questions(model_output: str) -> list:
+    parser = FormatBStreamParser()
+    parser.feed(model_output)
+    parser.close()
+    return parser.records
+
 
 def extract_first_question(model_output: str) -> str | None:
-    match = re.search(r"\n1\.\s+(.*)", model_output)
-    if match:
-        return match.group(1).strip()
+    records = parse_questions(model_output)
+    if records:
+        return records[0].text
     return None
@@ -0,0 +1,219 @@
+import re
+from collections import Counter
+
+# Canonical skill -> lowercase aliases, by category. Aliases are matched on
+# word boundaries. Names that are also everyday English (Go, React, Swift,
+# Spark, Rails, ...) are only listed in unambiguous forms, and soft skills
+# are left out: a false match would be reported as a skill gap.
+SKILL_GROUPS = {
+    "Languages": {
+        "Python": ("python",),
+        "Java": ("java",),
+        "JavaScript": ("javascript", "ecmascript", "es6"),
+        "TypeScript": ("typescript",),
+        "Go": ("golang", "go lang"),
+        "Rust": ("rust",),
+        "C++": ("c++", "cpp"),
+        "C#": ("c#", "csharp"),
+        "Kotlin": ("kotlin",),
+        "Scala": ("scala",),
+        "Ruby": ("ruby",),
+        "PHP": ("php",),
+        "Swift": ("swiftui", "swift language", "swift programming"),
+        "SQL": ("sql",),
+        "Bash": ("bash", "shell scripting"),
+    },
+    "Frameworks": {
+        "Django": ("django",),
+        "Flask": ("flask",),
+        "FastAPI": ("fastapi",),
+        "Spring": ("spring boot", "spring framework", "springboot"),
+        "React": ("react.js", "reactjs", "react native"),
+        "Angular": ("angular", "angularjs"),
+        "Vue": ("vue", "vue.js", "vuejs"),
+        "Node.js": ("node.js", "nodejs", "node js"),
+        "Express": ("express.js", "expressjs"),
+        ".NET": (".net", "dotnet", "asp.net"),
+        "Rails": ("ruby on rails",),
+        "GraphQL": ("graphql",),
+        "gRPC": ("grpc",),
+        "REST APIs": ("rest api", "rest apis", "restful"),
+    },
+    "Data": {
+        "PostgreSQL": ("postgresql", "postgres"),
+        "MySQL": ("mysql",),
+        "MongoDB": ("mongodb", "mongo"),
+        "Redis": ("redis",),
+        "Elasticsearch": ("elasticsearch", "elastic search", "opensearch"),
+        "Cassandra": ("cassandra",),
+        "DynamoDB": ("dynamodb",),
+        "Snowflake": ("snowflake",),
+        "BigQuery": ("bigquery",),
+        "Kafka": ("kafka",),
+        "RabbitMQ": ("rabbitmq",),
+        "Spark": ("apache spark", "pyspark", "spark sql"),
+        "Airflow": ("airflow",),
+        "dbt": ("dbt",),
+        "Pandas": ("pandas",),
+        "NumPy": ("numpy",),
+        "ETL": ("etl", "elt", "data pipelines", "data pipeline"),
+    },
+    "ML / AI": {
+        "Machine Learning": ("machine learning", "ml"),
+        "Deep Learning": ("deep learning",),
+        "PyTorch": ("pytorch",),
+        "TensorFlow": ("tensorflow",),
+        "scikit-learn": ("scikit-learn", "sklearn"),
+        "NLP": ("nlp", "natural language processing"),
+        "LLMs": ("llm", "llms", "large language models"),
+        "Computer Vision": ("computer vision",),
+    },
+    "Cloud & DevOps": {
+        "AWS": ("aws", "amazon web services"),
+        "GCP": ("gcp", "google cloud"),
+        "Azure": ("azure",),
+        "Docker": ("docker",),
+        "Kubernetes": ("kubernetes", "k8s"),
+        "Terraform": ("terraform",),
+        "Ansible": ("ansible",),
+        "CI/CD": ("ci/cd", "ci cd", "continuous integration", "continuous delivery", "continuous deployment"),
+        "Jenkins": ("jenkins",),
+        "GitHub Actions": ("github actions",),
+        "Linux": ("linux",),
+        "Prometheus": ("prometheus",),
+        "Grafana": ("grafana",),
+        "Observability": ("observability", "opentelemetry"),
+        "Serverless": ("serverless", "lambda functions", "aws lambda"),
+    },
+    "Practices": {
+        "Microservices": ("microservices", "microservice"),
+        "Distributed Systems": ("distributed systems", "distributed system"),
+        "System Design": ("system design", "software architecture"),
+        "Testing": ("unit testing", "integration testing", "tdd", "pytest", "test automation"),
+        "Agile": ("scrum", "kanban"),
+        "Security": ("oauth", "owasp", "application security"),
+        "Performance": ("performance tuning", "performance optimization"),
+        "Git": ("git",),
+    },
+}
+
+SKILL_CATEGORY = {skill: group for group, skills in SKILL_GROUPS.items() for skill in skills}
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+class AhoCorasick:
+    """
+    Multi-pattern matcher: finds every occurrence of every pattern in one
+    pass over the text, however many patterns there are.
+    """
+
+    def __init__(self, patterns):
+        """
+        patterns: iterable of (pattern, value).
+        """
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+
+        for pattern, value in patterns:
+            node = 0
+            for ch in pattern:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                node = nxt
+            self._out[node].append((len(pattern), value))
+
+        # Breadth-first, so a node's failure target is always done first
+        queue = list(self._goto[0].values())
+        for node in queue:
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def iter_matches(self, text: str):
+        """
+        Yields (start, end, value) for every pattern occurrence in text.
+        """
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for length, value in out[node]:
+                yield i - length + 1, i + 1, value
+
+
+_MATCHER = AhoCorasick(
+    (alias, skill)
+    for skills in SKILL_GROUPS.values()
+    for skill, aliases in skills.items()
+    for alias in aliases
+)
+
+
+def extract_skills(text: str) -> Counter:
+    """
+    Canonical skill -> number of mentions in text (whole words only).
+    """
+    text = _WHITESPACE.sub(" ", (text or "").lower())
+    found = Counter()
+    for start, end, skill in _MATCHER.iter_matches(text):
+        if start > 0 and text[start - 1].isalnum():
+            continue
+        if end < len(text) and text[end].isalnum():
+            continue
+        found[skill] += 1
+    return found
+
+
+def fit_summary(jd_text: str, resume_text: str, max_extra: int = 10) -> dict:
+    """
+    Skill overlap between a JD and a resume:
+      matched - in both, most-mentioned in the JD first
+      missing - asked for by the JD, absent from the resume
+      extra   - on the resume but not in the JD (top max_extra)
+      coverage_pct - share of the JD's skills the resume mentions
+    """
+    jd_skills = extract_skills(jd_text)
+    resume_skills = extract_skills(resume_text)
+
+    def by_count(skills, counts):
+        return sorted(skills, key=lambda s: (-counts[s], s))
+
+    matched = by_count(jd_skills.keys() & resume_skills.keys(), jd_skills)
+    missing = by_count(jd_skills.keys() - resume_skills.keys(), jd_skills)
+    extra = by_count(resume_skills.keys() - jd_skills.keys(), resume_skills)[:max_extra]
+
+    return {
+        "matched": matched,
+        "missing": missing,
+        "extra": extra,
+        "coverage_pct": round(100 * len(matched) / len(jd_skills), 1) if jd_skills else 0.0,
+    }
+
+
+def format_fit_summary(summary: dict) -> str:
+    """
+    Markdown for the UI.
+    """
+    def items(skills):
+        return ", ".join(skills) if skills else "—"
+
+    return "\n".join([
+        f"**JD skill coverage:** {summary['coverage_pct']}%",
+        f"- ✅ **Matched:** {items(summary['matched'])}",
+        f"- ⚠️ **Missing from resume:** {items(summary['missing'])}",
+        f"- ➕ **Additional on resume:** {items(summary['extra'])}",
+    ])
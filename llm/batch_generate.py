@@ -0,0 +1,247 @@
+"""
+Headless batch generation for a whole hiring round.
+
+    python -m llm.batch_generate candidates/ --out packs.jsonl
+    python -m llm.batch_generate resumes/ --jd jd.pdf --out packs.jsonl
+    python -m llm.batch_generate manifest.jsonl --out packs.jsonl
+
+Input is either a directory or a JSONL manifest:
+  - directory + --jd: every file in the directory is a resume for that JD
+  - directory alone: every subdirectory holds a jd.* and a resume.* file
+  - manifest: one {"id", "jd", "resume"} object per line (paths relative to
+    the manifest); optional n_technical / n_behavioral / difficulty /
+    include_answers override the command-line values for that entry
+
+One JSON line per finished job is appended to --out as soon as it
+completes. Jobs already written with status "ok" are skipped on restart,
+so an interrupted run can simply be started again.
+"""
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+
+from config import BATCH_CONCURRENCY
+from loaders.file_loader import load_path_text, SUFFIX_TYPES
+from llm.compaction import prepare_inputs
+from llm.prompt_builder import build_prompt_parts
+from llm.generation_cache import generation_key, get_cached_generation, store_generation
+from llm import router
+from llm.scheduler import PRIORITY_BATCH
+from interview.question_parser import parse_questions
+from interview.question_bank import get_bank
+from interview.skill_matcher import fit_summary
+
+JOB_OPTIONS = ("n_technical", "n_behavioral", "difficulty", "include_answers")
+
+
+def _find(directory: Path, stem: str):
+    for path in sorted(directory.iterdir()):
+        if path.is_file() and path.stem.lower() == stem and path.suffix.lower() in SUFFIX_TYPES:
+            return path
+    return None
+
+
+def discover_jobs(source, jd=None) -> list:
+    """
+    Job dicts ({"id", "jd", "resume", ...options}) from a directory or manifest.
+    """
+    source = Path(source)
+
+    if source.is_file():
+        jobs = []
+        with open(source) as f:
+            for line_no, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                if "jd" not in entry or "resume" not in entry:
+                    raise ValueError(f"{source}:{line_no}: entries need 'jd' and 'resume'")
+                entry.setdefault("id", Path(entry["resume"]).stem)
+                entry["jd"] = str(source.parent / entry["jd"])
+                entry["resume"] = str(source.parent / entry["resume"])
+                jobs.append(entry)
+        return jobs
+
+    if not source.is_dir():
+        raise ValueError(f"{source} is neither a manifest file nor a directory")
+
+    if jd is not None:
+        return [
+            {"id": path.stem, "jd": str(jd), "resume": str(path)}
+            for path in sorted(source.iterdir())
+            if path.is_file() and path.suffix.lower() in SUFFIX_TYPES
+        ]
+
+    jobs = []
+    for sub in sorted(p for p in source.iterdir() if p.is_dir()):
+        jd_path, resume_path = _find(sub, "jd"), _find(sub, "resume")
+        if jd_path and resume_path:
+            jobs.append({"id": sub.name, "jd": str(jd_path), "resume": str(resume_path)})
+    return jobs
+
+
+def completed_ids(out_path) -> set:
+    """
+    Ids already written with status "ok" (a torn last line is ignored).
+    """
+    done = set()
+    path = Path(out_path)
+    if not path.exists():
+        return done
+    with open(path) as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if record.get("status") == "ok":
+                done.add(record.get("id"))
+    return done
+
+
+def run_job(job, defaults, model=None, use_cache=True) -> dict:
+    """
+    load -> match skills -> compact -> build prompt -> generate -> parse for one JD/resume pair.
+    Never raises; failures come back as status "error". model overrides
+    the first choice of the "generation" route.
+    """
+    options = {k: job.get(k, defaults[k]) for k in JOB_OPTIONS}
+    record = {"id": job["id"], "jd": job["jd"], "resume": job["resume"], **options}
+    started = time.perf_counter()
+
+    try:
+        jd_text = load_path_text(job["jd"])
+        resume_text = load_path_text(job["resume"])
+        if not jd_text.strip() or not resume_text.strip():
+            raise ValueError("JD or resume has no extractable text")
+        record["skills"] = skills = fit_summary(jd_text, resume_text)
+
+        key = generation_key(
+            jd_text,
+            resume_text,
+            options["n_technical"],
+            options["n_behavioral"],
+            options["difficulty"],
+            options["include_answers"],
+            model or router.primary_model(router.TASK_GENERATION)
+        )
+        output = get_cached_generation(key) if use_cache else None
+        stats = {}
+        record["cached"] = output is not None
+
+        if output is None:
+            jd_text, resume_text, record["compaction"] = prepare_inputs(
+                jd_text, resume_text, priority=PRIORITY_BATCH
+            )
+            prefix, suffix = build_prompt_parts(
+                jd_text,
+                resume_text,
+                options["n_technical"],
+                options["n_behavioral"],
+                options["difficulty"],
+                options["include_answers"],
+                skills=skills
+            )
+            ok, output = router.generate(
+                router.TASK_GENERATION,
+                suffix,
+                model=model,
+                prefix=prefix,
+                stats=stats,
+                priority=PRIORITY_BATCH
+            )
+            if not ok:
+                raise RuntimeError(output)
+            if not stats["fallbacks"]:
+                store_generation(key, output)
+
+        questions = parse_questions(output)
+        record["banked"] = get_bank().add(questions)
+        record.update({
+            "status": "ok",
+            "questions": [asdict(q) for q in questions],
+            "output": output,
+            "stats": stats,
+        })
+    except Exception as e:
+        record.update({"status": "error", "error": str(e)})
+
+    record["elapsed_sec"] = round(time.perf_counter() - started, 2)
+    record["finished"] = datetime.now().isoformat()
+    return record
+
+
+def run_batch(jobs, out_path, defaults, model=None, concurrency=BATCH_CONCURRENCY, use_cache=True):
+    """
+    Runs jobs not yet completed in out_path, at most `concurrency` at a time,
+    appending each record as it finishes. Returns (n_ok, n_failed, n_skipped).
+    """
+    done = completed_ids(out_path)
+    todo = [job for job in jobs if job["id"] not in done]
+    n_ok = n_failed = 0
+
+    Path(out_path).parent.mkdir(parents=True, exist_ok=True)
+    with open(out_path, "a") as out, ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        futures = [pool.submit(run_job, job, defaults, model, use_cache) for job in todo]
+        # Only this thread writes, so lines never interleave
+        for future in as_completed(futures):
+            record = future.result()
+            out.write(json.dumps(record, default=str) + "\n")
+            out.flush()
+            if record["status"] == "ok":
+                n_ok += 1
+            else:
+                n_failed += 1
+            print(
+                f"[{n_ok + n_failed}/{len(todo)}] {record['id']}: {record['status']}"
+                f" ({record['elapsed_sec']}s)",
+                file=sys.stderr
+            )
+
+    return n_ok, n_failed, len(jobs) - len(todo)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate interview question packs without the UI")
+    parser.add_argument("source", help="directory of candidates / resumes, or a JSONL manifest")
+    parser.add_argument("--jd", help="one JD for every resume in the source directory")
+    parser.add_argument("--out", default="batch_output.jsonl")
+    parser.add_argument("--model", help="first-choice generation model (default: the configured route)")
+    parser.add_argument("--concurrency", type=int, default=BATCH_CONCURRENCY)
+    parser.add_argument("--n-technical", type=int, default=5)
+    parser.add_argument("--n-behavioral", type=int, default=2)
+    parser.add_argument("--difficulty", default="mixed", choices=["mixed", "easy", "medium", "hard"])
+    parser.add_argument("--include-answers", action="store_true")
+    parser.add_argument("--no-cache", action="store_true", help="ignore cached generations")
+    args = parser.parse_args()
+
+    jobs = discover_jobs(args.source, jd=args.jd)
+    ids = [job["id"] for job in jobs]
+    if len(set(ids)) != len(ids):
+        parser.error("job ids must be unique (they are used to resume)")
+
+    defaults = {
+        "n_technical": args.n_technical,
+        "n_behavioral": args.n_behavioral,
+        "difficulty": args.difficulty,
+        "include_answers": args.include_answers,
+    }
+    n_ok, n_failed, n_skipped = run_batch(
+        jobs,
+        args.out,
+        defaults,
+        model=args.model,
+        concurrency=args.concurrency,
+        use_cache=not args.no_cache
+    )
+    print(f"{n_ok} ok, {n_failed} failed, {n_skipped} already done -> {args.out}")
+    return 1 if n_failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
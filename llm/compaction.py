@@ -0,0 +1,200 @@
+import re
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from config import INPUT_TOKEN_BUDGET, CONDENSE_CHUNK_TOKENS, CONDENSE_CONCURRENCY
+from llm import router
+from llm.scheduler import PRIORITY_GENERATION
+
+# Separates pages in extracted PDF text (loaders.file_loader.PAGE_BREAK)
+PAGE_BREAK = "\f"
+
+CONDENSE_PROMPT = """
+You are condensing a {kind} so it can be used to prepare interview questions.
+
+Rewrite the excerpt below as compact bullet points.
+- Keep every skill, technology, tool, responsibility, requirement, project, metric and date.
+- Drop marketing language, benefits, legal boilerplate and repetition.
+- Do NOT add anything that is not in the excerpt.
+- Output only the bullet points.
+
+### EXCERPT
+{text}
+"""
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Rough token count (~4 characters per token for English text).
+    """
+    return len(text) // 4 + 1
+
+
+def normalize_whitespace(text: str) -> str:
+    lines = [re.sub(r"[ \t ]+", " ", line).strip() for line in text.splitlines()]
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(lines)).strip()
+
+
+def _shape(line: str) -> str:
+    return re.sub(r"\d+", "#", re.sub(r"\s+", " ", line.strip().lower()))
+
+
+def strip_repeated_lines(text: str, min_repeats: int = 3, edge_lines: int = 1) -> str:
+    """
+    Removes running headers / footers (page numbers included): short lines
+    among the first or last edge_lines of a page whose shape recurs at the
+    edges of at least min_repeats pages. Pages are separated by PAGE_BREAK;
+    text without page breaks is returned unchanged (apart from line breaks
+    replacing them). Digits are ignored when comparing, so "Acme Corp -
+    page 2" and "Acme Corp - page 3" match. The first copy is kept.
+    """
+    pages = [page.split("\n") for page in text.split(PAGE_BREAK)]
+    if len(pages) < min_repeats:
+        return "\n".join(line for lines in pages for line in lines)
+
+    def edges(lines):
+        filled = [i for i, line in enumerate(lines) if line.strip() and len(line.strip()) <= 120]
+        return set(filled[:edge_lines] + filled[-edge_lines:])
+
+    page_edges = [edges(lines) for lines in pages]
+    counts = Counter()
+    for lines, indexes in zip(pages, page_edges):
+        counts.update({_shape(lines[i]) for i in indexes})
+
+    kept = []
+    seen = set()
+    for lines, indexes in zip(pages, page_edges):
+        for i, line in enumerate(lines):
+            if i in indexes:
+                shape = _shape(line)
+                if counts[shape] >= min_repeats:
+                    if shape in seen:
+                        continue
+                    seen.add(shape)
+            kept.append(line)
+    return "\n".join(kept)
+
+
+def dedupe_lines(text: str, min_chars: int = 40) -> str:
+    """
+    Drops repeated copies of long lines (pasted boilerplate). Short lines
+    such as headings and date ranges legitimately repeat and are kept.
+    """
+    seen = set()
+    kept = []
+    for line in text.splitlines():
+        key = line.lower()
+        if len(key) >= min_chars:
+            if key in seen:
+                continue
+            seen.add(key)
+        kept.append(line)
+    return "\n".join(kept)
+
+
+def compact_text(text: str) -> str:
+    # Page breaks are line breaks to normalize_whitespace, so this goes first
+    text = strip_repeated_lines(text)
+    text = normalize_whitespace(text)
+    text = dedupe_lines(text)
+    return normalize_whitespace(text)
+
+
+def _split_chunks(text: str, chunk_tokens: int) -> list:
+    chunks, current, size = [], [], 0
+    for para in text.split("\n\n"):
+        para_tokens = estimate_tokens(para)
+        if current and size + para_tokens > chunk_tokens:
+            chunks.append("\n\n".join(current))
+            current, size = [], 0
+        current.append(para)
+        size += para_tokens
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
+
+
+def _condense_chunk(chunk: str, kind: str, model: str, priority: int = PRIORITY_GENERATION, served=None) -> str:
+    stats = {}
+    ok, output = router.generate(
+        router.TASK_CONDENSE,
+        CONDENSE_PROMPT.format(kind=kind, text=chunk),
+        model=model,
+        stats=stats,
+        priority=priority
+    )
+    if not (ok and output.strip()):
+        return chunk
+    if served is not None:
+        served.add(stats["model"])
+    return output.strip()
+
+
+def condense(
+    text: str,
+    budget: int,
+    kind: str,
+    model: str = None,
+    depth: int = 2,
+    priority: int = PRIORITY_GENERATION,
+    served=None
+) -> str:
+    """
+    Map-reduce condensing: chunks are condensed in parallel (map) and
+    joined (reduce); if the result is still over budget it is condensed
+    again, at most `depth` rounds. Models come from the "condense" route;
+    the ones that answered are added to the `served` set if given.
+    """
+    if estimate_tokens(text) <= budget or depth <= 0:
+        return text
+
+    chunks = _split_chunks(text, CONDENSE_CHUNK_TOKENS)
+    with ThreadPoolExecutor(max_workers=CONDENSE_CONCURRENCY) as pool:
+        parts = list(pool.map(lambda c: _condense_chunk(c, kind, model, priority, served), chunks))
+
+    condensed = "\n\n".join(parts)
+    if estimate_tokens(condensed) >= estimate_tokens(text):
+        return text
+    return condense(condensed, budget, kind, model, depth - 1, priority, served)
+
+
+def prepare_inputs(
+    jd_text: str,
+    resume_text: str,
+    budget: int = INPUT_TOKEN_BUDGET,
+    model: str = None,
+    priority: int = PRIORITY_GENERATION
+):
+    """
+    Compacts the JD and resume, condensing them if they still exceed the
+    token budget (split between the two in proportion to their size).
+
+    Returns (jd_text, resume_text, report) where report holds token counts
+    before / after, the savings and the models that did the condensing.
+    """
+    original = estimate_tokens(jd_text) + estimate_tokens(resume_text)
+
+    jd_text = compact_text(jd_text)
+    resume_text = compact_text(resume_text)
+    compacted = estimate_tokens(jd_text) + estimate_tokens(resume_text)
+
+    condensed = compacted > budget
+    served = set()
+    if condensed:
+        jd_share = estimate_tokens(jd_text) / compacted
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            jd_future = pool.submit(condense, jd_text, int(budget * jd_share), "job description", model, 2, priority, served)
+            resume_future = pool.submit(condense, resume_text, int(budget * (1 - jd_share)), "resume", model, 2, priority, served)
+            jd_text, resume_text = jd_future.result(), resume_future.result()
+
+    final = estimate_tokens(jd_text) + estimate_tokens(resume_text)
+    report = {
+        "original_tokens": original,
+        "compacted_tokens": compacted,
+        "final_tokens": final,
+        "saved_tokens": original - final,
+        "saved_pct": round(100 * (original - final) / original, 1) if original else 0.0,
+        "condensed": condensed,
+        "condense_models": sorted(served),
+    }
+    return jd_text, resume_text, report
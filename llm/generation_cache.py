@@ -0,0 +1,41 @@
+import re
+
+from config import CACHE_DIR, GENERATION_CACHE_MAX_MB, GENERATION_CACHE_MAX_AGE_DAYS
+from llm.prompt_builder import PROMPT_VERSION
+from utils.disk_cache import DiskCache, make_key
+
+_cache = DiskCache(
+    f"{CACHE_DIR}/generations",
+    max_bytes=GENERATION_CACHE_MAX_MB * 1024 * 1024,
+    max_age_sec=GENERATION_CACHE_MAX_AGE_DAYS * 86400,
+    suffix=".txt"
+)
+
+
+def normalize_text(text: str) -> str:
+    """
+    Collapses whitespace so cosmetic differences don't miss the cache.
+    """
+    return re.sub(r"\s+", " ", text or "").strip()
+
+
+def generation_key(jd_text, resume_text, n_tech, n_behav, difficulty, include_answers, model):
+    return make_key(
+        normalize_text(jd_text),
+        normalize_text(resume_text),
+        n_tech,
+        n_behav,
+        difficulty,
+        bool(include_answers),
+        model,
+        PROMPT_VERSION
+    )
+
+
+def get_cached_generation(key: str):
+    data = _cache.get(key)
+    return data.decode("utf-8") if data is not None else None
+
+
+def store_generation(key: str, output: str):
+    _cache.put(key, output.encode("utf-8"))
@@ -0,0 +1,249 @@
+import hashlib
+import json
+import threading
+import time
+from collections import Counter
+
+from llm import router
+from llm.ollama_client import OllamaError
+from interview.question_parser import FormatBStreamParser, parse_questions
+from utils.tracing import llm_span_attrs
+
+
+# Generations in flight by (model, prefix, prompt) hash: identical
+# requests (e.g. several users generating for the same JD and resume)
+# follow one Ollama stream instead of queueing one each
+_streams = {}
+_streams_lock = threading.Lock()
+
+
+class _SharedStream:
+    """
+    One router.stream generation on its own thread. Fragments and fallbacks
+    are kept in order, so every job following it - including one that
+    joins late - sees the whole stream from the start.
+    """
+
+    def __init__(self, key: str, model: str, prompt: str, prefix: str = None):
+        self.key = key
+        self.model = model
+        self.prompt = prompt
+        self.prefix = prefix
+        # ("fragment", text) or ("fallback", (failed_model, next_model, error))
+        self.events = []
+        self.stats = {}
+        self.error = None
+        self.done = False
+        # Position in the shared LLM queue while waiting (0 once running)
+        self.queue_position = 0
+        self._cond = threading.Condition()
+
+    def start(self):
+        threading.Thread(target=self._run, daemon=True, name="generation-stream").start()
+        return self
+
+    def _push(self, event):
+        with self._cond:
+            self.events.append(event)
+            self._cond.notify_all()
+
+    def _set_queue_position(self, position: int):
+        self.queue_position = position
+
+    def _run(self):
+        try:
+            for fragment in router.stream(
+                router.TASK_GENERATION,
+                self.prompt,
+                model=self.model,
+                prefix=self.prefix,
+                stats=self.stats,
+                on_queue=self._set_queue_position,
+                on_fallback=lambda *args: self._push(("fallback", args))
+            ):
+                self._push(("fragment", fragment))
+        except Exception as e:
+            self.error = e
+        finally:
+            # Later identical requests start a new generation
+            with _streams_lock:
+                if _streams.get(self.key) is self:
+                    del _streams[self.key]
+            with self._cond:
+                self.done = True
+                self._cond.notify_all()
+
+    def follow(self):
+        """
+        Yields every event from the first one, waiting for new ones until
+        the stream ends; then raises the stream's error, if any.
+        """
+        seen = 0
+        while True:
+            with self._cond:
+                while seen == len(self.events) and not self.done:
+                    self._cond.wait()
+                events = self.events[seen:]
+                if not events:
+                    break
+            seen += len(events)
+            yield from events
+        if self.error is not None:
+            raise self.error
+
+
+def _shared_stream(model: str, prompt: str, prefix: str = None) -> _SharedStream:
+    key = hashlib.sha256(json.dumps([model, prefix, prompt]).encode("utf-8")).hexdigest()
+    with _streams_lock:
+        stream = _streams.get(key)
+        if stream is None:
+            stream = _streams[key] = _SharedStream(key, model, prompt, prefix).start()
+    return stream
+
+
+class GenerationJob:
+    """
+    One streaming report generation running on a background thread.
+
+    The job object lives in st.session_state, so the report keeps arriving
+    across Streamlit reruns - e.g. after the user starts the interview
+    before the last token. Readers poll .text / .questions / .done from the
+    script thread; questions are parsed incrementally as chunks arrive.
+
+    The model comes from the "generation" route (model, if given, is tried
+    first). If it falls back mid-stream, the partial report is discarded
+    and the text restarts (after any seed) with the next model - unless
+    lock_questions() was called, in which case the job fails and keeps
+    the questions produced so far.
+
+    Jobs with the same model, prefix and prompt that overlap in time
+    follow one shared stream; each keeps its own seed, lock and trace.
+    """
+
+    def __init__(
+        self,
+        model: str,
+        prompt: str,
+        on_complete=None,
+        prefix: str = None,
+        tracer=None,
+        seed_text: str = "",
+        seed_questions=None
+    ):
+        self.model = model
+        self.prompt = prompt
+        self.prefix = prefix
+        self.tracer = tracer
+        self.on_complete = on_complete
+        # Already-known report text and questions (e.g. from the question
+        # bank) that the streamed output is appended to
+        self.seed_text = seed_text
+        self.seed_questions = list(seed_questions or [])
+        # Streamed questions continue the seed's numbering per section
+        self._numbered = Counter(q.section for q in self.seed_questions)
+        self.parts = [seed_text] if seed_text else []
+        self.questions = list(self.seed_questions)
+        self.stats = {}
+        self.error = None
+        self._stream = None
+        self._questions_locked = False
+        self._restart_lock = threading.Lock()
+        self._parser = FormatBStreamParser()
+        self._done = threading.Event()
+        self._thread = None
+
+    @classmethod
+    def completed(cls, output: str):
+        """
+        A job that is already finished, e.g. for a cached report.
+        """
+        job = cls(model=None, prompt=None)
+        job.parts.append(output)
+        job.questions.extend(parse_questions(output))
+        job._done.set()
+        return job
+
+    def start(self):
+        self._stream = _shared_stream(self.model, self.prompt, self.prefix)
+        self._thread = threading.Thread(target=self._run, daemon=True, name="generation")
+        self._thread.start()
+        return self
+
+    def _run(self):
+        started = time.perf_counter()
+        first_token = None
+        try:
+            for kind, value in self._stream.follow():
+                if kind == "fallback":
+                    self._restart(*value)
+                    continue
+                if first_token is None:
+                    first_token = time.perf_counter() - started
+                self.parts.append(value)
+                self.questions.extend(self._renumber(self._parser.feed(value)))
+            self.questions.extend(self._renumber(self._parser.close()))
+            self.stats.update(self._stream.stats)
+            # Fallback output must not be cached under the primary model's key
+            if self.on_complete is not None and not self.stats.get("fallbacks"):
+                self.on_complete(self.text)
+        except Exception as e:
+            self.error = str(e)
+            if self._stream.done:
+                self.stats.update(self._stream.stats)
+        finally:
+            if self.tracer is not None:
+                self.tracer.add(
+                    "generate",
+                    (time.perf_counter() - started) * 1000,
+                    ttft_ms=round(first_token * 1000, 2) if first_token is not None else None,
+                    questions=len(self.questions),
+                    error=self.error,
+                    **llm_span_attrs(self.stats)
+                )
+            self._done.set()
+
+    def _renumber(self, records) -> list:
+        if self.seed_questions:
+            for record in records:
+                self._numbered[record.section] += 1
+                record.number = self._numbered[record.section]
+        return records
+
+    @property
+    def queue_position(self) -> int:
+        """
+        Position in the shared LLM queue while waiting (0 once running).
+        """
+        return self._stream.queue_position if self._stream is not None else 0
+
+    def lock_questions(self):
+        """
+        Called when questions are handed out (the interview started):
+        from then on a model fallback must not replace them.
+        """
+        with self._restart_lock:
+            self._questions_locked = True
+
+    def _restart(self, failed_model, next_model, error):
+        with self._restart_lock:
+            if self._questions_locked:
+                # Ends this job; others following the stream carry on
+                raise OllamaError(
+                    f"{failed_model} failed after the interview started ({error}); "
+                    f"continuing with the questions generated so far"
+                )
+            self.parts = [self.seed_text] if self.seed_text else []
+            self.questions = list(self.seed_questions)
+            self._numbered = Counter(q.section for q in self.seed_questions)
+            self._parser = FormatBStreamParser()
+
+    @property
+    def text(self) -> str:
+        return "".join(self.parts)
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def wait(self, timeout: float = None) -> bool:
+        return self._done.wait(timeout)
@@ -1,26 +1,407 @@
+import asyncio
+import socket
 import subprocess
-import requests
+import threading
+import time
 import json
-from config import OLLAMA_HTTP_URL
+import hashlib
+import queue
 
-def call_ollama_http(model_name: str, prompt_text: str, timeout: int = 300):
-    payload = {"model": model_name, "prompt": prompt_text, "stream": True}
-    r = requests.post(OLLAMA_HTTP_URL, json=payload, stream=True, timeout=timeout)
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from config import OLLAMA_HTTP_URL, OLLAMA_POOL_SIZE, OLLAMA_KEEP_ALIVE
+from llm.scheduler import get_scheduler, PRIORITY_GENERATION
+
+# Stats Ollama reports on the final ("done") stream chunk
+STAT_FIELDS = (
+    "total_duration",
+    "load_duration",
+    "prompt_eval_count",
+    "prompt_eval_duration",
+    "eval_count",
+    "eval_duration",
+)
+
+
+# Marks the end of a response on the reader thread's queue
+_END = object()
+
+# The _Abortable of the request a reader thread is making, so the pool can
+# hand it the connection it checks out
+_reader = threading.local()
 
-    if r.status_code != 200:
-        return False, r.text
 
-    full = ""
-    for line in r.iter_lines():
+class OllamaError(RuntimeError):
+    pass
+
+
+class DeadlineExceeded(OllamaError):
+    pass
+
+
+class NDJSONStreamParser:
+    """
+    Incremental parser for Ollama's newline-delimited JSON stream.
+
+    The client feeds it one line at a time; it collects the text
+    fragments and keeps the final stats chunk.
+    """
+
+    def __init__(self):
+        self.parts = []
+        self.final = {}
+        self.error = None
+
+    def feed(self, line) -> str:
+        """
+        Parses one NDJSON line and returns its response fragment ("" if none).
+        """
         if not line:
-            continue
+            return ""
+        if isinstance(line, bytes):
+            line = line.decode("utf-8", errors="ignore")
         try:
-            data = json.loads(line.decode())
-            full += data.get("response", "")
-        except:
-            continue
+            data = json.loads(line)
+        except ValueError:
+            return ""
+
+        if "error" in data:
+            self.error = data["error"]
+            return ""
+
+        fragment = data.get("response", "")
+        if fragment:
+            self.parts.append(fragment)
+        if data.get("done"):
+            self.final = data
+        return fragment
+
+    def text(self) -> str:
+        return "".join(self.parts)
+
+
+class _Abortable:
+    """
+    The connection one reader thread's request is using. abort() shuts its
+    socket down from the consumer's thread: the reader's blocked read
+    returns, and Ollama stops generating for the closed connection.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._conn = None
+        self._done = False
+
+    def attach(self, conn):
+        with self._lock:
+            if not self._done:
+                self._conn = conn
+
+    def detach(self):
+        # Before the connection goes back to the pool for another request
+        with self._lock:
+            self._done = True
+            self._conn = None
+
+    def abort(self):
+        with self._lock:
+            sock = getattr(self._conn, "sock", None)
+            if sock is not None:
+                try:
+                    sock.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+
+
+class _TrackingPoolMixin:
+    def _get_conn(self, timeout=None):
+        conn = super()._get_conn(timeout)
+        request = getattr(_reader, "request", None)
+        if request is not None:
+            request.attach(conn)
+        return conn
+
+
+class _TrackingHTTPConnectionPool(_TrackingPoolMixin, HTTPConnectionPool):
+    pass
+
+
+class _TrackingHTTPSConnectionPool(_TrackingPoolMixin, HTTPSConnectionPool):
+    pass
+
+
+class _TrackingAdapter(HTTPAdapter):
+    """
+    HTTPAdapter whose pools report the connection a reader thread checks
+    out to its _Abortable.
+    """
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TrackingHTTPConnectionPool,
+            "https": _TrackingHTTPSConnectionPool,
+        }
+
+
+class OllamaClient:
+    """
+    Ollama HTTP client backed by one keep-alive connection pool.
+
+    A single instance is shared by every Streamlit session in the process
+    (see get_client), so calls reuse open TCP connections instead of
+    opening a new one per generation / evaluation. Requests are admitted
+    through the shared LLMScheduler.
+    """
+
+    def __init__(self, url: str = OLLAMA_HTTP_URL, pool_size: int = OLLAMA_POOL_SIZE, scheduler=None):
+        self.url = url
+        self.pool_size = pool_size
+        self.scheduler = scheduler if scheduler is not None else get_scheduler()
+
+        self.session = requests.Session()
+        adapter = _TrackingAdapter(
+            pool_connections=1,
+            pool_maxsize=pool_size,
+            pool_block=True
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        # Process-wide totals, so prompt-eval savings can be compared
+        self.metrics = {
+            "calls": 0,
+            "prompt_eval_count": 0,
+            "prompt_eval_duration": 0,
+        }
+        self._metrics_lock = threading.Lock()
+
+    def _payload(self, model_name: str, prompt_text: str, options=None, response_format=None):
+        payload = {
+            "model": model_name,
+            "prompt": prompt_text,
+            "stream": True,
+            "keep_alive": OLLAMA_KEEP_ALIVE,
+        }
+        if options:
+            payload["options"] = options
+        if response_format:
+            payload["format"] = response_format
+        return payload
+
+    def _record(self, parser: NDJSONStreamParser):
+        final = parser.final
+        with self._metrics_lock:
+            self.metrics["calls"] += 1
+            self.metrics["prompt_eval_count"] += final.get("prompt_eval_count", 0)
+            self.metrics["prompt_eval_duration"] += final.get("prompt_eval_duration", 0)
+
+    def _read(self, payload, timeout, lines: queue.Queue, cancelled: threading.Event, request: _Abortable):
+        """
+        Runs one streaming request on a helper thread, putting raw NDJSON
+        lines (or the exception that ended it) on `lines`, then _END.
+        Ollama only sends headers with the first token, so the whole
+        request lives here and the consumer can wait on it with deadlines
+        (and abort it through `request`).
+        """
+        _reader.request = request
+        try:
+            with self.session.post(self.url, json=payload, stream=True, timeout=timeout) as r:
+                try:
+                    if r.status_code != 200:
+                        lines.put(OllamaError(r.text))
+                        return
+                    for line in r.iter_lines():
+                        if cancelled.is_set():
+                            return
+                        lines.put(line)
+                finally:
+                    request.detach()
+        except requests.Timeout as e:
+            lines.put(DeadlineExceeded(f"no data from Ollama for {timeout}s ({e})"))
+        except requests.RequestException as e:
+            lines.put(OllamaError(f"[HTTP ERROR: {e}]"))
+        finally:
+            request.detach()
+            lines.put(_END)
+
+    def stream(
+        self,
+        model_name: str,
+        prompt_text: str,
+        timeout: int = 300,
+        parser=None,
+        prefix: str = None,
+        options=None,
+        stats=None,
+        priority: int = PRIORITY_GENERATION,
+        on_queue=None,
+        first_token_timeout: float = None,
+        deadline: float = None,
+        response_format=None
+    ):
+        """
+        Yields response fragments as Ollama produces them.
+
+        prefix is a static leading part of the prompt, sent as prefix +
+        prompt_text. Keeping it byte-identical across calls lets Ollama
+        reuse its KV cache for the shared tokens.
+
+        The request waits for a scheduler slot at `priority`; on_queue(n)
+        receives the queue position while waiting (0 once admitted).
+        Once admitted, DeadlineExceeded is raised if no token has arrived
+        after first_token_timeout seconds or the stream runs longer than
+        deadline seconds; timeout is the per-read socket timeout.
+        response_format is sent as Ollama `format`: "json" or a JSON schema.
+
+        Raises OllamaError on HTTP / stream errors. Pass a parser to read
+        the accumulated text and final stats chunk afterwards, or a stats
+        dict to have the timing fields copied into it.
+        """
+        with self.scheduler.slot(priority, on_position=on_queue) as waited:
+            admitted = time.perf_counter()
+            payload = self._payload(
+                model_name,
+                prefix + prompt_text if prefix else prompt_text,
+                options=options,
+                response_format=response_format
+            )
+            parser = parser if parser is not None else NDJSONStreamParser()
+
+            lines = queue.Queue()
+            cancelled = threading.Event()
+            request = _Abortable()
+            reader = threading.Thread(
+                target=self._read,
+                args=(payload, timeout, lines, cancelled, request),
+                daemon=True,
+                name="ollama-read"
+            )
+            reader.start()
+
+            first_token = True
+            try:
+                while True:
+                    limit = reason = None
+                    if first_token and first_token_timeout is not None:
+                        limit = admitted + first_token_timeout
+                        reason = f"produced no tokens within {first_token_timeout}s"
+                    if deadline is not None and (limit is None or admitted + deadline < limit):
+                        limit = admitted + deadline
+                        reason = f"exceeded the {deadline}s deadline"
+                    try:
+                        item = lines.get(timeout=None if limit is None else max(0.0, limit - time.perf_counter()))
+                    except queue.Empty:
+                        raise DeadlineExceeded(f"{model_name} {reason}") from None
+                    if item is _END:
+                        break
+                    if isinstance(item, Exception):
+                        raise item
+                    fragment = parser.feed(item)
+                    if parser.error:
+                        raise OllamaError(parser.error)
+                    if fragment:
+                        first_token = False
+                        yield fragment
+            finally:
+                # Keep the slot until the reader is gone: an abandoned request
+                # still occupies Ollama until its connection is closed. The
+                # socket may not exist yet on the first attempt, so retry.
+                cancelled.set()
+                while reader.is_alive():
+                    request.abort()
+                    reader.join(0.05)
+
+        self._record(parser)
+        if stats is not None:
+            stats.update({k: parser.final[k] for k in STAT_FIELDS if k in parser.final})
+            stats["model"] = model_name
+            stats["queue_wait_ms"] = round(waited, 2)
+
+    def generate(
+        self,
+        model_name: str,
+        prompt_text: str,
+        timeout: int = 300,
+        prefix: str = None,
+        options=None,
+        stats=None,
+        priority: int = PRIORITY_GENERATION,
+        deadline: float = None,
+        response_format=None
+    ):
+        """
+        Non-streaming call returning (ok, text). Identical requests already
+        in flight (same model, prefix, prompt and options) share one result.
+        Only the total deadline applies; nothing is shown before the end.
+        """
+        def run():
+            parser = NDJSONStreamParser()
+            call_stats = {}
+            try:
+                for _ in self.stream(
+                    model_name,
+                    prompt_text,
+                    timeout=timeout,
+                    parser=parser,
+                    prefix=prefix,
+                    options=options,
+                    stats=call_stats,
+                    priority=priority,
+                    deadline=deadline,
+                    response_format=response_format
+                ):
+                    pass
+            except OllamaError as e:
+                return False, str(e), call_stats
+            return True, parser.text(), call_stats
+
+        key = hashlib.sha256(
+            json.dumps([model_name, prefix, prompt_text, options, response_format], sort_keys=True, default=str).encode("utf-8")
+        ).hexdigest()
+        ok, text, call_stats = self.scheduler.coalesce(key, run)
+        if stats is not None:
+            stats.update(call_stats)
+        return ok, text
+
+    async def agenerate(self, model_name: str, prompt_text: str, timeout: int = 300, **kwargs):
+        """
+        asyncio variant of generate (same arguments and (ok, text) result).
+        The call runs on a worker thread, so it shares the connection pool,
+        the NDJSON parser, the scheduler and in-flight coalescing with the
+        sync path.
+        """
+        return await asyncio.to_thread(self.generate, model_name, prompt_text, timeout=timeout, **kwargs)
+
+    def close(self):
+        self.session.close()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> OllamaClient:
+    """
+    Returns the process-wide OllamaClient, creating it on first use.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = OllamaClient()
+    return _client
+
+
+def call_ollama_http(model_name: str, prompt_text: str, timeout: int = 300):
+    return get_client().generate(model_name, prompt_text, timeout=timeout)
+
+
+async def call_ollama_async(model_name: str, prompt_text: str, timeout: int = 300):
+    return await get_client().agenerate(model_name, prompt_text, timeout=timeout)
 
-    return True, full
 
 def call_ollama_cli(model_name, prompt_text, timeout=300):
     result = subprocess.run(
@@ -1,46 +1,63 @@
-def build_prompt(jd_text, resume_text, n_tech, n_behav, difficulty, include_answers):
-    return f"""
+from interview.skill_matcher import fit_summary
+
+# Bump whenever the template below changes; it is part of the
+# generation cache key, so old cached reports stop matching.
+PROMPT_VERSION = 4
+
+
+# Everything that varies per request (counts, difficulty, outlines) lives in
+# the parameters block at the END, after the JD and resume. The instructions
+# + JD + resume therefore form a stable prefix that Ollama can reuse across
+# regenerations of the same pair.
+INSTRUCTIONS = """
 You are an expert technical interviewer and hiring manager.
 
 Your job is to create a structured interview-preparation report for the candidate based on their resume and the provided job description.
+The exact question counts, the target difficulty and whether to include answer outlines are given in the INTERVIEW PARAMETERS section at the end.
 
 ======================================================
-🎯 **STRICT OUTPUT FORMAT (Format B)**  
-Do NOT output JSON.  
-Do NOT create custom formats.  
-Do NOT change section titles.  
+🎯 **STRICT OUTPUT FORMAT (Format B)**
+Do NOT output JSON.
+Do NOT create custom formats.
+Do NOT change section titles.
 Follow EXACTLY the structure below:
 
 ======================================================
 
 ### Candidate Fit Summary
+(The SKILL MATCH section below lists skills found by keyword matching. Build on it
+instead of re-listing every skill, correct it where the texts say otherwise, and
+focus on depth, seniority and relevance.)
 - Strong fit: <3–5 bullet points about what makes this candidate a good match>
 - Weak fit: <2–4 bullet points of gaps or risks>
 
 ---
 
-### Technical Questions (Mandatory: Generate exactly {n_tech})
+### Technical Questions (Mandatory: Generate exactly <technical question count>)
 For EACH technical question, use this format:
 
 1. <Question text tailored to the JD and resume>
-- Difficulty: <easy / medium / hard — matching target: {difficulty}>
+- Difficulty: <easy / medium / hard — matching the target difficulty>
 - Follow-up: <one follow-up question>
-{"- Expected Answer Outline:\n  - Key point 1\n  - Key point 2\n  - Key point 3" if include_answers else ""}
+- Expected Answer Outline: (ONLY when answer outlines are requested)
+  - Key point 1
+  - Key point 2
+  - Key point 3
 
-(Repeat this for all {n_tech} questions.)
+(Repeat this for all technical questions.)
 
 ---
 
-### Behavioral Questions (Mandatory: Generate exactly {n_behav})
-IMPORTANT: You MUST generate behavioral questions unless {n_behav} = 0.  
-If {n_behav} > 0, ALWAYS include this section and produce exactly {n_behav} questions.
+### Behavioral Questions (Mandatory: Generate exactly <behavioral question count>)
+IMPORTANT: You MUST generate behavioral questions unless the behavioral question count is 0.
+If it is greater than 0, ALWAYS include this section and produce exactly that many questions.
 
 For EACH behavioral question, use this format:
 
 1. <Behavioral question tailored to the role responsibilities>
 - Follow-up: <a deeper probing follow-up>
 
-(Repeat this for all {n_behav} questions.)
+(Repeat this for all behavioral questions.)
 
 ======================================================
 
@@ -52,14 +69,83 @@ For EACH behavioral question, use this format:
 - Do NOT include JSON, YAML, tables, or code blocks.
 
 ======================================================
+"""
+
+
+def _avoid_block(questions) -> str:
+    if not questions:
+        return ""
+    lines = "\n".join(f"- {q}" for q in questions)
+    return f"""
+### ALREADY SELECTED QUESTIONS (do NOT repeat or paraphrase these)
+{lines}
+"""
 
+
+def _skills_block(summary) -> str:
+    def items(skills):
+        return ", ".join(skills) if skills else "none"
+
+    return f"""
+### SKILL MATCH (keyword matches in the texts above; may be incomplete)
+- In both JD and resume: {items(summary["matched"])}
+- In the JD, not on the resume: {items(summary["missing"])}
+- On the resume, not in the JD: {items(summary["extra"])}
+"""
+
+
+def build_prompt_parts(
+    jd_text,
+    resume_text,
+    n_tech,
+    n_behav,
+    difficulty,
+    include_answers,
+    avoid=None,
+    skills=None,
+    tech_start=1,
+    behav_start=1
+):
+    """
+    Returns (prefix, suffix): the prefix depends only on the JD and resume,
+    the suffix carries the per-request parameters. avoid lists questions
+    already chosen elsewhere (e.g. from the question bank) not to repeat.
+    skills is a fit_summary() of the pair; it is computed from the given
+    texts when omitted (pass it to match on the uncompacted originals).
+    tech_start / behav_start are the first question numbers, for reports
+    that continue an already-numbered list.
+    """
+    numbering = ""
+    if tech_start != 1 or behav_start != 1:
+        numbering = (
+            f"- Number technical questions starting at: {tech_start}\n"
+            f"- Number behavioral questions starting at: {behav_start}\n"
+        )
+    if skills is None:
+        skills = fit_summary(jd_text, resume_text)
+    prefix = f"""{INSTRUCTIONS}
 ### JOB DESCRIPTION
 {jd_text}
 
 ### RESUME
 {resume_text}
-
+{_skills_block(skills)}
 ======================================================
-
+"""
+    suffix = f"""
+### INTERVIEW PARAMETERS
+- Technical question count: {n_tech}
+- Behavioral question count: {n_behav}
+- Target difficulty: {difficulty}
+- Answer outlines: {"yes" if include_answers else "no"}
+{numbering}{_avoid_block(avoid)}
 Now generate the final formatted interview preparation following ALL rules above.
-"""
\ No newline at end of file
+"""
+    return prefix, suffix
+
+
+def build_prompt(jd_text, resume_text, n_tech, n_behav, difficulty, include_answers):
+    prefix, suffix = build_prompt_parts(
+        jd_text, resume_text, n_tech, n_behav, difficulty, include_answers
+    )
+    return prefix + suffix
@@ -0,0 +1,119 @@
+from config import MODEL_ROUTES
+from llm.ollama_client import get_client, OllamaError
+from llm.scheduler import PRIORITY_GENERATION
+
+TASK_GENERATION = "generation"
+TASK_EVALUATION = "evaluation"
+TASK_CONDENSE = "condense"
+
+
+def primary_model(task: str) -> str:
+    return MODEL_ROUTES[task]["models"][0]
+
+
+def total_deadline(task: str) -> float:
+    return MODEL_ROUTES[task]["total_sec"]
+
+
+def candidates(task: str, model: str = None) -> list:
+    """
+    Models to try for a task, in order. An explicit model goes first and
+    the task's configured models remain as fallbacks.
+    """
+    models = list(MODEL_ROUTES[task]["models"])
+    if model:
+        models = [model] + [m for m in models if m != model]
+    return models
+
+
+def _record(stats, task, model, fallbacks, call_stats):
+    if stats is not None:
+        stats.update(call_stats)
+        stats.update({"task": task, "model": model, "fallbacks": fallbacks})
+
+
+def generate(
+    task: str,
+    prompt_text: str,
+    model: str = None,
+    prefix: str = None,
+    options=None,
+    stats=None,
+    priority: int = PRIORITY_GENERATION,
+    response_format=None,
+    deadline: float = None
+):
+    """
+    client.generate with the task's total deadline, falling back through
+    its models. Returns (ok, text); stats get the model that served the call
+    and the failed attempts ("fallbacks": [{"model", "error"}]).
+
+    deadline replaces the route's total_sec for calls that are larger than
+    the one the route is budgeted for (e.g. a batch of evaluations).
+    """
+    if deadline is None:
+        deadline = total_deadline(task)
+    fallbacks = []
+    for name in candidates(task, model):
+        call_stats = {}
+        ok, text = get_client().generate(
+            name,
+            prompt_text,
+            prefix=prefix,
+            options=options,
+            stats=call_stats,
+            priority=priority,
+            deadline=deadline,
+            response_format=response_format
+        )
+        if ok:
+            break
+        fallbacks.append({"model": name, "error": text})
+    _record(stats, task, name, fallbacks, call_stats)
+    return ok, text
+
+
+def stream(
+    task: str,
+    prompt_text: str,
+    model: str = None,
+    prefix: str = None,
+    options=None,
+    stats=None,
+    priority: int = PRIORITY_GENERATION,
+    on_queue=None,
+    on_fallback=None
+):
+    """
+    Streaming counterpart of generate(). A model that fails mid-stream is
+    abandoned and the next one starts from scratch; on_fallback(failed,
+    next_model, error) is called first so consumers can discard the
+    partial output. Raises OllamaError when every model fails.
+    """
+    route = MODEL_ROUTES[task]
+    models = candidates(task, model)
+    fallbacks = []
+    for i, name in enumerate(models):
+        call_stats = {}
+        try:
+            yield from get_client().stream(
+                name,
+                prompt_text,
+                prefix=prefix,
+                options=options,
+                stats=call_stats,
+                priority=priority,
+                on_queue=on_queue,
+                first_token_timeout=route["ttft_sec"],
+                deadline=route["total_sec"]
+            )
+        except OllamaError as e:
+            fallbacks.append({"model": name, "error": str(e)})
+            if i == len(models) - 1:
+                _record(stats, task, name, fallbacks, call_stats)
+                raise
+            if on_fallback is not None:
+                on_fallback(name, models[i + 1], str(e))
+            continue
+        _record(stats, task, name, fallbacks, call_stats)
+        return
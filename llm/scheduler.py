@@ -0,0 +1,146 @@
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+
+from config import LLM_MAX_IN_FLIGHT
+
+# Lower runs first
+PRIORITY_EVALUATION = 0   # interactive answer scoring
+PRIORITY_GENERATION = 1   # report generation, input condensing
+PRIORITY_BATCH = 2        # headless batch jobs
+
+
+class LLMScheduler:
+    """
+    Process-wide admission control in front of Ollama.
+
+    At most max_in_flight requests run at once; waiting callers are
+    admitted by priority, then arrival order. Callers block in their own
+    thread (no extra workers), so streaming works unchanged.
+
+    coalesce() shares one result between identical in-flight calls.
+    """
+
+    def __init__(self, max_in_flight: int = LLM_MAX_IN_FLIGHT):
+        self.max_in_flight = max_in_flight
+        self._cond = threading.Condition()
+        self._queue = []
+        self._active = 0
+        self._seq = itertools.count()
+        self._in_flight = {}
+        self.metrics = {
+            "admitted": 0,
+            "coalesced": 0,
+            "max_queue": 0,
+            "max_wait_ms": 0.0,
+        }
+
+    def _position(self, entry) -> int:
+        return 1 + sum(1 for other in self._queue if other < entry)
+
+    def acquire(self, priority: int = PRIORITY_GENERATION, on_position=None, poll: float = 0.5) -> float:
+        """
+        Blocks until a slot is free and this caller is first in line.
+
+        on_position(n) is called with the 1-based queue position while
+        waiting and with 0 once admitted; it runs under the scheduler lock,
+        so keep it cheap (e.g. set an attribute). Returns the wait in ms.
+        """
+        started = time.perf_counter()
+        entry = (priority, next(self._seq))
+        with self._cond:
+            heapq.heappush(self._queue, entry)
+            self.metrics["max_queue"] = max(self.metrics["max_queue"], len(self._queue))
+            try:
+                while self._active >= self.max_in_flight or self._queue[0] != entry:
+                    if on_position is not None:
+                        on_position(self._position(entry))
+                    self._cond.wait(poll)
+            except BaseException:
+                self._queue.remove(entry)
+                heapq.heapify(self._queue)
+                self._cond.notify_all()
+                raise
+            heapq.heappop(self._queue)
+            self._active += 1
+            self.metrics["admitted"] += 1
+            waited = (time.perf_counter() - started) * 1000
+            self.metrics["max_wait_ms"] = max(self.metrics["max_wait_ms"], round(waited, 2))
+            # The next waiter may be admissible too
+            self._cond.notify_all()
+        if on_position is not None:
+            on_position(0)
+        return waited
+
+    def release(self):
+        with self._cond:
+            self._active -= 1
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self, priority: int = PRIORITY_GENERATION, on_position=None):
+        """
+        Holds one in-flight slot for the block; yields the queue wait in ms.
+        """
+        waited = self.acquire(priority, on_position=on_position)
+        try:
+            yield waited
+        finally:
+            self.release()
+
+    def coalesce(self, key: str, fn):
+        """
+        Runs fn() unless a call with the same key is already running, in
+        which case that call's result (or exception) is shared.
+        """
+        with self._cond:
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = self._in_flight[key] = Future()
+            else:
+                self.metrics["coalesced"] += 1
+
+        if not owner:
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._cond:
+                self._in_flight.pop(key, None)
+
+    def status(self) -> dict:
+        with self._cond:
+            return {
+                "active": self._active,
+                "queued": len(self._queue),
+                "max_in_flight": self.max_in_flight,
+                **self.metrics,
+            }
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> LLMScheduler:
+    """
+    Shared scheduler: module state survives Streamlit reruns and is common
+    to every session in the process.
+    """
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = LLMScheduler()
+    return _scheduler
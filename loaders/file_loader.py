@@ -1,22 +1,102 @@
+import hashlib
+import io
+from pathlib import Path
+
 from PyPDF2 import PdfReader
 import docx
 
+from config import (
+    LOADER_CACHE_SIZE,
+    LOADER_MAX_PAGES,
+    LOADER_MAX_CHARS,
+    LOADER_PROBE_PAGES,
+)
+from utils.disk_cache import TieredCache, make_key
+
+# Joins PDF pages (a form feed, as pdftotext does)
+PAGE_BREAK = "\f"
+
+# Extracted text memoized by a hash of the file bytes, so Streamlit reruns
+# on the same upload don't re-parse it.
+_memo = TieredCache(LOADER_CACHE_SIZE)
+
+
 def extract_text_from_pdf(file_obj) -> str:
-    reader = PdfReader(file_obj)
-    return "".join(page.extract_text() or "" for page in reader.pages)
+    """
+    Extracts up to LOADER_MAX_PAGES pages / LOADER_MAX_CHARS characters.
+
+    If the first LOADER_PROBE_PAGES pages hold no text the document is
+    treated as image-only and abandoned; no more pages are read once
+    LOADER_MAX_CHARS is reached. Pages are joined with PAGE_BREAK, so
+    running headers / footers can be told apart from content later.
+    """
+    reader = PdfReader(io.BytesIO(file_obj.read()))
+    n_pages = min(len(reader.pages), LOADER_MAX_PAGES)
+
+    texts = []
+    n_chars = 0
+    for i in range(n_pages):
+        if n_chars >= LOADER_MAX_CHARS:
+            break
+        if i == LOADER_PROBE_PAGES and not any(t.strip() for t in texts):
+            return ""
+        texts.append(reader.pages[i].extract_text() or "")
+        n_chars += len(texts[-1])
+
+    if not any(t.strip() for t in texts[:LOADER_PROBE_PAGES]):
+        return ""
+    return PAGE_BREAK.join(texts)[:LOADER_MAX_CHARS]
+
 
 def extract_text_from_docx(file_obj) -> str:
     doc = docx.Document(file_obj)
-    return "\n".join(p.text for p in doc.paragraphs)
+    return "\n".join(p.text for p in doc.paragraphs)[:LOADER_MAX_CHARS]
+
 
 def extract_text_from_txt(file_obj) -> str:
-    return file_obj.read().decode("utf-8", errors="ignore")
+    return file_obj.read().decode("utf-8", errors="ignore")[:LOADER_MAX_CHARS]
+
+
+PDF_TYPE = "application/pdf"
+DOCX_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+# File suffix -> MIME type for files read from disk (CLI / batch use)
+SUFFIX_TYPES = {
+    ".pdf": PDF_TYPE,
+    ".docx": DOCX_TYPE,
+    ".txt": "text/plain",
+    ".md": "text/plain",
+}
+
+
+def load_bytes_text(data: bytes, mime_type: str) -> str:
+    key = make_key(mime_type, hashlib.sha256(data).hexdigest())
+    cached = _memo.get(key)
+    if cached is not None:
+        return cached
+
+    file_obj = io.BytesIO(data)
+    if mime_type == PDF_TYPE:
+        text = extract_text_from_pdf(file_obj)
+    elif mime_type == DOCX_TYPE:
+        text = extract_text_from_docx(file_obj)
+    else:
+        text = extract_text_from_txt(file_obj)
+
+    _memo.put(key, text)
+    return text
+
 
 def load_file_text(uploaded_file) -> str:
     if uploaded_file is None:
         return ""
-    if uploaded_file.type == "application/pdf":
-        return extract_text_from_pdf(uploaded_file)
-    if uploaded_file.type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document":
-        return extract_text_from_docx(uploaded_file)
-    return extract_text_from_txt(uploaded_file)
+    return load_bytes_text(uploaded_file.getvalue(), uploaded_file.type)
+
+
+def load_path_text(path) -> str:
+    """
+    Same as load_file_text for a file on disk; the type comes from the suffix.
+    """
+    path = Path(path)
+    mime_type = SUFFIX_TYPES.get(path.suffix.lower(), "text/plain")
+    return load_bytes_text(path.read_bytes(), mime_type)
@@ -1,28 +1,219 @@
-import tempfile
+import threading
+import queue
+import uuid
+import time
+from datetime import datetime
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 import sounddevice as sd
 import numpy as np
 from scipy.io.wavfile import write
-from faster_whisper import WhisperModel
+from config import (
+    WHISPER_MODEL_SIZE,
+    WHISPER_DEVICE,
+    WHISPER_COMPUTE_TYPE,
+    WHISPER_CPU_THREADS,
+    STT_MAX_DURATION_SEC,
+    STT_TRAILING_SILENCE_SEC,
+    STT_VAD_THRESHOLD,
+    STT_CHUNK_SEC,
+    STT_ARCHIVE_DIR,
+)
 
 SAMPLE_RATE = 16000
-model = WhisperModel("base", device="cpu", compute_type="int8")
+FRAME_SEC = 0.1
 
-def record_audio(duration=30):
+# A chunk is cut at the first pause this long once it reaches STT_CHUNK_SEC,
+# so words are not split between chunks.
+_PAUSE_SEC = 0.3
+
+# One model per process, shared by every Streamlit session. Loaded on first
+# use (or by warm_up) instead of at import, so pages render without paying
+# for it and users who never record never load it.
+_model = None
+_model_lock = threading.Lock()
+_warming = False
+
+
+def get_model():
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                from faster_whisper import WhisperModel
+
+                _model = WhisperModel(
+                    WHISPER_MODEL_SIZE,
+                    device=WHISPER_DEVICE,
+                    compute_type=WHISPER_COMPUTE_TYPE,
+                    cpu_threads=WHISPER_CPU_THREADS
+                )
+    return _model
+
+
+def warm_up():
+    """
+    Loads the model on a background thread if nobody has yet.
     """
-    Records audio from mic and saves to WAV.
+    global _warming
+    with _model_lock:
+        if _model is not None or _warming:
+            return
+        _warming = True
+    threading.Thread(target=get_model, daemon=True, name="whisper-warmup").start()
+
+def archive_audio(audio) -> Path | None:
+    """
+    Writes an answer to STT_ARCHIVE_DIR as WAV when archiving is enabled.
+    """
+    if not STT_ARCHIVE_DIR:
+        return None
+    archive_dir = Path(STT_ARCHIVE_DIR)
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    path = archive_dir / f"answer_{datetime.now():%Y%m%d_%H%M%S}_{uuid.uuid4().hex[:8]}.wav"
+    write(path, SAMPLE_RATE, audio)
+    return path
+
+
+def record_audio(duration=30) -> np.ndarray:
+    """
+    Records audio from mic and returns it as a mono float32 buffer,
+    ready for transcribe() without touching the filesystem.
     """
     audio = sd.rec(
         int(duration * SAMPLE_RATE),
         samplerate=SAMPLE_RATE,
         channels=1,
-        dtype=np.int16
+        dtype=np.float32
     )
     sd.wait()
 
-    temp_wav = tempfile.NamedTemporaryFile(suffix=".wav", delete=False)
-    write(temp_wav.name, SAMPLE_RATE, audio)
-    return temp_wav.name
+    # (n, 1) -> (n,) is a view, no copy
+    audio = audio.reshape(-1)
+    archive_audio(audio)
+    return audio
+
+
+def transcribe(audio, stats=None) -> str:
+    """
+    audio: 16 kHz mono float32 array (or a path to an audio file).
+
+    If a stats dict is given, audio_sec / transcribe_sec / rtf (real-time
+    factor: processing time per second of audio) are written into it.
+    """
+    if isinstance(audio, np.ndarray):
+        if np.issubdtype(audio.dtype, np.integer):
+            # PCM samples -> [-1, 1) (int16 / 32768, uint8 centred on 128, ...)
+            info = np.iinfo(audio.dtype)
+            half_range = (int(info.max) - int(info.min) + 1) / 2
+            audio = (audio.astype(np.float32) - (int(info.min) + half_range)) / half_range
+        else:
+            # Already in [-1, 1]; no copy when it is float32
+            audio = audio.astype(np.float32, copy=False)
+
+    started = time.perf_counter()
+    segments, info = get_model().transcribe(audio)
+    text = " ".join(seg.text for seg in segments).strip()
+
+    if stats is not None:
+        elapsed = time.perf_counter() - started
+        audio_sec = len(audio) / SAMPLE_RATE if isinstance(audio, np.ndarray) else info.duration
+        stats["audio_sec"] = round(audio_sec, 2)
+        stats["transcribe_sec"] = round(elapsed, 3)
+        stats["rtf"] = round(elapsed / audio_sec, 3) if audio_sec else None
+    return text
+
+
+def record_until_silence(
+    max_duration=STT_MAX_DURATION_SEC,
+    trailing_silence=STT_TRAILING_SILENCE_SEC,
+    threshold=STT_VAD_THRESHOLD,
+    chunk_sec=STT_CHUNK_SEC,
+    stats=None
+) -> str:
+    """
+    Records until the candidate stops talking and returns the transcript.
+
+    Recording ends after trailing_silence seconds of silence following
+    speech (or at max_duration). Audio is cut into ~chunk_sec pieces at
+    natural pauses and each piece is transcribed on a background thread
+    while the candidate is still talking, so only the last chunk is left
+    to transcribe when they stop.
+
+    If a stats dict is given, audio_sec, transcribe_sec (summed over
+    chunks), rtf, chunks and tail_sec (wait after the recording stopped)
+    are written into it.
+    """
+    frames = queue.Queue()
+    frame_size = int(SAMPLE_RATE * FRAME_SEC)
+
+    def on_audio(indata, n_frames, time_info, status):
+        frames.put(indata[:, 0].copy())
+
+    # One worker keeps chunks in order and the shared model single-tenant
+    transcriber = ThreadPoolExecutor(max_workers=1, thread_name_prefix="stt-chunk")
+    futures = []
+    chunk_stats = []
+
+    recording = [] if STT_ARCHIVE_DIR else None
+    chunk = []
+    chunk_len = 0.0
+    chunk_has_speech = False
+    heard_speech = False
+    silent_for = 0.0
+    recorded = 0.0
+
+    def flush():
+        nonlocal chunk, chunk_len, chunk_has_speech
+        if chunk and chunk_has_speech:
+            chunk_stats.append({})
+            futures.append(transcriber.submit(transcribe, np.concatenate(chunk), chunk_stats[-1]))
+        chunk, chunk_len, chunk_has_speech = [], 0.0, False
+
+    with sd.InputStream(
+        samplerate=SAMPLE_RATE,
+        channels=1,
+        dtype="float32",
+        blocksize=frame_size,
+        callback=on_audio
+    ):
+        while recorded < max_duration:
+            try:
+                frame = frames.get(timeout=2.0)
+            except queue.Empty:
+                break
+
+            frame_len = len(frame) / SAMPLE_RATE
+            recorded += frame_len
+            chunk.append(frame)
+            chunk_len += frame_len
+            if recording is not None:
+                recording.append(frame)
+
+            if np.sqrt(np.mean(frame * frame)) >= threshold:
+                heard_speech = chunk_has_speech = True
+                silent_for = 0.0
+            else:
+                silent_for += frame_len
+
+            if heard_speech and silent_for >= trailing_silence:
+                break
+
+            if chunk_len >= 2 * chunk_sec or (chunk_len >= chunk_sec and silent_for >= _PAUSE_SEC):
+                flush()
+
+    flush()
+    stopped = time.perf_counter()
+    if recording:
+        archive_audio(np.concatenate(recording))
+    transcriber.shutdown(wait=True)
+    text = " ".join(f.result() for f in futures).strip()
 
-def transcribe(wav_path: str) -> str:
-    segments, _ = model.transcribe(wav_path)
-    return " ".join(seg.text for seg in segments).strip()
+    if stats is not None:
+        busy = sum(c.get("transcribe_sec", 0) for c in chunk_stats)
+        stats["audio_sec"] = round(recorded, 2)
+        stats["transcribe_sec"] = round(busy, 3)
+        stats["rtf"] = round(busy / recorded, 3) if recorded else None
+        stats["chunks"] = len(chunk_stats)
+        stats["tail_sec"] = round(time.perf_counter() - stopped, 3)
+    return text
@@ -0,0 +1,105 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Modules import each other from the repository root (python -m pytest
+# adds it too; plain `pytest` doesn't)
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from benchmarks.fake_ollama import start_fake_ollama  # noqa: E402
+from llm.ollama_client import OllamaClient  # noqa: E402
+from llm.scheduler import LLMScheduler  # noqa: E402
+
+
+@pytest.fixture
+def fake_ollama():
+    """
+    (server, url) of a fake Ollama; attributes (latency, tokens_per_sec,
+    response, missing_models) can be changed per test.
+    """
+    server, url = start_fake_ollama()
+    yield server, url
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def client(fake_ollama):
+    """
+    An OllamaClient on the fake server with its own scheduler.
+    """
+    _, url = fake_ollama
+    client = OllamaClient(url=url, scheduler=LLMScheduler(max_in_flight=2))
+    yield client
+    client.close()
+
+
+@pytest.fixture
+def routed(monkeypatch, client):
+    """
+    Routes every llm.router call through the fake-server client.
+    """
+    from llm import router
+
+    monkeypatch.setattr(router, "get_client", lambda: client)
+    return client
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return tmp_path / "sessions.db"
+
+
+@pytest.fixture
+def conn(db_path):
+    from utils.session_db import connect
+
+    return connect(db_path)
+
+
+def _make_session(session_id="s1", role="Backend Engineer", candidate="Ada", date="2026-03-01T10:00:00", scores=(7, 8)):
+    questions = []
+    for i, score in enumerate(scores):
+        questions.append({
+            "question": f"Q{i}?",
+            "answer_text": f"Answer {i}",
+            "duration_sec": 30.0 + i,
+            "transcript_confidence": 0.9,
+            "evaluation": {
+                "clarity": score,
+                "confidence": score,
+                "technical_depth": score,
+                "strength": "Clear",
+                "improvement": "Go deeper",
+                "status": "ok",
+                "error": None,
+                "model": "llama3",
+                "attempts": 1,
+            },
+        })
+    overall = round(sum(scores) / len(scores), 2) if scores else 0.0
+    return {
+        "session_id": session_id,
+        "role": role,
+        "candidate": candidate,
+        "date": date,
+        "questions": questions,
+        "meta": {"total_questions": len(questions), "avg_answer_duration": 30.5},
+        "aggregated_feedback": {
+            "avg_clarity": overall,
+            "avg_confidence": overall,
+            "avg_technical_depth": overall,
+            "overall_score": overall,
+        },
+    }
+
+
+@pytest.fixture
+def make_session():
+    """
+    Factory for finalized session dicts (one evaluated question per score).
+    """
+    return _make_session
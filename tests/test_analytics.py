@@ -0,0 +1,119 @@
+import threading
+
+import numpy as np
+import pytest
+
+from utils import analytics
+from utils.session_db import connect, save_session
+
+
+def _finalize(conn, session):
+    save_session(session, conn=conn)
+    analytics.update_rollups(session, conn=conn)
+
+
+def test_rollups_accumulate_per_scope(conn, make_session):
+    _finalize(conn, make_session("a", role="SRE", scores=(6, 8)))
+    _finalize(conn, make_session("b", role="Data", scores=(10,)))
+
+    overall = analytics.read_rollup(conn=conn)
+    assert overall["clarity"]["count"] == 3
+    assert overall["clarity"]["mean"] == 8.0
+    assert overall["clarity"]["hist"][6] == 1
+    assert overall["overall_score"]["count"] == 2
+
+    sre = analytics.read_rollup("role", "SRE", conn=conn)
+    assert sre["clarity"]["count"] == 2
+    assert sre["clarity"]["std"] == 1.0
+    assert analytics.read_rollup("candidate", "Ada", conn=conn)["clarity"]["count"] == 3
+    assert analytics.read_rollup("role_month", "SRE|2026-03", conn=conn)["overall_score"]["count"] == 1
+
+
+def test_refinalizing_replaces_the_earlier_contribution(conn, make_session):
+    _finalize(conn, make_session("a", scores=(2, 4)))
+    _finalize(conn, make_session("a", scores=(9,)))
+
+    overall = analytics.read_rollup(conn=conn)
+    assert overall["clarity"]["count"] == 1
+    assert overall["clarity"]["mean"] == 9.0
+    assert sum(overall["clarity"]["hist"]) == 1
+    assert overall["overall_score"]["count"] == 1
+
+
+def test_legacy_rows_trigger_a_rebuild(conn, make_session):
+    _finalize(conn, make_session("a", scores=(5,)))
+    _finalize(conn, make_session("b", scores=(7,)))
+    # As written before contributions were stored
+    with conn:
+        conn.execute("UPDATE rollup_sessions SET contribution = NULL WHERE session_id = 'a'")
+
+    _finalize(conn, make_session("a", scores=(3,)))
+    overall = analytics.read_rollup(conn=conn)
+    assert overall["clarity"]["count"] == 2
+    assert overall["clarity"]["mean"] == 5.0
+
+
+def test_failed_evaluations_are_not_counted(conn, make_session):
+    session = make_session("a", scores=(6, 8))
+    session["questions"][1]["evaluation"]["status"] = "failed"
+    _finalize(conn, session)
+    assert analytics.read_rollup(conn=conn)["clarity"]["count"] == 1
+
+
+def test_percentile_rank_reads_the_rollups(conn, make_session):
+    for i, score in enumerate((2, 4, 6, 8)):
+        _finalize(conn, make_session(f"s{i}", role="SRE" if score > 3 else "Data", scores=(score,)))
+
+    assert analytics.percentile_rank(6.0, conn=conn) == 75.0
+    assert analytics.percentile_rank(5.9, conn=conn) == 50.0
+    assert analytics.percentile_rank(10, conn=conn) == 100.0
+    assert analytics.percentile_rank(6.0, role="SRE", conn=conn) == pytest.approx(66.7)
+    assert analytics.percentile_rank(6.0, role="Nobody", conn=conn) == 0.0
+
+
+def test_concurrent_finalizes_are_all_counted(db_path, conn, make_session):
+    # Create the tables up front
+    analytics.read_rollup(conn=conn)
+
+    def worker(t):
+        thread_conn = connect(db_path)
+        for i in range(50):
+            analytics.update_rollups(make_session(f"t{t}-{i}", scores=(5, 7)), conn=thread_conn)
+
+    threads = [threading.Thread(target=worker, args=(t,)) for t in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    overall = analytics.read_rollup(conn=conn)
+    assert overall["clarity"]["count"] == 400
+    assert overall["overall_score"]["count"] == 200
+    assert analytics.read_rollup("candidate", "Ada", conn=conn)["clarity"]["count"] == 400
+
+
+def test_session_bins_cover_0_to_10():
+    assert analytics._session_bin(0) == 0
+    assert analytics._session_bin(7.26) == 73
+    assert analytics._session_bin(10) == analytics.SESSION_BINS - 1
+    assert analytics._session_bin(11) == analytics.SESSION_BINS - 1
+
+
+def test_score_matrix_shape(make_session):
+    assert analytics.score_matrix([]).shape == (0, len(analytics.METRICS))
+    matrix = analytics.score_matrix(make_session(scores=(3, 5))["questions"])
+    assert np.array_equal(matrix, [[3, 3, 3], [5, 5, 5]])
+
+
+def test_trend_and_bands(conn, make_session):
+    for i, (date, score) in enumerate((("2026-01-10", 4), ("2026-01-20", 6), ("2026-03-05", 8))):
+        _finalize(conn, make_session(f"s{i}", date=date, scores=(score,)))
+
+    result = analytics.trend(conn=conn)
+    assert result["periods"] == ["2026-01", "2026-03"]
+    assert result["means"] == [5.0, 8.0]
+    assert result["counts"] == [2, 1]
+    assert result["slope"] == 1.5
+
+    bands = analytics.percentile_bands(percentiles=(50,), conn=conn)
+    assert bands == {"p50": 6.0}
@@ -0,0 +1,108 @@
+import json
+
+import pytest
+
+from interview.question_bank import QuestionBank
+from llm import batch_generate
+from llm.batch_generate import discover_jobs, completed_ids, run_batch
+
+DEFAULTS = {"n_technical": 5, "n_behavioral": 2, "difficulty": "mixed", "include_answers": False}
+
+
+@pytest.fixture
+def offline(monkeypatch, routed, db_path):
+    """
+    Batch runs against the fake server, with a throwaway bank and cache.
+    """
+    cache = {}
+    monkeypatch.setattr(batch_generate, "get_bank", lambda: QuestionBank(path=db_path))
+    monkeypatch.setattr(batch_generate, "get_cached_generation", cache.get)
+    monkeypatch.setattr(batch_generate, "store_generation", cache.__setitem__)
+    return cache
+
+
+def _candidates(root, names):
+    for name in names:
+        sub = root / name
+        sub.mkdir()
+        (sub / "jd.txt").write_text("Backend engineer: Python and Kafka.")
+        (sub / "resume.md").write_text(f"{name}: five years of Python.")
+    return root
+
+
+def test_discover_subdirectories(tmp_path):
+    _candidates(tmp_path, ["bob", "ada"])
+    (tmp_path / "incomplete").mkdir()
+    jobs = discover_jobs(tmp_path)
+    assert [job["id"] for job in jobs] == ["ada", "bob"]
+    assert jobs[0]["resume"].endswith("resume.md")
+
+
+def test_discover_resumes_for_one_jd(tmp_path):
+    (tmp_path / "ada.pdf").write_bytes(b"")
+    (tmp_path / "bob.txt").write_text("")
+    (tmp_path / "notes.csv").write_text("")
+    jobs = discover_jobs(tmp_path, jd="jd.txt")
+    assert [(job["id"], job["jd"]) for job in jobs] == [("ada", "jd.txt"), ("bob", "jd.txt")]
+
+
+def test_discover_manifest(tmp_path):
+    manifest = tmp_path / "round.jsonl"
+    manifest.write_text("\n".join([
+        json.dumps({"jd": "jd.txt", "resume": "people/ada.txt", "n_technical": 3}),
+        "",
+        json.dumps({"id": "b", "jd": "jd.txt", "resume": "bob.txt"}),
+    ]))
+    jobs = discover_jobs(manifest)
+    assert [job["id"] for job in jobs] == ["ada", "b"]
+    assert jobs[0]["resume"] == str(tmp_path / "people" / "ada.txt")
+    assert jobs[0]["n_technical"] == 3
+
+
+def test_manifest_entries_need_both_documents(tmp_path):
+    manifest = tmp_path / "round.jsonl"
+    manifest.write_text(json.dumps({"jd": "jd.txt"}))
+    with pytest.raises(ValueError, match="round.jsonl:1"):
+        discover_jobs(manifest)
+
+
+def test_completed_ids_ignore_errors_and_torn_lines(tmp_path):
+    out = tmp_path / "out.jsonl"
+    assert completed_ids(out) == set()
+    out.write_text("\n".join([
+        json.dumps({"id": "a", "status": "ok"}),
+        json.dumps({"id": "b", "status": "error"}),
+        '{"id": "c", "sta',
+    ]))
+    assert completed_ids(out) == {"a"}
+
+
+def test_run_batch_writes_one_record_per_job_and_resumes(tmp_path, offline):
+    source = tmp_path / "in"
+    source.mkdir()
+    jobs = discover_jobs(_candidates(source, ["ada", "bob"]))
+    jobs.append({"id": "ghost", "jd": str(tmp_path / "missing.txt"), "resume": str(tmp_path / "missing.txt")})
+    out = tmp_path / "out" / "packs.jsonl"
+
+    assert run_batch(jobs, out, DEFAULTS, concurrency=2) == (2, 1, 0)
+    records = {r["id"]: r for r in map(json.loads, out.read_text().splitlines())}
+    assert records["ada"]["status"] == "ok"
+    assert len(records["ada"]["questions"]) == 7
+    assert records["ada"]["skills"]["matched"] == ["Python"]
+    assert records["ada"]["cached"] is False
+    assert records["ghost"]["status"] == "error"
+
+    # Finished jobs are skipped; the failed one is retried
+    assert run_batch(jobs, out, DEFAULTS) == (0, 1, 2)
+
+
+def test_cached_generations_are_reused(tmp_path, offline):
+    job = {"id": "ada", "jd": str(tmp_path / "jd.txt"), "resume": str(tmp_path / "cv.txt")}
+    (tmp_path / "jd.txt").write_text("Backend engineer: Python and Kafka.")
+    (tmp_path / "cv.txt").write_text("Five years of Python.")
+
+    first = batch_generate.run_job(job, DEFAULTS)
+    second = batch_generate.run_job(job, DEFAULTS)
+    assert (first["cached"], second["cached"]) == (False, True)
+    assert first["output"] == second["output"]
+    assert second["banked"] == 0
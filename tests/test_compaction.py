@@ -0,0 +1,98 @@
+import pytest
+
+from llm import compaction
+from llm.compaction import (
+    PAGE_BREAK,
+    strip_repeated_lines,
+    dedupe_lines,
+    normalize_whitespace,
+    compact_text,
+    estimate_tokens,
+    prepare_inputs,
+)
+
+
+def _pages(n, body=lambda p: [f"Content of page {p}", "Job 1", "2019 - 2021"]):
+    return PAGE_BREAK.join(
+        "\n".join([f"Acme Corp - Resume of Ada {p}", *body(p), f"Page {p} of {n}"])
+        for p in range(1, n + 1)
+    )
+
+
+def test_running_headers_and_footers_keep_only_their_first_copy():
+    lines = strip_repeated_lines(_pages(4)).split("\n")
+
+    assert sum(line.startswith("Acme Corp") for line in lines) == 1
+    assert sum(line.startswith("Page ") for line in lines) == 1
+    assert [line for line in lines if line.startswith("Content")] == [f"Content of page {p}" for p in range(1, 5)]
+
+
+def test_lines_repeated_inside_pages_are_kept():
+    # "Job 1" and the date range repeat on every page but not at its edges
+    lines = strip_repeated_lines(_pages(4)).split("\n")
+    assert lines.count("Job 1") == 4
+    assert lines.count("2019 - 2021") == 4
+
+
+def test_edge_lines_below_the_repeat_threshold_are_kept():
+    text = _pages(2)
+    assert strip_repeated_lines(text) == text.replace(PAGE_BREAK, "\n")
+
+
+def test_text_without_page_breaks_is_unchanged():
+    text = "Header\nBody\nHeader\nBody\nHeader"
+    assert strip_repeated_lines(text) == text
+
+
+def test_dedupe_only_drops_long_repeated_lines():
+    boilerplate = "We are an equal opportunity employer and value diversity."
+    text = "\n".join([boilerplate, "Skills", boilerplate, "Skills"])
+    assert dedupe_lines(text) == "\n".join([boilerplate, "Skills", "Skills"])
+
+
+def test_normalize_whitespace():
+    assert normalize_whitespace("  a \t b  \n\n\n\nc  d ") == "a b\n\nc d"
+
+
+def test_compact_text_shrinks_paged_input():
+    text = _pages(6)
+    compacted = compact_text(text)
+    assert PAGE_BREAK not in compacted
+    assert estimate_tokens(compacted) < estimate_tokens(text)
+    assert "Content of page 6" in compacted
+
+
+def test_prepare_inputs_under_budget_does_not_call_the_model(monkeypatch):
+    def no_llm(*args, **kwargs):
+        raise AssertionError("condensed under budget")
+
+    monkeypatch.setattr(compaction.router, "generate", no_llm)
+    jd, resume, report = prepare_inputs("Python  engineer\n\n\n\nKafka", "Ada  Lovelace", budget=1000)
+
+    assert (jd, resume) == ("Python engineer\n\nKafka", "Ada Lovelace")
+    assert report["condensed"] is False
+    assert report["final_tokens"] <= report["original_tokens"]
+    assert report["condense_models"] == []
+
+
+def test_prepare_inputs_condenses_over_budget(monkeypatch):
+    def condense(task, prompt, model=None, stats=None, priority=None):
+        stats.update({"model": "small"})
+        return True, "- condensed"
+
+    monkeypatch.setattr(compaction.router, "generate", condense)
+    monkeypatch.setattr(compaction, "CONDENSE_CHUNK_TOKENS", 50)
+    paragraphs = "\n\n".join(f"Paragraph {i} " + "word " * 60 for i in range(8))
+
+    jd, resume, report = prepare_inputs(paragraphs, paragraphs.upper(), budget=100)
+    assert report["condensed"] is True
+    assert report["final_tokens"] < report["compacted_tokens"]
+    assert report["condense_models"] == ["small"]
+    assert set(jd.split("\n\n")) == {"- condensed"}
+
+
+@pytest.mark.parametrize("ok, output", [(False, "[HTTP ERROR: down]"), (True, "  ")])
+def test_failed_condensing_keeps_the_original_chunk(monkeypatch, ok, output):
+    monkeypatch.setattr(compaction.router, "generate", lambda *a, **k: (ok, output))
+    text = "A paragraph " * 100
+    assert compaction.condense(text, budget=10, kind="resume") == text
@@ -0,0 +1,126 @@
+import os
+import time
+
+from utils import disk_cache
+from utils.disk_cache import DiskCache, TieredCache, make_key
+
+
+def _age(cache, key, seconds):
+    path = cache.path(key)
+    stamp = time.time() - seconds
+    os.utime(path, (stamp, stamp))
+
+
+def test_make_key_is_stable_and_order_sensitive():
+    assert make_key("a", 1, {"x": 1, "y": 2}) == make_key("a", 1, {"y": 2, "x": 1})
+    assert make_key("a", "b") != make_key("b", "a")
+    assert len(make_key("a")) == 64
+
+
+def test_round_trip(tmp_path):
+    cache = DiskCache(tmp_path, max_bytes=1 << 20, max_age_sec=3600)
+    cache.put("k", b"data")
+    assert cache.get("k") == b"data"
+    cache.put_json("j", {"a": [1, 2]})
+    assert cache.get_json("j") == {"a": [1, 2]}
+    cache.delete("k")
+    assert cache.get("k") is None
+    assert cache.get("missing") is None
+
+
+def test_writes_leave_no_temp_files(tmp_path):
+    cache = DiskCache(tmp_path, max_bytes=1 << 20, max_age_sec=3600, suffix=".txt")
+    cache.put("k", b"data")
+    assert [p.name for p in tmp_path.iterdir()] == ["k.txt"]
+
+
+def test_least_recently_used_entries_are_evicted_over_the_size_limit(tmp_path):
+    cache = DiskCache(tmp_path, max_bytes=350, max_age_sec=3600)
+    for i, key in enumerate(("a", "b", "c")):
+        cache.put(key, b"x" * 100)
+        _age(cache, key, 30 - i)
+    # A hit marks "a" as used, so "b" is now the oldest
+    assert cache.get("a") is not None
+
+    cache.put("d", b"x" * 100)
+    assert cache.get("b") is None
+    assert all(cache.get(key) is not None for key in ("a", "c", "d"))
+
+
+def test_idle_entries_expire(tmp_path):
+    cache = DiskCache(tmp_path, max_bytes=1 << 20, max_age_sec=60)
+    cache.put("old", b"1")
+    cache.put("new", b"2")
+    _age(cache, "old", 120)
+
+    assert cache.get("old") is None
+    assert not cache.path("old").exists()
+    cache.put("other", b"3")
+    assert cache.get("new") == b"2"
+
+
+def _count_scans(cache):
+    scans = []
+    evict = cache.evict
+    cache.evict = lambda: (scans.append(1), evict())
+    return scans
+
+
+def test_writes_only_scan_the_directory_when_over_the_limit(tmp_path):
+    cache = DiskCache(tmp_path, max_bytes=1000, max_age_sec=3600)
+    scans = _count_scans(cache)
+    for i in range(9):
+        cache.put(f"k{i}", b"x" * 100)
+    cache.put("k0", b"x" * 50)
+    cache.delete("k1")
+    # Only the first write, to learn the directory's size
+    assert len(scans) == 1
+
+    cache.put("k9", b"x" * 100)
+    cache.put("k10", b"x" * 100)
+    assert len(scans) == 1
+
+    # 1050 bytes: over the limit
+    cache.put("k11", b"x" * 100)
+    assert len(scans) == 2
+    assert sum(p.stat().st_size for p in tmp_path.iterdir()) <= 1000
+
+
+def test_expired_entries_are_swept_periodically(tmp_path, monkeypatch):
+    cache = DiskCache(tmp_path, max_bytes=1 << 20, max_age_sec=60)
+    cache.put("old", b"1")
+    _age(cache, "old", 120)
+    cache.put("new", b"2")
+    assert cache.path("old").exists()
+
+    monkeypatch.setattr(disk_cache, "SWEEP_INTERVAL_SEC", 0)
+    cache.put("newer", b"3")
+    assert not cache.path("old").exists()
+
+
+def test_corrupt_json_is_a_miss(tmp_path):
+    cache = DiskCache(tmp_path, max_bytes=1 << 20, max_age_sec=3600)
+    cache.put("k", b"{not json")
+    assert cache.get_json("k") is None
+
+
+def test_tiered_cache_keeps_the_most_recent_items_in_memory():
+    cache = TieredCache(max_items=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_tiered_cache_promotes_disk_hits(tmp_path):
+    disk = DiskCache(tmp_path, max_bytes=1 << 20, max_age_sec=3600, suffix=".json")
+    TieredCache(max_items=2, disk=disk).put("k", {"v": 1})
+
+    # A fresh process: empty memory tier, same directory
+    cache = TieredCache(max_items=2, disk=disk)
+    assert cache.get("k") == {"v": 1}
+    disk.delete("k")
+    assert cache.get("k") == {"v": 1}
@@ -0,0 +1,161 @@
+import json
+
+import pytest
+
+from utils import evaluator
+from utils.disk_cache import TieredCache
+from utils.evaluator import (
+    parse_evaluation,
+    validate_evaluation,
+    _extract_json,
+    _parse_batch,
+    STATUS_OK,
+    STATUS_FAILED,
+)
+
+GOOD = {"clarity": 7, "confidence": 6, "technical_depth": 8, "strength": "Concrete", "improvement": "Quantify"}
+
+
+@pytest.fixture(autouse=True)
+def memory_cache(monkeypatch):
+    # Keep evaluations out of the on-disk cache
+    monkeypatch.setattr(evaluator, "_eval_cache", TieredCache(64))
+
+
+@pytest.fixture
+def replies(monkeypatch):
+    """
+    Queue of (ok, text) replies returned by router.generate, in order.
+    """
+    queue = []
+    calls = []
+
+    def generate(task, prompt, model=None, prefix=None, options=None, stats=None, priority=None, response_format=None,
+                 deadline=None):
+        calls.append({"prompt": prompt, "prefix": prefix, "options": options, "deadline": deadline})
+        ok, text = queue.pop(0)
+        stats.update({"model": model or "primary", "fallbacks": []})
+        return ok, text
+
+    monkeypatch.setattr(evaluator.router, "generate", generate)
+    monkeypatch.setattr(evaluator.router, "primary_model", lambda task: "primary")
+    return queue, calls
+
+
+def test_extract_json_skips_chatter():
+    text = "Sure! {not json} Here it is: " + json.dumps(GOOD) + " Hope that helps {"
+    assert _extract_json(text, "{") == GOOD
+
+
+def test_extract_json_reads_arrays():
+    assert _extract_json("Result:\n[1, 2]\nDone [", "[") == [1, 2]
+
+
+def test_extract_json_raises_without_json():
+    with pytest.raises(ValueError, match="No JSON"):
+        _extract_json("I cannot evaluate this.", "{")
+
+
+def test_validate_clamps_and_rounds_scores():
+    evaluation = validate_evaluation({**GOOD, "clarity": 12, "confidence": -3, "technical_depth": "7.6"})
+    assert (evaluation.clarity, evaluation.confidence, evaluation.technical_depth) == (10, 0, 8)
+    assert evaluation.status == STATUS_OK
+
+
+@pytest.mark.parametrize("obj, message", [
+    ([GOOD], "Expected a JSON object"),
+    ({k: v for k, v in GOOD.items() if k != "strength"}, "missing strength"),
+    ({**GOOD, "clarity": "high"}, "Non-numeric"),
+])
+def test_validate_rejects_bad_objects(obj, message):
+    with pytest.raises(ValueError, match=message):
+        validate_evaluation(obj)
+
+
+def test_parse_evaluation_strips_text_fields():
+    evaluation = parse_evaluation(json.dumps({**GOOD, "strength": "  Concrete  ", "improvement": None}))
+    assert evaluation.strength == "Concrete"
+    assert evaluation.improvement == ""
+
+
+def test_parse_batch_keeps_only_wanted_valid_items():
+    data = [
+        {**GOOD, "index": 0},
+        {**GOOD, "index": 1, "clarity": "n/a"},
+        {**GOOD, "index": 9},
+        "junk",
+    ]
+    results = _parse_batch(json.dumps(data), {0, 1})
+    assert list(results) == [0]
+
+
+def test_evaluate_answer_retries_unparseable_replies(replies):
+    queue, calls = replies
+    queue += [(True, "no json"), (True, json.dumps(GOOD))]
+
+    result = evaluator.evaluate_answer("Q?", "A.")
+    assert result["status"] == STATUS_OK
+    assert result["attempts"] == 2
+    assert result["model"] == "primary"
+    assert len(calls) == 2
+
+
+def test_evaluate_answer_gives_up_after_the_retries(replies):
+    queue, calls = replies
+    queue += [(True, "no json")] * (evaluator.EVAL_MAX_RETRIES + 1)
+
+    result = evaluator.evaluate_answer("Q?", "A.")
+    assert result["status"] == STATUS_FAILED
+    assert "No JSON" in result["error"]
+    assert len(calls) == evaluator.EVAL_MAX_RETRIES + 1
+
+
+def test_evaluate_answer_does_not_retry_failed_calls(replies):
+    queue, calls = replies
+    queue.append((False, "[HTTP ERROR: refused]"))
+
+    result = evaluator.evaluate_answer("Q?", "A.")
+    assert result["status"] == STATUS_FAILED
+    assert result["error"] == "[HTTP ERROR: refused]"
+    assert len(calls) == 1
+
+
+def test_evaluate_answer_is_memoized_on_normalized_answers(replies):
+    queue, calls = replies
+    queue.append((True, json.dumps(GOOD)))
+
+    first = evaluator.evaluate_answer("Q?", "Some  answer")
+    second = evaluator.evaluate_answer("Q?", "some answer ")
+    assert first == second
+    assert len(calls) == 1
+
+
+def test_batch_rescores_items_missing_from_the_reply(replies):
+    queue, calls = replies
+    items = [(0, "Q0?", "A0"), (1, "Q1?", "A1"), (2, "Q2?", "A2")]
+    queue += [
+        (True, json.dumps([{**GOOD, "index": 0}, {**GOOD, "index": 2, "clarity": 3}])),
+        (True, json.dumps({**GOOD, "clarity": 5})),
+    ]
+
+    results = evaluator.evaluate_answers_batch(items)
+    assert {idx: r["clarity"] for idx, r in results.items()} == {0: 7, 1: 5, 2: 3}
+    assert "### Item 1" in calls[0]["prompt"]
+    assert calls[0]["prefix"] == evaluator.BATCH_PREFIX
+    assert calls[1]["prefix"] == evaluator.SINGLE_PREFIX
+    # Three answers' worth of output gets three answers' worth of time
+    assert calls[0]["deadline"] == 3 * evaluator.router.total_deadline(evaluator.router.TASK_EVALUATION)
+    assert calls[1]["deadline"] is None
+
+
+def test_batch_fits_respects_the_context_window(monkeypatch):
+    items = [(i, "Question?", "word " * 200) for i in range(5)]
+    assert evaluator.batch_fits(items)
+    monkeypatch.setattr(evaluator, "MODEL_CONTEXT_TOKENS", 500)
+    assert not evaluator.batch_fits(items)
+
+
+def test_evaluates_against_the_fake_server(routed):
+    result = evaluator.evaluate_answer("Q?", "A.")
+    assert result["status"] == STATUS_OK
+    assert (result["clarity"], result["confidence"], result["technical_depth"]) == (7, 6, 8)
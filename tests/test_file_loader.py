@@ -0,0 +1,71 @@
+import io
+
+import docx
+import pytest
+
+from benchmarks.run_benchmarks import make_pdf, FakeUpload
+from loaders import file_loader
+from loaders.file_loader import (
+    PAGE_BREAK,
+    PDF_TYPE,
+    DOCX_TYPE,
+    extract_text_from_pdf,
+    load_bytes_text,
+    load_file_text,
+    load_path_text,
+)
+
+
+def _pages(n):
+    return [f"Page {p} heading\nSome text on page {p}" for p in range(1, n + 1)]
+
+
+def test_pdf_pages_are_joined_with_page_breaks():
+    text = extract_text_from_pdf(io.BytesIO(make_pdf(_pages(3))))
+    pages = text.split(PAGE_BREAK)
+    assert len(pages) == 3
+    assert "Some text on page 2" in pages[1]
+
+
+def test_pages_past_the_probe_are_extracted(monkeypatch):
+    monkeypatch.setattr(file_loader, "LOADER_PROBE_PAGES", 2)
+    text = extract_text_from_pdf(io.BytesIO(make_pdf(_pages(8))))
+    assert [f"Some text on page {p}" in text for p in range(1, 9)] == [True] * 8
+
+
+def test_character_cap_stops_extraction(monkeypatch):
+    monkeypatch.setattr(file_loader, "LOADER_PROBE_PAGES", 1)
+    monkeypatch.setattr(file_loader, "LOADER_MAX_CHARS", 100)
+    text = extract_text_from_pdf(io.BytesIO(make_pdf(_pages(20))))
+    assert len(text) == 100
+    assert "page 20" not in text
+
+
+def test_image_only_pdfs_are_abandoned():
+    assert extract_text_from_pdf(io.BytesIO(make_pdf(["", "", ""]))) == ""
+
+
+def test_docx_and_txt():
+    document = docx.Document()
+    for text in ("Ada Lovelace", "Python engineer"):
+        document.add_paragraph(text)
+    out = io.BytesIO()
+    document.save(out)
+
+    assert load_file_text(FakeUpload(out.getvalue(), DOCX_TYPE)) == "Ada Lovelace\nPython engineer"
+    assert load_bytes_text("Résumé ✓".encode("utf-8"), "text/plain") == "Résumé ✓"
+    assert load_file_text(None) == ""
+
+
+def test_results_are_memoized_by_content(monkeypatch):
+    data = make_pdf(_pages(2))
+    first = load_bytes_text(data, PDF_TYPE)
+    monkeypatch.setattr(file_loader, "extract_text_from_pdf", lambda f: pytest.fail("parsed twice"))
+    assert load_bytes_text(data, PDF_TYPE) == first
+
+
+def test_load_path_text_uses_the_suffix(tmp_path):
+    (tmp_path / "resume.pdf").write_bytes(make_pdf(_pages(1)))
+    (tmp_path / "jd.md").write_text("# Backend engineer")
+    assert "Some text on page 1" in load_path_text(tmp_path / "resume.pdf")
+    assert load_path_text(tmp_path / "jd.md") == "# Backend engineer"
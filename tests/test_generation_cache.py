@@ -0,0 +1,19 @@
+from llm import generation_cache
+from llm.generation_cache import generation_key, normalize_text
+
+JD = "Senior backend engineer. Python, Kafka and Kubernetes required."
+RESUME = "Six years of Python and Kafka at Acme."
+
+
+def test_generation_key_ignores_cosmetic_whitespace():
+    key = generation_key(JD, RESUME, 5, 2, "mixed", False, "llama3")
+    assert key == generation_key(f"  {JD}\n\n", RESUME.replace(" ", "  "), 5, 2, "mixed", 0, "llama3")
+    assert key != generation_key(JD, RESUME, 5, 2, "hard", False, "llama3")
+    assert key != generation_key(JD, RESUME, 5, 2, "mixed", False, "llama3.2:3b")
+    assert normalize_text(None) == ""
+
+
+def test_prompt_changes_invalidate_cached_reports(monkeypatch):
+    key = generation_key(JD, RESUME, 5, 2, "mixed", False, "llama3")
+    monkeypatch.setattr(generation_cache, "PROMPT_VERSION", generation_cache.PROMPT_VERSION + 1)
+    assert generation_key(JD, RESUME, 5, 2, "mixed", False, "llama3") != key
@@ -0,0 +1,201 @@
+import threading
+import time
+
+import pytest
+
+from interview.question_parser import QuestionRecord, SECTION_TECHNICAL, SECTION_BEHAVIORAL
+from llm import generation_job
+from llm.generation_job import GenerationJob
+from llm.ollama_client import OllamaError
+
+REPORT = """### Technical Questions
+1. How do you size a Kafka cluster?
+- Difficulty: medium
+2. How do you tune PostgreSQL autovacuum?
+
+### Behavioral Questions
+1. Tell me about a hard deadline.
+"""
+# Up to the second technical question, so only the first is complete
+PARTIAL = REPORT[:REPORT.index("autovacuum?\n") + len("autovacuum?\n")]
+
+
+def _fake_stream(chunks_by_model, gate=None):
+    """
+    Stands in for router.stream: yields each model's chunks, falling back
+    to the next model when the chunk is an exception.
+    """
+    def stream(task, prompt, model=None, prefix=None, stats=None, on_queue=None, on_fallback=None):
+        models = list(chunks_by_model)
+        for i, name in enumerate(models):
+            try:
+                for chunk in chunks_by_model[name]:
+                    if gate is not None:
+                        gate(chunk)
+                    if isinstance(chunk, Exception):
+                        raise chunk
+                    yield chunk
+            except OllamaError as e:
+                if i == len(models) - 1:
+                    raise
+                on_fallback(name, models[i + 1], str(e))
+                continue
+            stats.update({"model": name, "fallbacks": [{"model": m} for m in models[:i]]})
+            return
+    return stream
+
+
+@pytest.fixture(autouse=True)
+def streams(monkeypatch):
+    # No stream left running by an earlier test can be joined
+    monkeypatch.setattr(generation_job, "_streams", {})
+
+
+def _wait_until(predicate, timeout=5.0):
+    deadline = time.perf_counter() + timeout
+    while not predicate():
+        assert time.perf_counter() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+def _run(job):
+    job.start()
+    assert job.wait(5)
+    return job
+
+
+def test_questions_are_parsed_while_streaming(monkeypatch):
+    monkeypatch.setattr(generation_job.router, "stream", _fake_stream({"m": [REPORT[:40], REPORT[40:]]}))
+    completed = []
+    job = _run(GenerationJob("m", "prompt", on_complete=completed.append))
+
+    assert job.error is None
+    assert job.text == REPORT
+    assert [(q.section, q.number) for q in job.questions] == [
+        (SECTION_TECHNICAL, 1), (SECTION_TECHNICAL, 2), (SECTION_BEHAVIORAL, 1)
+    ]
+    assert completed == [REPORT]
+
+
+def test_fallback_before_the_interview_restarts_the_report(monkeypatch):
+    monkeypatch.setattr(generation_job.router, "stream", _fake_stream({
+        "primary": ["### Technical Questions\n1. Half a question\n", OllamaError("stalled")],
+        "backup": [REPORT],
+    }))
+    completed = []
+    job = _run(GenerationJob("primary", "prompt", on_complete=completed.append))
+
+    assert job.error is None
+    assert job.text == REPORT
+    assert "Half a question" not in [q.text for q in job.questions]
+    assert len(job.questions) == 3
+    # Fallback output is not cached under the primary model's key
+    assert completed == []
+
+
+def test_fallback_after_lock_keeps_the_handed_out_questions(monkeypatch):
+    locked = threading.Event()
+    resume = threading.Event()
+
+    def gate(chunk):
+        if isinstance(chunk, Exception):
+            locked.set()
+            resume.wait(5)
+
+    monkeypatch.setattr(generation_job.router, "stream", _fake_stream({
+        "primary": [PARTIAL, OllamaError("stalled")],
+        "backup": [REPORT],
+    }, gate=gate))
+    job = GenerationJob("primary", "prompt").start()
+    assert locked.wait(5)
+    _wait_until(lambda: job.questions)
+    handed_out = [q.text for q in job.questions]
+    job.lock_questions()
+    resume.set()
+    assert job.wait(5)
+
+    assert handed_out == ["How do you size a Kafka cluster?"]
+    assert [q.text for q in job.questions] == handed_out
+    assert "after the interview started" in job.error
+    assert job.text == PARTIAL
+
+
+def test_identical_jobs_share_one_stream(monkeypatch):
+    release = threading.Event()
+    calls = []
+    fake = _fake_stream({"m": [REPORT[:40], REPORT[40:]]}, gate=lambda chunk: release.wait(5))
+
+    def stream(task, prompt, **kwargs):
+        calls.append(prompt)
+        yield from fake(task, prompt, **kwargs)
+
+    monkeypatch.setattr(generation_job.router, "stream", stream)
+    completed = []
+    first = GenerationJob("m", "prompt", prefix="docs", on_complete=completed.append).start()
+    second = GenerationJob("m", "prompt", prefix="docs", on_complete=completed.append).start()
+    other = GenerationJob("m", "prompt", prefix="other docs").start()
+    release.set()
+    assert all(job.wait(5) for job in (first, second, other))
+
+    assert calls == ["prompt", "prompt"]
+    assert first.text == second.text == REPORT
+    assert [q.text for q in second.questions] == [q.text for q in first.questions]
+    assert second.stats["model"] == "m"
+    assert completed == [REPORT, REPORT]
+
+    # Finished streams are not reused
+    _run(GenerationJob("m", "prompt", prefix="docs"))
+    assert len(calls) == 3
+
+
+def test_a_locked_job_does_not_stop_others_on_the_same_stream(monkeypatch):
+    locked = threading.Event()
+    resume = threading.Event()
+
+    def gate(chunk):
+        if isinstance(chunk, Exception):
+            locked.set()
+            resume.wait(5)
+
+    monkeypatch.setattr(generation_job.router, "stream", _fake_stream({
+        "primary": [PARTIAL, OllamaError("stalled")],
+        "backup": [REPORT],
+    }, gate=gate))
+    interviewing = GenerationJob("primary", "prompt").start()
+    reviewing = GenerationJob("primary", "prompt").start()
+    assert locked.wait(5)
+    _wait_until(lambda: interviewing.questions)
+    interviewing.lock_questions()
+    resume.set()
+    assert interviewing.wait(5) and reviewing.wait(5)
+
+    assert "after the interview started" in interviewing.error
+    assert interviewing.text == PARTIAL
+    assert reviewing.error is None
+    assert reviewing.text == REPORT
+    assert reviewing.stats["model"] == "backup"
+
+
+def test_seeded_jobs_continue_the_seed_numbering(monkeypatch):
+    seed = [
+        QuestionRecord(SECTION_TECHNICAL, 1, "Banked technical question?"),
+        QuestionRecord(SECTION_BEHAVIORAL, 1, "Banked behavioral question?"),
+    ]
+    monkeypatch.setattr(generation_job.router, "stream", _fake_stream({"m": [REPORT]}))
+    job = _run(GenerationJob("m", "prompt", seed_text="(seed)\n", seed_questions=seed))
+
+    assert job.text == "(seed)\n" + REPORT
+    assert [(q.section, q.number) for q in job.questions] == [
+        (SECTION_TECHNICAL, 1),
+        (SECTION_BEHAVIORAL, 1),
+        (SECTION_TECHNICAL, 2),
+        (SECTION_TECHNICAL, 3),
+        (SECTION_BEHAVIORAL, 2),
+    ]
+
+
+def test_completed_job_parses_cached_output():
+    job = GenerationJob.completed(REPORT)
+    assert job.done
+    assert job.text == REPORT
+    assert len(job.questions) == 3
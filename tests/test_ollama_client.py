@@ -0,0 +1,203 @@
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+
+from benchmarks.fake_ollama import sample_report
+from llm.ollama_client import NDJSONStreamParser, DeadlineExceeded, OllamaError
+
+
+def _readers():
+    return [t for t in threading.enumerate() if t.name == "ollama-read"]
+
+
+def _wait_until(predicate, timeout=3.0):
+    deadline = time.perf_counter() + timeout
+    while not predicate():
+        assert time.perf_counter() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_ndjson_parser_collects_fragments_and_final_stats():
+    parser = NDJSONStreamParser()
+    lines = [
+        json.dumps({"response": "Hello", "done": False}).encode(),
+        b"",
+        b"not json",
+        json.dumps({"response": " world", "done": False}),
+        json.dumps({"response": "", "done": True, "eval_count": 2}),
+    ]
+    fragments = [parser.feed(line) for line in lines]
+
+    assert fragments == ["Hello", "", "", " world", ""]
+    assert parser.text() == "Hello world"
+    assert parser.final["eval_count"] == 2
+    assert parser.error is None
+
+
+def test_ndjson_parser_records_errors():
+    parser = NDJSONStreamParser()
+    assert parser.feed(json.dumps({"error": "model not found"})) == ""
+    assert parser.error == "model not found"
+
+
+def test_stream_yields_the_report_and_stats(client):
+    stats = {}
+    text = "".join(client.stream("llama3", "prompt", stats=stats))
+
+    assert text == sample_report().rstrip()
+    assert stats["model"] == "llama3"
+    assert stats["eval_count"] > 0
+    assert "queue_wait_ms" in stats
+    assert client.metrics["calls"] == 1
+
+
+def test_stream_sends_prefix_and_prompt_as_one_prompt(client):
+    stats = {}
+    list(client.stream("llama3", "suffix", prefix="x" * 400, stats=stats))
+    # The fake reports len(prompt) // 4 prompt tokens
+    assert stats["prompt_eval_count"] == len("x" * 400 + "suffix") // 4
+
+
+def test_generate_returns_ok_and_text(client):
+    ok, text = client.generate("llama3", "Question:\nQ\n\nAnswer:\nA")
+    assert ok
+    assert '"clarity": 7' in text
+
+
+def test_agenerate_runs_through_the_scheduler(fake_ollama, client):
+    server, _ = fake_ollama
+    server.missing_models = {"ghost"}
+
+    async def main():
+        return await asyncio.gather(
+            client.agenerate("llama3", "Question:\nQ\n\nAnswer:\nA"),
+            client.agenerate("llama3", "prompt"),
+            client.agenerate("ghost", "prompt"),
+        )
+
+    evaluation, report, missing = asyncio.run(main())
+    assert evaluation[0] and '"clarity": 7' in evaluation[1]
+    assert report == (True, sample_report().rstrip())
+    assert not missing[0] and "not found" in missing[1]
+    assert client.scheduler.metrics["admitted"] == 3
+
+
+def test_http_errors_come_back_once_wrapped(fake_ollama, client):
+    server, _ = fake_ollama
+    server.missing_models = {"ghost"}
+
+    ok, text = client.generate("ghost", "prompt")
+    assert not ok
+    assert "not found" in text
+    assert not text.startswith("[HTTP ERROR: [HTTP ERROR")
+
+
+def test_unreachable_server_is_an_http_error(client):
+    client.url = "http://127.0.0.1:9/api/generate"
+    ok, text = client.generate("llama3", "prompt", timeout=2)
+    assert not ok
+    assert text.startswith("[HTTP ERROR: ")
+    assert "[HTTP ERROR: [HTTP ERROR" not in text
+
+
+def test_first_token_timeout_covers_the_wait_for_headers(fake_ollama, client):
+    server, _ = fake_ollama
+    # Ollama only sends headers with the first token
+    server.latency = 1.0
+
+    started = time.perf_counter()
+    with pytest.raises(DeadlineExceeded, match="no tokens within"):
+        list(client.stream("llama3", "prompt", first_token_timeout=0.2))
+    assert time.perf_counter() - started < 0.8
+
+
+def test_first_token_timeout_stops_applying_after_the_first_token(fake_ollama, client):
+    server, _ = fake_ollama
+    server.tokens_per_sec = 200
+    server.response = "one two three four five six seven eight nine ten"
+
+    # The whole reply takes ~50 ms, longer than the first-token limit
+    text = "".join(client.stream("llama3", "prompt", first_token_timeout=0.03))
+    assert text == server.response
+
+
+def test_total_deadline_ends_a_slow_stream(fake_ollama, client):
+    server, _ = fake_ollama
+    server.tokens_per_sec = 20
+
+    fragments = []
+    with pytest.raises(DeadlineExceeded, match="deadline"):
+        for fragment in client.stream("llama3", "prompt", deadline=0.3):
+            fragments.append(fragment)
+    assert 0 < len(fragments) < 20
+
+
+def test_missed_first_token_closes_the_request_before_releasing_the_slot(fake_ollama, client):
+    server, _ = fake_ollama
+    server.latency = 1.0
+
+    with pytest.raises(DeadlineExceeded):
+        list(client.stream("llama3", "prompt", first_token_timeout=0.2))
+    # Nothing is left waiting on Ollama once the fallback can be admitted
+    assert _readers() == []
+    assert client.scheduler.status()["active"] == 0
+    _wait_until(lambda: server.dropped == 1)
+
+
+def test_missed_deadline_mid_stream_closes_the_request(fake_ollama, client):
+    server, _ = fake_ollama
+    server.tokens_per_sec = 5
+
+    with pytest.raises(DeadlineExceeded):
+        list(client.stream("llama3", "prompt", deadline=0.3))
+    assert _readers() == []
+    _wait_until(lambda: server.dropped == 1)
+
+
+def test_abandoned_stream_closes_the_request(fake_ollama, client):
+    server, _ = fake_ollama
+    server.tokens_per_sec = 5
+
+    fragments = client.stream("llama3", "prompt")
+    next(fragments)
+    fragments.close()
+    assert _readers() == []
+    assert client.scheduler.status()["active"] == 0
+    _wait_until(lambda: server.dropped == 1)
+
+
+def test_generate_reports_deadline_as_failure(fake_ollama, client):
+    server, _ = fake_ollama
+    server.latency = 1.0
+
+    ok, text = client.generate("llama3", "prompt", deadline=0.2)
+    assert not ok
+    assert "deadline" in text
+
+
+def test_identical_generate_calls_are_coalesced(fake_ollama, client):
+    server, _ = fake_ollama
+    server.latency = 0.3
+    results = []
+
+    def call():
+        results.append(client.generate("llama3", "same prompt"))
+
+    threads = [threading.Thread(target=call) for _ in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(results) == 3
+    assert len(set(results)) == 1
+    assert client.scheduler.metrics["coalesced"] == 2
+    assert client.metrics["calls"] == 1
+
+
+def test_ollama_error_is_a_runtime_error():
+    assert issubclass(DeadlineExceeded, OllamaError)
+    assert issubclass(OllamaError, RuntimeError)
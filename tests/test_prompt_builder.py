@@ -0,0 +1,50 @@
+from llm.prompt_builder import build_prompt, build_prompt_parts
+
+JD = "Senior backend engineer. Python, Kafka and Kubernetes required."
+RESUME = "Six years of Python and Kafka at Acme."
+
+
+def test_prefix_depends_only_on_the_documents():
+    prefix_a, suffix_a = build_prompt_parts(JD, RESUME, 5, 2, "mixed", False)
+    prefix_b, suffix_b = build_prompt_parts(JD, RESUME, 8, 3, "hard", True, avoid=["Q?"])
+
+    assert prefix_a == prefix_b
+    assert suffix_a != suffix_b
+    assert "- Technical question count: 8" in suffix_b
+    assert "- Answer outlines: yes" in suffix_b
+    assert JD in prefix_a and RESUME in prefix_a
+
+
+def test_build_prompt_is_prefix_plus_suffix():
+    prefix, suffix = build_prompt_parts(JD, RESUME, 5, 2, "mixed", False)
+    assert build_prompt(JD, RESUME, 5, 2, "mixed", False) == prefix + suffix
+
+
+def test_skill_match_block():
+    prefix, _ = build_prompt_parts(JD, RESUME, 5, 2, "mixed", False)
+    assert "- In both JD and resume: Kafka, Python" in prefix
+    assert "- In the JD, not on the resume: Kubernetes" in prefix
+    assert "- On the resume, not in the JD: none" in prefix
+
+
+def test_given_skills_are_used_as_is():
+    skills = {"matched": ["Rust"], "missing": [], "extra": []}
+    prefix, _ = build_prompt_parts(JD, RESUME, 5, 2, "mixed", False, skills=skills)
+    assert "- In both JD and resume: Rust" in prefix
+
+
+def test_avoid_list():
+    _, suffix = build_prompt_parts(JD, RESUME, 5, 2, "mixed", False, avoid=["What is Kafka?"])
+    assert "ALREADY SELECTED QUESTIONS" in suffix
+    assert "- What is Kafka?" in suffix
+    _, suffix = build_prompt_parts(JD, RESUME, 5, 2, "mixed", False)
+    assert "ALREADY SELECTED QUESTIONS" not in suffix
+
+
+def test_numbering_lines_only_for_continued_lists():
+    _, suffix = build_prompt_parts(JD, RESUME, 5, 2, "mixed", False)
+    assert "starting at" not in suffix
+
+    _, suffix = build_prompt_parts(JD, RESUME, 5, 2, "mixed", False, tech_start=4, behav_start=2)
+    assert "- Number technical questions starting at: 4" in suffix
+    assert "- Number behavioral questions starting at: 2" in suffix
@@ -0,0 +1,156 @@
+import sqlite3
+
+import pytest
+
+from interview import question_bank
+from interview.question_bank import QuestionBank, format_report
+from interview.question_parser import QuestionRecord, parse_questions, SECTION_TECHNICAL, SECTION_BEHAVIORAL
+
+JD = "Backend engineer: Python services, Kafka consumers, PostgreSQL tuning, Redis caching."
+RESUME = "Built Python services with Kafka and PostgreSQL; added Redis caching."
+
+
+def tech(text, difficulty="medium", **kwargs):
+    return QuestionRecord(SECTION_TECHNICAL, 1, text, difficulty=difficulty, **kwargs)
+
+
+def behav(text, **kwargs):
+    return QuestionRecord(SECTION_BEHAVIORAL, 1, text, **kwargs)
+
+
+@pytest.fixture
+def bank(db_path, monkeypatch):
+    # In a bank this small every word would be specific to its report;
+    # the tests of that filter turn it back on
+    monkeypatch.setattr(question_bank, "QUESTION_BANK_GENERIC_SOURCES", 0)
+    return QuestionBank(path=db_path)
+
+
+@pytest.fixture
+def specific_terms(monkeypatch):
+    monkeypatch.setattr(question_bank, "QUESTION_BANK_GENERIC_SOURCES", 3)
+
+
+def test_near_duplicates_are_not_added(bank):
+    added = bank.add([
+        tech("How do you scale Kafka consumers?"),
+        tech("How do you scale Kafka consumers?"),
+        tech("How would you tune PostgreSQL queries?"),
+    ])
+    assert added == 2
+    assert bank.add([tech("How do you scale  kafka consumers ?")]) == 0
+    assert len(bank) == 2
+
+
+def test_questions_without_terms_are_skipped(bank):
+    assert bank.add([tech("How would you do it?")]) == 0
+
+
+def test_select_ranks_by_coverage_and_numbers_per_section(bank):
+    bank.add([
+        tech("How do you scale Kafka consumers in Python services?"),
+        tech("How would you tune PostgreSQL for heavy writes?"),
+        tech("How would you approach PostgreSQL tuning for Python services?"),
+        tech("Explain Kubernetes pod scheduling and taints."),
+        behav("Tell me about a hard decision while building Python services."),
+    ])
+    records = bank.select(JD, RESUME, n_tech=2, n_behav=1)
+
+    assert [(r.section, r.number) for r in records] == [
+        (SECTION_TECHNICAL, 1), (SECTION_TECHNICAL, 2), (SECTION_BEHAVIORAL, 1)
+    ]
+    assert [r.text for r in records] == [
+        "How do you scale Kafka consumers in Python services?",
+        "How would you approach PostgreSQL tuning for Python services?",
+        "Tell me about a hard decision while building Python services.",
+    ]
+
+
+def test_behavioral_questions_have_a_lower_floor(bank, tmp_path):
+    text = "Describe a time you handled a production incident under pressure while keeping stakeholders informed."
+    # Coverage ~0.1: between the behavioral and the technical floor
+    bank.add([behav(text)])
+    assert len(bank.select("Production support engineer.", "Ops", n_tech=0, n_behav=1)) == 1
+
+    technical = QuestionBank(path=tmp_path / "technical.db")
+    technical.add([tech(text)])
+    assert technical.select("Production support engineer.", "Ops", n_tech=1, n_behav=0) == []
+
+
+def test_difficulty_filter_applies_to_technical_questions(bank):
+    bank.add([
+        tech("How would you shard PostgreSQL for Kafka event storage?", difficulty="hard"),
+        tech("What is Redis caching used for in Python services?", difficulty="easy"),
+    ])
+    records = bank.select(JD, RESUME, n_tech=2, n_behav=0, difficulty="easy")
+    assert [r.difficulty for r in records] == ["easy"]
+    assert len(bank.select(JD, RESUME, n_tech=2, n_behav=0)) == 2
+
+
+def test_other_candidates_specifics_are_not_reused(bank, specific_terms):
+    bank.add([tech("How did you migrate Kafka consumers at Initech to PostgreSQL?")], source="report-1")
+    assert bank.select(JD, RESUME, n_tech=1, n_behav=0) == []
+    # Fine once the current documents mention its specific words
+    records = bank.select(JD + " Ex-Initech engineers who migrate systems welcome.", RESUME, n_tech=1, n_behav=0)
+    assert len(records) == 1
+
+
+def test_terms_used_by_many_reports_are_generic(bank, specific_terms):
+    # Only the follow-up's words are missing from the JD and resume
+    questions = [
+        tech("Kafka consumers in Python services?", follow_up="What limits throughput?"),
+        tech("PostgreSQL tuning?", follow_up="What limits throughput?"),
+        tech("Redis caching?", follow_up="What limits throughput?"),
+    ]
+    for i, question in enumerate(questions[:2]):
+        bank.add([question], source=f"report-{i}")
+    assert bank.select(JD, RESUME, n_tech=3, n_behav=0) == []
+
+    # A third report using them makes them generic
+    bank.add([questions[2]], source="report-2")
+    assert len(bank.select(JD, RESUME, n_tech=3, n_behav=0)) == 3
+
+
+def test_follow_ups_and_outlines_count_as_shown_words(bank, specific_terms):
+    bank.add([tech(
+        "How do you scale Kafka consumers in Python services?",
+        outline=["Mention the Globex migration"]
+    )])
+    assert bank.select(JD, RESUME, n_tech=1, n_behav=0) == []
+
+
+def test_rows_persist_and_usage_is_counted(bank, db_path):
+    bank.add([tech("How do you scale Kafka consumers in Python services?", outline=["Partitions"])])
+    bank.select(JD, RESUME, n_tech=1, n_behav=0)
+
+    reopened = QuestionBank(path=db_path)
+    records = reopened.select(JD, RESUME, n_tech=1, n_behav=0)
+    assert records[0].outline == ["Partitions"]
+    row = reopened._conn().execute("SELECT times_used FROM question_bank").fetchone()
+    assert row["times_used"] == 2
+
+
+def test_older_tables_get_the_source_column(db_path):
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            """
+            CREATE TABLE question_bank (
+                id INTEGER PRIMARY KEY, text TEXT NOT NULL, section TEXT, difficulty TEXT,
+                follow_up TEXT, outline TEXT, vector BLOB NOT NULL, created TEXT NOT NULL,
+                times_used INTEGER NOT NULL DEFAULT 0
+            )
+            """
+        )
+    bank = QuestionBank(path=db_path)
+    assert bank.add([tech("How do you scale Kafka consumers?")], source="r") == 1
+    columns = {row["name"] for row in bank._conn().execute("PRAGMA table_info(question_bank)")}
+    assert "source" in columns
+
+
+def test_format_report_parses_back():
+    records = [
+        QuestionRecord(SECTION_TECHNICAL, 1, "What is a WAL?", "easy", "Why fsync?", ["Durability"]),
+        QuestionRecord(SECTION_BEHAVIORAL, 1, "Tell me about a mistake."),
+    ]
+    assert parse_questions(format_report(records, include_answers=True)) == records
+    assert parse_questions(format_report(records))[0].outline == []
@@ -0,0 +1,138 @@
+import pytest
+
+from benchmarks.fake_ollama import sample_report
+from interview.question_parser import (
+    FormatBStreamParser,
+    parse_questions,
+    extract_first_question,
+    SECTION_TECHNICAL,
+    SECTION_BEHAVIORAL,
+)
+
+
+def _streamed(text, size):
+    parser = FormatBStreamParser()
+    records = []
+    for start in range(0, len(text), size):
+        records += parser.feed(text[start:start + size])
+    records += parser.close()
+    return records
+
+
+def test_parses_sections_fields_and_outlines():
+    records = parse_questions(sample_report(n_tech=3, n_behav=2, include_answers=True))
+
+    assert [(r.section, r.number) for r in records] == [
+        (SECTION_TECHNICAL, 1), (SECTION_TECHNICAL, 2), (SECTION_TECHNICAL, 3),
+        (SECTION_BEHAVIORAL, 1), (SECTION_BEHAVIORAL, 2),
+    ]
+    first = records[0]
+    assert first.text.startswith("How would you design component 1")
+    assert first.difficulty == "medium"
+    assert first.follow_up == "How would you handle back-pressure and retries?"
+    assert first.outline == [
+        "Partition the stream by key",
+        "Idempotent consumers",
+        "Dead-letter queue for poison messages",
+    ]
+    assert records[3].outline == []
+
+
+@pytest.mark.parametrize("size", [1, 7, 64])
+def test_chunked_feeding_matches_one_shot_parsing(size):
+    report = sample_report(n_tech=4, n_behav=2, include_answers=True)
+    assert _streamed(report, size) == parse_questions(report)
+
+
+def test_records_are_returned_as_soon_as_the_next_one_starts():
+    parser = FormatBStreamParser()
+    assert parser.feed("### Technical Questions\n1. First?\n") == []
+    completed = parser.feed("2. Second?\n")
+    assert [r.text for r in completed] == ["First?"]
+    assert [r.text for r in parser.close()] == ["Second?"]
+
+
+def test_fit_summary_items_are_not_questions():
+    report = "\n".join([
+        "### Candidate Fit Summary",
+        "1. Strong Python background",
+        "",
+        "### Technical Questions",
+        "1. What is a GIL?",
+    ])
+    assert [r.text for r in parse_questions(report)] == ["What is a GIL?"]
+
+
+def test_bold_headers_and_numbers():
+    report = "\n".join([
+        "**Technical Questions:**",
+        "**1.** Explain **idempotency**.",
+        "**Difficulty:** hard",
+        "**Behavioral Questions:**",
+        "1) Describe a conflict.",
+    ])
+    records = parse_questions(report)
+    assert [(r.section, r.text, r.difficulty) for r in records] == [
+        (SECTION_TECHNICAL, "Explain idempotency.", "hard"),
+        (SECTION_BEHAVIORAL, "Describe a conflict.", None),
+    ]
+
+
+@pytest.mark.parametrize("header", [
+    "Technical Questions:",
+    "TECHNICAL QUESTIONS",
+    "Technical Interview Questions (5):",
+])
+def test_plain_section_headers(header):
+    report = "\n".join([
+        header,
+        "1. What is sharding?",
+        "Behavioural Questions:",
+        "1. Tell me about a failure.",
+    ])
+    records = parse_questions(report)
+    assert [(r.section, r.text) for r in records] == [
+        (SECTION_TECHNICAL, "What is sharding?"),
+        (SECTION_BEHAVIORAL, "Tell me about a failure."),
+    ]
+
+
+def test_a_sentence_mentioning_technical_questions_is_not_a_header():
+    report = "\n".join([
+        "### Technical Questions",
+        "1. Which technical questions would you ask a junior engineer?",
+    ])
+    assert len(parse_questions(report)) == 1
+
+
+def test_numbered_items_without_any_question_section_are_questions():
+    report = "\n".join([
+        "### Interview Questions",
+        "1. What is a B-tree?",
+        "2. Why use a message queue?",
+    ])
+    records = parse_questions(report)
+    assert [(r.section, r.text) for r in records] == [
+        (None, "What is a B-tree?"),
+        (None, "Why use a message queue?"),
+    ]
+
+
+def test_other_sections_are_dropped_once_a_question_section_exists():
+    report = "\n".join([
+        "### Notes",
+        "1. Not a question",
+        "### Technical Questions",
+        "1. A question?",
+    ])
+    assert [r.text for r in parse_questions(report)] == ["A question?"]
+
+
+def test_wrapped_question_text_is_joined():
+    report = "### Technical Questions\n1. How would you design\na rate limiter?\n- Difficulty: easy\n"
+    assert parse_questions(report)[0].text == "How would you design a rate limiter?"
+
+
+def test_extract_first_question():
+    assert extract_first_question(sample_report()).startswith("How would you design component 1")
+    assert extract_first_question("no questions here") is None
@@ -0,0 +1,104 @@
+import pytest
+
+from benchmarks.fake_ollama import sample_report
+from llm import router
+from llm.ollama_client import OllamaError
+
+
+@pytest.fixture
+def routes(monkeypatch):
+    routes = {
+        router.TASK_GENERATION: {"models": ["primary", "backup"], "ttft_sec": 5, "total_sec": 10},
+        router.TASK_EVALUATION: {"models": ["primary", "backup"], "ttft_sec": 5, "total_sec": 10},
+    }
+    monkeypatch.setattr(router, "MODEL_ROUTES", routes)
+    return routes
+
+
+def test_candidates_put_an_explicit_model_first(routes):
+    assert router.candidates(router.TASK_GENERATION) == ["primary", "backup"]
+    assert router.candidates(router.TASK_GENERATION, "backup") == ["backup", "primary"]
+    assert router.candidates(router.TASK_GENERATION, "other") == ["other", "primary", "backup"]
+    assert router.primary_model(router.TASK_GENERATION) == "primary"
+
+
+def test_generate_uses_the_primary_model(routes, routed):
+    stats = {}
+    ok, text = router.generate(router.TASK_GENERATION, "prompt", stats=stats)
+    assert ok
+    assert text == sample_report().rstrip()
+    assert stats["model"] == "primary"
+    assert stats["fallbacks"] == []
+    assert stats["task"] == router.TASK_GENERATION
+
+
+def test_generate_falls_back_to_the_next_model(routes, routed, fake_ollama):
+    server, _ = fake_ollama
+    server.missing_models = {"primary"}
+
+    stats = {}
+    ok, text = router.generate(router.TASK_GENERATION, "prompt", stats=stats)
+    assert ok
+    assert stats["model"] == "backup"
+    assert [f["model"] for f in stats["fallbacks"]] == ["primary"]
+    assert "not found" in stats["fallbacks"][0]["error"]
+
+
+def test_generate_fails_when_every_model_fails(routes, routed, fake_ollama):
+    server, _ = fake_ollama
+    server.missing_models = {"primary", "backup"}
+
+    stats = {}
+    ok, text = router.generate(router.TASK_GENERATION, "prompt", stats=stats)
+    assert not ok
+    assert "not found" in text
+    assert len(stats["fallbacks"]) == 2
+
+
+def test_stream_falls_back_and_announces_it(routes, routed, fake_ollama):
+    server, _ = fake_ollama
+    server.missing_models = {"primary"}
+    announced = []
+
+    stats = {}
+    text = "".join(router.stream(
+        router.TASK_GENERATION,
+        "prompt",
+        stats=stats,
+        on_fallback=lambda failed, nxt, error: announced.append((failed, nxt))
+    ))
+    assert text == sample_report().rstrip()
+    assert announced == [("primary", "backup")]
+    assert stats["model"] == "backup"
+
+
+def test_stream_applies_the_routes_first_token_timeout(routes, routed, fake_ollama):
+    server, _ = fake_ollama
+    server.latency = 1.0
+    routes[router.TASK_GENERATION].update({"models": ["primary"], "ttft_sec": 0.2})
+
+    stats = {}
+    with pytest.raises(OllamaError, match="no tokens within"):
+        list(router.stream(router.TASK_GENERATION, "prompt", stats=stats))
+    assert stats["fallbacks"][0]["model"] == "primary"
+
+
+def test_generate_ignores_the_first_token_timeout(routes, routed, fake_ollama):
+    server, _ = fake_ollama
+    server.latency = 0.4
+    routes[router.TASK_EVALUATION]["ttft_sec"] = 0.1
+
+    # A non-streaming call shows nothing before the end; only total_sec applies
+    ok, _ = router.generate(router.TASK_EVALUATION, "Answer:\nA")
+    assert ok
+
+
+def test_callers_can_extend_the_total_deadline(routes, routed, fake_ollama):
+    server, _ = fake_ollama
+    server.latency = 0.4
+    routes[router.TASK_EVALUATION].update({"models": ["primary"], "total_sec": 0.2})
+
+    ok, text = router.generate(router.TASK_EVALUATION, "Answer:\nA")
+    assert not ok and "deadline" in text
+    ok, _ = router.generate(router.TASK_EVALUATION, "Answer:\nA", deadline=2)
+    assert ok
@@ -0,0 +1,124 @@
+import threading
+import time
+
+import pytest
+
+from llm.scheduler import LLMScheduler, PRIORITY_EVALUATION, PRIORITY_GENERATION, PRIORITY_BATCH
+
+
+def _wait_until(predicate, timeout=2.0):
+    deadline = time.perf_counter() + timeout
+    while not predicate():
+        assert time.perf_counter() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+def test_waiters_are_admitted_by_priority_then_arrival():
+    scheduler = LLMScheduler(max_in_flight=1)
+    order = []
+    scheduler.acquire()
+
+    def worker(name, priority):
+        with scheduler.slot(priority):
+            order.append(name)
+
+    threads = []
+    for name, priority in (
+        ("batch", PRIORITY_BATCH),
+        ("generation-1", PRIORITY_GENERATION),
+        ("evaluation", PRIORITY_EVALUATION),
+        ("generation-2", PRIORITY_GENERATION),
+    ):
+        t = threading.Thread(target=worker, args=(name, priority))
+        t.start()
+        threads.append(t)
+        # Arrival order must be deterministic
+        _wait_until(lambda: scheduler.status()["queued"] == len(threads))
+
+    scheduler.release()
+    for t in threads:
+        t.join()
+
+    assert order == ["evaluation", "generation-1", "generation-2", "batch"]
+    assert scheduler.status()["max_queue"] == 4
+
+
+def test_in_flight_limit_is_respected():
+    scheduler = LLMScheduler(max_in_flight=2)
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def worker():
+        with scheduler.slot():
+            with lock:
+                active.append(1)
+                peak.append(len(active))
+            time.sleep(0.02)
+            with lock:
+                active.pop()
+
+    threads = [threading.Thread(target=worker) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert max(peak) == 2
+    assert scheduler.status()["active"] == 0
+    assert scheduler.metrics["admitted"] == 6
+
+
+def test_on_position_reports_queue_position_then_zero():
+    scheduler = LLMScheduler(max_in_flight=1)
+    positions = []
+    scheduler.acquire()
+
+    t = threading.Thread(target=scheduler.acquire, kwargs={"on_position": positions.append})
+    t.start()
+    _wait_until(lambda: positions)
+    scheduler.release()
+    t.join()
+
+    assert positions[0] == 1
+    assert positions[-1] == 0
+
+
+def test_coalesce_shares_one_result():
+    scheduler = LLMScheduler()
+    calls = []
+    started = threading.Event()
+    release = threading.Event()
+    results = []
+
+    def fn():
+        calls.append(1)
+        started.set()
+        release.wait(2)
+        return "result"
+
+    owner = threading.Thread(target=lambda: results.append(scheduler.coalesce("key", fn)))
+    owner.start()
+    started.wait(2)
+    followers = [threading.Thread(target=lambda: results.append(scheduler.coalesce("key", fn))) for _ in range(2)]
+    for t in followers:
+        t.start()
+    _wait_until(lambda: scheduler.metrics["coalesced"] == 2)
+    release.set()
+    for t in [owner, *followers]:
+        t.join()
+
+    assert results == ["result"] * 3
+    assert len(calls) == 1
+
+
+def test_coalesce_shares_exceptions_and_forgets_finished_keys():
+    scheduler = LLMScheduler()
+
+    def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        scheduler.coalesce("key", fail)
+    # Finished calls are not cached
+    assert scheduler.coalesce("key", lambda: 42) == 42
@@ -0,0 +1,58 @@
+import json
+
+import pytest
+
+from utils.session_db import save_session, load_session, query_sessions, import_json_sessions
+
+
+def test_round_trip(conn, make_session):
+    session = make_session()
+    save_session(session, conn=conn)
+    assert load_session("s1", conn=conn) == session
+
+
+def test_missing_session_is_none(conn):
+    assert load_session("nope", conn=conn) is None
+
+
+def test_saving_again_replaces_the_session(conn, make_session):
+    save_session(make_session(scores=(1, 2, 3)), conn=conn)
+    session = make_session(scores=(9,))
+    save_session(session, conn=conn)
+
+    assert load_session("s1", conn=conn) == session
+    assert conn.execute("SELECT COUNT(*) FROM questions").fetchone()[0] == 1
+    assert conn.execute("SELECT COUNT(*) FROM evaluations").fetchone()[0] == 1
+
+
+def test_failed_evaluations_keep_their_record_without_scores(conn, make_session):
+    session = make_session(scores=(7,))
+    session["questions"][0]["evaluation"] = {"status": "failed", "error": "timeout", "clarity": 0}
+    save_session(session, conn=conn)
+
+    row = conn.execute("SELECT clarity, raw FROM evaluations").fetchone()
+    assert row["clarity"] is None
+    assert json.loads(row["raw"])["error"] == "timeout"
+    assert load_session("s1", conn=conn)["questions"][0]["evaluation"]["status"] == "failed"
+
+
+def test_query_filters_and_orders(conn, make_session):
+    save_session(make_session("a", role="SRE", date="2026-01-05", scores=(4,)), conn=conn)
+    save_session(make_session("b", role="SRE", date="2026-02-05", scores=(8,)), conn=conn)
+    save_session(make_session("c", role="Data", date="2026-03-05", scores=(6,)), conn=conn)
+
+    assert [s["session_id"] for s in query_sessions(conn=conn)] == ["c", "b", "a"]
+    assert [s["session_id"] for s in query_sessions(role="SRE", conn=conn)] == ["b", "a"]
+    assert [s["session_id"] for s in query_sessions(since="2026-02-01", conn=conn)] == ["c", "b"]
+    assert [s["session_id"] for s in query_sessions(min_score=5, order_by="overall_score", conn=conn)] == ["b", "c"]
+    with pytest.raises(ValueError):
+        query_sessions(order_by="session_id; DROP TABLE sessions", conn=conn)
+
+
+def test_import_json_sessions(conn, tmp_path, make_session):
+    (tmp_path / "session_a.json").write_text(json.dumps(make_session("a")))
+    (tmp_path / "session_broken.json").write_text("{")
+    (tmp_path / "session_noid.json").write_text("{}")
+
+    assert import_json_sessions(tmp_path, conn=conn) == 1
+    assert load_session("a", conn=conn)["role"] == "Backend Engineer"
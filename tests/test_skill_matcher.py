@@ -0,0 +1,68 @@
+import pytest
+
+from interview.skill_matcher import AhoCorasick, extract_skills, fit_summary, format_fit_summary
+
+
+def test_aho_corasick_finds_overlapping_patterns():
+    matcher = AhoCorasick([("he", 1), ("she", 2), ("his", 3), ("hers", 4)])
+    assert sorted(matcher.iter_matches("ushers")) == [(1, 4, 2), (2, 4, 1), (2, 6, 4)]
+
+
+def test_aho_corasick_follows_failure_links():
+    matcher = AhoCorasick([("abcd", "long"), ("bc", "short")])
+    assert list(matcher.iter_matches("abce")) == [(1, 3, "short")]
+    assert list(matcher.iter_matches("zzz")) == []
+
+
+def test_extracts_canonical_skills_and_counts_mentions():
+    text = "Python and Postgres; we run postgresql on Kubernetes (k8s). PYTHON 3!"
+    assert extract_skills(text) == {"Python": 2, "PostgreSQL": 2, "Kubernetes": 2}
+
+
+def test_matches_whole_words_only():
+    assert extract_skills("javascript developer") == {"JavaScript": 1}
+    assert "Java" not in extract_skills("javascript")
+    assert extract_skills("good golang") == {"Go": 1}
+    assert extract_skills("ci/cd and c++ and c#") == {"CI/CD": 1, "C++": 1, "C#": 1}
+
+
+def test_multi_word_aliases_span_line_breaks():
+    assert extract_skills("machine\n   learning") == {"Machine Learning": 1}
+
+
+@pytest.mark.parametrize("text", [
+    "We react quickly to incidents and spark new ideas.",
+    "Our swift onboarding puts you on the rails from day one.",
+    "Strong communication, agile mindset, security clearance and monitoring of latency.",
+    "You will go above and beyond.",
+])
+def test_everyday_english_is_not_a_skill(text):
+    assert extract_skills(text) == {}
+
+
+@pytest.mark.parametrize("text, skill", [
+    ("Built apps with React Native", "React"),
+    ("Ruby on Rails backend", "Rails"),
+    ("PySpark jobs on EMR", "Spark"),
+    ("iOS apps in SwiftUI", "Swift"),
+    ("Daily Scrum ceremonies", "Agile"),
+])
+def test_unambiguous_forms_still_match(text, skill):
+    assert skill in extract_skills(text)
+
+
+def test_fit_summary():
+    jd = "Python, Python, Kafka and Kubernetes. AWS a plus."
+    resume = "Python services on AWS with Redis."
+    summary = fit_summary(jd, resume)
+
+    assert summary["matched"] == ["Python", "AWS"]
+    assert summary["missing"] == ["Kafka", "Kubernetes"]
+    assert summary["extra"] == ["Redis"]
+    assert summary["coverage_pct"] == 50.0
+
+
+def test_fit_summary_without_jd_skills():
+    summary = fit_summary("", "Python")
+    assert summary["coverage_pct"] == 0.0
+    assert "**JD skill coverage:** 0.0%" in format_fit_summary(summary)
@@ -0,0 +1,16 @@
+import pytest
+
+from tts.speaker import TTSBackend, EspeakBackend, SayBackend
+
+
+def test_backends_must_implement_the_interface():
+    class Partial(TTSBackend):
+        def available(self):
+            return True
+
+    with pytest.raises(TypeError):
+        TTSBackend()
+    with pytest.raises(TypeError):
+        Partial()
+    assert isinstance(SayBackend(), TTSBackend)
+    assert isinstance(EspeakBackend(), TTSBackend)
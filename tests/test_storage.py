@@ -0,0 +1,164 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from utils import storage
+from utils.evaluator import Evaluation, STATUS_FAILED, STATUS_OK
+
+
+@pytest.fixture
+def evaluations(monkeypatch):
+    """
+    Stub evaluator recording the size of every call (calls) and the saved
+    sessions (saved). Batch-scored answers score their index. Calls wait
+    while gate is cleared.
+    """
+    calls = []
+    lock = threading.Lock()
+    gate = threading.Event()
+    gate.set()
+
+    def evaluate_answer(question, answer, model=None):
+        gate.wait(5)
+        with lock:
+            calls.append(1)
+        return Evaluation(clarity=5, confidence=5, technical_depth=5, model="m").to_dict()
+
+    def evaluate_answers_batch(items, model=None):
+        gate.wait(5)
+        with lock:
+            calls.append(len(items))
+        return {idx: Evaluation(clarity=idx, confidence=idx, technical_depth=idx, model="m").to_dict()
+                for idx, _, _ in items}
+
+    saved = []
+    monkeypatch.setattr(storage, "evaluate_answer", evaluate_answer)
+    monkeypatch.setattr(storage, "evaluate_answers_batch", evaluate_answers_batch)
+    monkeypatch.setattr(storage, "batch_fits", lambda items: True)
+    monkeypatch.setattr(storage, "save_session", saved.append)
+    monkeypatch.setattr(storage, "update_rollups", lambda session: None)
+    monkeypatch.setattr(storage, "SESSION_JSON_EXPORT", False)
+    monkeypatch.setattr(storage, "EVAL_IN_BACKGROUND", True)
+    monkeypatch.setattr(storage, "EVAL_BATCH_SIZE", 5)
+    yield SimpleNamespace(calls=calls, saved=saved, gate=gate)
+    gate.set()
+
+
+@pytest.fixture
+def session():
+    session = storage.create_new_session("Backend Engineer", candidate="Ada")
+    yield session
+    storage.discard_session(session)
+
+
+def _answer(session, n):
+    for i in range(n):
+        storage.add_answer(session, f"Q{i}?", f"Answer {i}", duration_sec=10 + i)
+
+
+def _in_flight(session):
+    with storage._PENDING_LOCK:
+        return dict(storage._PENDING.get(session["session_id"], {}))
+
+
+def _wait_until(predicate, timeout=5.0):
+    deadline = time.perf_counter() + timeout
+    while not predicate():
+        assert time.perf_counter() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+def test_answers_are_evaluated_as_soon_as_they_are_saved(evaluations, session):
+    _answer(session, 2)
+    assert 0 in _in_flight(session)
+    # Without waiting for more answers or for finalize
+    _wait_until(lambda: sum(evaluations.calls) == 2)
+
+
+def test_answers_saved_while_evaluating_are_batched(evaluations, session):
+    evaluations.gate.clear()
+    _answer(session, 7)
+    pending = _in_flight(session)
+    assert sorted(pending) == [0, 1, 2, 3, 4, 5]
+    assert pending[0] is not pending[1]
+    assert len({pending[i] for i in range(1, 6)}) == 1
+
+    # Answer 6 goes out once the calls ahead of it finish
+    evaluations.gate.set()
+    _wait_until(lambda: sum(evaluations.calls) == 7)
+    assert sorted(evaluations.calls) == [1, 1, 5]
+
+    storage.finalize_session(session)
+    assert len(evaluations.calls) == 3
+    assert [q["evaluation"]["clarity"] for q in session["questions"]] == [5, 1, 2, 3, 4, 5, 5]
+
+
+def test_batch_size_one_scores_each_answer(evaluations, session, monkeypatch):
+    monkeypatch.setattr(storage, "EVAL_BATCH_SIZE", 1)
+    _answer(session, 3)
+    assert sorted(_in_flight(session)) == [0, 1, 2]
+
+    storage.finalize_session(session)
+    assert evaluations.calls == [1, 1, 1]
+
+
+def test_batches_that_do_not_fit_become_single_calls(evaluations, session, monkeypatch):
+    monkeypatch.setattr(storage, "EVAL_IN_BACKGROUND", False)
+    monkeypatch.setattr(storage, "batch_fits", lambda items: False)
+    _answer(session, 3)
+    assert _in_flight(session) == {}
+
+    storage.finalize_session(session)
+    assert evaluations.calls == [1, 1, 1]
+
+
+def test_finalize_aggregates_and_reports_progress(evaluations, session):
+    _answer(session, 2)
+    seen = []
+    storage.finalize_session(session, on_result=lambda idx, q: seen.append(idx))
+
+    assert sorted(seen) == [0, 1]
+    assert session["meta"]["total_questions"] == 2
+    assert session["meta"]["avg_answer_duration"] == 10.5
+    assert session["meta"]["models"]["evaluation"] == {"m": 2}
+    assert session["aggregated_feedback"]["avg_clarity"] == 5.0
+    assert evaluations.saved == [session]
+
+
+def test_refinalizing_only_rescores_failed_answers(evaluations, session, monkeypatch):
+    monkeypatch.setattr(storage, "EVAL_IN_BACKGROUND", False)
+    _answer(session, 3)
+    storage.finalize_session(session)
+    session["questions"][1]["evaluation"] = Evaluation(status=STATUS_FAILED, error="x").to_dict()
+    evaluations.calls.clear()
+
+    storage.finalize_session(session)
+    assert evaluations.calls == [1]
+    assert all(q["evaluation"]["status"] == STATUS_OK for q in session["questions"])
+
+
+def test_unexpected_errors_mark_the_chunk_failed(monkeypatch):
+    def boom(items, model=None):
+        raise RuntimeError("evaluator crashed")
+
+    monkeypatch.setattr(storage, "evaluate_answers_batch", boom)
+    results = storage._evaluate_items([(0, "Q?", "A"), (1, "Q?", "B")])
+    assert {idx: ev["status"] for idx, ev in results.items()} == {0: STATUS_FAILED, 1: STATUS_FAILED}
+    assert results[0]["error"] == "evaluator crashed"
+
+
+def test_discard_drops_queued_answers(evaluations, session):
+    evaluations.gate.clear()
+    _answer(session, 2)
+    running = _in_flight(session)[0]
+    _wait_until(running.running)
+    storage.discard_session(session)
+    with storage._PENDING_LOCK:
+        assert session["session_id"] not in storage._QUEUED
+        assert session["session_id"] not in storage._PENDING
+
+    evaluations.gate.set()
+    running.result(timeout=5)
+    assert evaluations.calls == [1]
@@ -0,0 +1,60 @@
+import json
+import threading
+
+import pytest
+
+from utils.tracing import Tracer, maybe_span, llm_span_attrs
+
+
+def test_span_records_duration_and_attributes():
+    tracer = Tracer()
+    with tracer.span("generate", model="llama3") as span:
+        span["questions"] = 7
+
+    [record] = tracer.to_list()
+    assert record["name"] == "generate"
+    assert record["model"] == "llama3"
+    assert record["questions"] == 7
+    assert record["duration_ms"] >= 0
+
+
+def test_span_is_recorded_when_the_block_raises():
+    tracer = Tracer()
+    with pytest.raises(ValueError):
+        with tracer.span("evaluate"):
+            raise ValueError("boom")
+    assert [s["name"] for s in tracer.to_list()] == ["evaluate"]
+
+
+def test_add_from_threads_and_export():
+    tracer = Tracer()
+    threads = [threading.Thread(target=tracer.add, args=("speak", 12.345), kwargs={"chars": i}) for i in range(20)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    lines = tracer.to_jsonl().splitlines()
+    assert len(lines) == 20
+    assert json.loads(lines[0])["duration_ms"] == 12.35
+    assert sorted(json.loads(line)["chars"] for line in lines) == list(range(20))
+
+
+def test_maybe_span_without_tracer():
+    with maybe_span(None, "evaluate", questions=[0]) as span:
+        span["failed"] = 0
+    assert span == {"questions": [0], "failed": 0}
+
+
+def test_llm_span_attrs_derives_throughput():
+    attrs = llm_span_attrs({
+        "eval_count": 100,
+        "eval_duration": 2_000_000_000,
+        "prompt_eval_count": 500,
+        "prompt_eval_duration": 250_000_000,
+        "model": "llama3",
+    })
+    assert attrs["tokens_per_sec"] == 50.0
+    assert attrs["prompt_tokens_per_sec"] == 2000.0
+    assert attrs["model"] == "llama3"
+    assert "tokens_per_sec" not in llm_span_attrs({"eval_count": 0})
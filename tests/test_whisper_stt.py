@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+# Needs the audio stack; the model itself is replaced below
+pytest.importorskip("sounddevice")
+pytest.importorskip("scipy")
+
+from stt import whisper_stt  # noqa: E402
+
+
+class _Model:
+    def __init__(self):
+        self.audio = None
+
+    def transcribe(self, audio):
+        self.audio = audio
+
+        class Segment:
+            text = " hello "
+
+        class Info:
+            duration = 1.0
+
+        return [Segment()], Info()
+
+
+@pytest.fixture
+def model(monkeypatch):
+    model = _Model()
+    monkeypatch.setattr(whisper_stt, "get_model", lambda: model)
+    return model
+
+
+@pytest.mark.parametrize("dtype, samples, expected", [
+    (np.int16, [-32768, 0, 16384], [-1.0, 0.0, 0.5]),
+    (np.uint8, [0, 128, 192], [-1.0, 0.0, 0.5]),
+    (np.int32, [-2 ** 31, 0, 2 ** 30], [-1.0, 0.0, 0.5]),
+])
+def test_integer_pcm_is_scaled_to_unit_range(model, dtype, samples, expected):
+    whisper_stt.transcribe(np.array(samples, dtype=dtype))
+    assert model.audio.dtype == np.float32
+    assert np.allclose(model.audio, expected)
+
+
+def test_float_audio_is_passed_through(model):
+    audio = np.array([0.25, -0.5], dtype=np.float32)
+    whisper_stt.transcribe(audio)
+    assert model.audio is audio
+
+    whisper_stt.transcribe(np.array([0.25, -0.5], dtype=np.float64))
+    assert model.audio.dtype == np.float32
+    assert np.allclose(model.audio, [0.25, -0.5])
+
+
+def test_stats(model):
+    stats = {}
+    assert whisper_stt.transcribe(np.zeros(whisper_stt.SAMPLE_RATE * 2, dtype=np.float32), stats=stats) == "hello"
+    assert stats["audio_sec"] == 2.0
+    assert stats["rtf"] is not None
@@ -1,7 +1,183 @@
+import abc
+import queue
+import shutil
 import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 
-def speak_text(text: str):
+from config import CACHE_DIR, TTS_BACKEND, TTS_VOICE, TTS_CACHE_MAX_MB, TTS_CACHE_MAX_AGE_DAYS
+from utils.disk_cache import DiskCache, make_key
+
+
+class TTSBackend(abc.ABC):
+    """
+    A text-to-speech engine that renders text into an audio file.
+    """
+    name = "base"
+    extension = ".wav"
+
+    @abc.abstractmethod
+    def available(self) -> bool:
+        ...
+
+    @abc.abstractmethod
+    def synthesize(self, text: str, voice, out_path: Path):
+        ...
+
+
+class SayBackend(TTSBackend):
+    """macOS `say`."""
+    name = "say"
+    extension = ".aiff"
+
+    def available(self) -> bool:
+        return shutil.which("say") is not None
+
+    def synthesize(self, text, voice, out_path):
+        cmd = ["say", "-o", str(out_path)]
+        if voice:
+            cmd += ["-v", voice]
+        subprocess.run(cmd + [text], check=True, capture_output=True)
+
+
+class EspeakBackend(TTSBackend):
+    """eSpeak NG (offline, available on most Linux distros)."""
+    name = "espeak-ng"
+    extension = ".wav"
+
+    def _binary(self):
+        return shutil.which("espeak-ng") or shutil.which("espeak")
+
+    def available(self) -> bool:
+        return self._binary() is not None
+
+    def synthesize(self, text, voice, out_path):
+        cmd = [self._binary(), "-w", str(out_path)]
+        if voice:
+            cmd += ["-v", voice]
+        subprocess.run(cmd + [text], check=True, capture_output=True)
+
+
+BACKENDS = {backend.name: backend for backend in (SayBackend, EspeakBackend)}
+
+
+def _select_backend():
+    if TTS_BACKEND != "auto":
+        backend = BACKENDS[TTS_BACKEND]()
+        return backend if backend.available() else None
+    for backend_cls in BACKENDS.values():
+        backend = backend_cls()
+        if backend.available():
+            return backend
+    return None
+
+
+def _player_command(path: Path):
+    if sys.platform == "darwin":
+        return ["afplay", str(path)]
+    for player, args in (("paplay", []), ("aplay", ["-q"]), ("ffplay", ["-nodisp", "-autoexit", "-loglevel", "quiet"])):
+        if shutil.which(player):
+            return [player, *args, str(path)]
+    return None
+
+
+_backend = _select_backend()
+_cache = DiskCache(
+    f"{CACHE_DIR}/tts",
+    max_bytes=TTS_CACHE_MAX_MB * 1024 * 1024,
+    max_age_sec=TTS_CACHE_MAX_AGE_DAYS * 86400,
+    suffix=_backend.extension if _backend else ".wav"
+)
+
+# Synthesis runs ahead of playback (prefetch); one in-flight future per key
+_synth_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="tts-synth")
+_in_flight = {}
+_in_flight_lock = threading.Lock()
+
+# Playback is serialized on one thread so utterances never overlap
+_playback = queue.Queue()
+
+
+def _cache_key(text: str) -> str:
+    return make_key(_backend.name, TTS_VOICE, text.strip())
+
+
+def _synthesize(text: str, key: str):
+    path = _cache.get_path(key)
+    if path is not None:
+        return path
+
+    with tempfile.TemporaryDirectory() as tmp:
+        out = Path(tmp) / f"speech{_backend.extension}"
+        _backend.synthesize(text, TTS_VOICE, out)
+        _cache.put(key, out.read_bytes())
+    return _cache.path(key)
+
+
+def prefetch(text: str):
+    """
+    Starts synthesizing text in the background (no-op if cached or queued).
+    Returns a future resolving to the audio path, or None without a backend.
+    """
+    if _backend is None or not text:
+        return None
+
+    key = _cache_key(text)
+    with _in_flight_lock:
+        future = _in_flight.get(key)
+        if future is not None:
+            return future
+        future = _synth_pool.submit(_synthesize, text, key)
+        _in_flight[key] = future
+
+    # Outside the lock: the callback runs inline if the future is already done
+    future.add_done_callback(lambda f: _forget(key, f))
+    return future
+
+
+def _forget(key, future):
+    with _in_flight_lock:
+        if _in_flight.get(key) is future:
+            del _in_flight[key]
+
+
+def _playback_loop():
+    while True:
+        future, tracer, chars = _playback.get()
+        try:
+            waited = time.perf_counter()
+            path = future.result()
+            started = time.perf_counter()
+            cmd = _player_command(path)
+            if cmd:
+                subprocess.run(cmd, capture_output=True)
+            if tracer is not None:
+                tracer.add(
+                    "speak",
+                    (time.perf_counter() - started) * 1000,
+                    synth_wait_ms=round((started - waited) * 1000, 2),
+                    chars=chars,
+                    backend=_backend.name
+                )
+        except Exception:
+            pass
+
+
+threading.Thread(target=_playback_loop, daemon=True, name="tts-playback").start()
+
+
+def speak_text(text: str, tracer=None):
+    """
+    Queues text for playback and returns immediately.
+    A "speak" span is recorded into tracer once playback finishes.
+    """
     try:
-        subprocess.run(["say", text])
+        future = prefetch(text)
+        if future is not None:
+            _playback.put((future, tracer, len(text)))
     except Exception:
         pass
@@ -7,11 +7,16 @@ def aggregate_feedback(questions):
     technical_scores = []
     strengths = []
     improvements = []
+    failed = 0
 
     for q in questions:
         eval_data = q.get("evaluation", {})
         if not eval_data:
             continue
+        # Answers the evaluator couldn't score don't count as zeros
+        if eval_data.get("status", "ok") != "ok":
+            failed += 1
+            continue
 
         clarity_scores.append(eval_data.get("clarity", 0))
         confidence_scores.append(eval_data.get("confidence", 0))
@@ -42,7 +47,8 @@ def aggregate_feedback(questions):
         "overall_score": overall_score,
         "summary": summary,
         "strengths": list(set(filter(None, strengths))),
-        "improvements": list(set(filter(None, improvements)))
+        "improvements": list(set(filter(None, improvements))),
+        "failed_evaluations": failed
     }
 
 
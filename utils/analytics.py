@@ -0,0 +1,304 @@
+import json
+import threading
+from datetime import datetime
+
+import numpy as np
+
+from utils.session_db import connect, load_session
+
+METRICS = ("clarity", "confidence", "technical_depth")
+SESSION_COLUMNS = ("avg_clarity", "avg_confidence", "avg_technical_depth", "overall_score")
+
+# Per-question scores are integers 0..10 -> 11 histogram bins
+N_BINS = 11
+# Session-level averages (0..10) are binned at 0.1 -> 101 bins
+SESSION_BINS = 101
+
+ROLLUP_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rollups (
+    scope   TEXT NOT NULL,
+    key     TEXT NOT NULL,
+    metric  TEXT NOT NULL,
+    count   INTEGER NOT NULL,
+    total   REAL NOT NULL,
+    total_sq REAL NOT NULL,
+    hist    TEXT NOT NULL,
+    updated TEXT NOT NULL,
+    PRIMARY KEY (scope, key, metric)
+);
+
+CREATE TABLE IF NOT EXISTS rollup_sessions (
+    session_id   TEXT PRIMARY KEY,
+    contribution TEXT
+);
+"""
+
+# Columns added after the tables first shipped: (table, column, type)
+ROLLUP_MIGRATIONS = [
+    ("rollup_sessions", "contribution", "TEXT"),
+]
+
+_ready = set()
+_ready_lock = threading.Lock()
+
+
+def _conn(conn=None):
+    conn = conn or connect()
+    path = conn.execute("PRAGMA database_list").fetchone()["file"]
+    if path not in _ready:
+        with _ready_lock:
+            if path not in _ready:
+                conn.executescript(ROLLUP_SCHEMA)
+                for table, column, col_type in ROLLUP_MIGRATIONS:
+                    existing = {row["name"] for row in conn.execute(f"PRAGMA table_info({table})")}
+                    if column not in existing:
+                        conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {col_type}")
+                conn.commit()
+                _ready.add(path)
+    return conn
+
+
+def _scopes(session):
+    """
+    The rollup buckets a session contributes to.
+    """
+    month = (session.get("date") or "")[:7]
+    scopes = [("all", "")]
+    if session.get("role"):
+        scopes += [("role", session["role"]), ("role_month", f"{session['role']}|{month}")]
+    if session.get("candidate"):
+        scopes += [("candidate", session["candidate"])]
+    return scopes
+
+
+def score_matrix(questions) -> np.ndarray:
+    """
+    (n_evaluated_questions, len(METRICS)) float array of per-question scores.
+    """
+    rows = [
+        [q["evaluation"].get(m, 0) for m in METRICS]
+        for q in questions
+        if q.get("evaluation") and q["evaluation"].get("status", "ok") == "ok"
+    ]
+    return np.asarray(rows, dtype=float).reshape(-1, len(METRICS))
+
+
+def _session_bin(value: float) -> int:
+    return int(np.clip(np.rint(value * 10), 0, SESSION_BINS - 1))
+
+
+def _contribution(session) -> dict:
+    """
+    What one session adds to each of its scopes: {"scopes": [[scope, key]],
+    "metrics": {metric: {count, total, total_sq, hist}}}. Per-question
+    metrics (METRICS) use 0..10 histograms; session-level ones
+    (SESSION_COLUMNS) use SESSION_BINS.
+    """
+    metrics = {}
+    scores = score_matrix(session.get("questions", []))
+    if len(scores):
+        bins = np.clip(np.rint(scores), 0, N_BINS - 1).astype(int)
+        # One histogram row per metric, in one vectorised pass
+        offsets = bins + np.arange(len(METRICS)) * N_BINS
+        hists = np.bincount(offsets.ravel(), minlength=N_BINS * len(METRICS)).reshape(len(METRICS), N_BINS)
+        totals = scores.sum(axis=0)
+        totals_sq = (scores * scores).sum(axis=0)
+        for i, metric in enumerate(METRICS):
+            metrics[metric] = {
+                "count": len(scores),
+                "total": float(totals[i]),
+                "total_sq": float(totals_sq[i]),
+                "hist": hists[i].tolist(),
+            }
+
+    feedback = session.get("aggregated_feedback") or {}
+    for column in SESSION_COLUMNS:
+        value = feedback.get(column)
+        if value is None:
+            continue
+        hist = [0] * SESSION_BINS
+        hist[_session_bin(value)] = 1
+        metrics[column] = {"count": 1, "total": float(value), "total_sq": float(value) ** 2, "hist": hist}
+
+    return {"scopes": [list(scope) for scope in _scopes(session)], "metrics": metrics}
+
+
+def _apply(conn, contribution: dict, sign: int, now: str):
+    for scope, key in contribution["scopes"]:
+        for metric, part in contribution["metrics"].items():
+            row = conn.execute(
+                "SELECT count, total, total_sq, hist FROM rollups WHERE scope = ? AND key = ? AND metric = ?",
+                (scope, key, metric)
+            ).fetchone()
+            hist = sign * np.asarray(part["hist"])
+            count, total, total_sq = sign * part["count"], sign * part["total"], sign * part["total_sq"]
+            if row is not None:
+                hist = hist + np.asarray(json.loads(row["hist"]))
+                count += row["count"]
+                total += row["total"]
+                total_sq += row["total_sq"]
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO rollups (scope, key, metric, count, total, total_sq, hist, updated)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (scope, key, metric, count, total, total_sq, json.dumps(hist.tolist()), now)
+            )
+
+
+def update_rollups(session, conn=None):
+    """
+    Folds one finalized session into the running aggregates (counts, sums,
+    sums of squares and histograms per metric) for every scope it belongs
+    to. What each session added is kept, so a re-finalized session
+    replaces its earlier contribution instead of being counted twice.
+    """
+    conn = _conn(conn)
+    contribution = _contribution(session)
+    now = datetime.now().isoformat()
+
+    with conn:
+        # sqlite3 only opens the transaction at the first write; take the
+        # write lock before reading, or concurrent finalizes overwrite each
+        # other's counts
+        conn.execute("BEGIN IMMEDIATE")
+        row = conn.execute(
+            "SELECT contribution FROM rollup_sessions WHERE session_id = ?",
+            (session["session_id"],)
+        ).fetchone()
+        if row is not None and row["contribution"] is None:
+            # Folded in before contributions were stored: can't subtract it
+            legacy = True
+        else:
+            legacy = False
+            if row is not None:
+                _apply(conn, json.loads(row["contribution"]), -1, now)
+            _apply(conn, contribution, 1, now)
+            conn.execute(
+                "INSERT OR REPLACE INTO rollup_sessions (session_id, contribution) VALUES (?, ?)",
+                (session["session_id"], json.dumps(contribution))
+            )
+
+    if legacy:
+        rebuild_rollups(conn)
+
+
+def rebuild_rollups(conn=None) -> int:
+    """
+    Recomputes every rollup from the stored sessions. Returns the number
+    of sessions folded in.
+    """
+    conn = _conn(conn)
+    with conn:
+        conn.execute("DELETE FROM rollups")
+        conn.execute("DELETE FROM rollup_sessions")
+    ids = [row["session_id"] for row in conn.execute("SELECT session_id FROM sessions")]
+    for session_id in ids:
+        update_rollups(load_session(session_id, conn=conn), conn=conn)
+    return len(ids)
+
+
+def read_rollup(scope="all", key="", conn=None):
+    """
+    Precomputed summary for one scope: {metric: {count, mean, std, hist}}.
+    """
+    conn = _conn(conn)
+    summary = {}
+    for row in conn.execute(
+        "SELECT metric, count, total, total_sq, hist FROM rollups WHERE scope = ? AND key = ?",
+        (scope, key)
+    ):
+        n = row["count"]
+        mean = row["total"] / n if n else 0.0
+        var = max(row["total_sq"] / n - mean * mean, 0.0) if n else 0.0
+        summary[row["metric"]] = {
+            "count": n,
+            "mean": round(mean, 2),
+            "std": round(var ** 0.5, 2),
+            "hist": json.loads(row["hist"]),
+        }
+    return summary
+
+
+def load_columns(role=None, candidate=None, since=None, until=None, conn=None):
+    """
+    Session-level scores as columnar NumPy arrays:
+    {"date": datetime64[s], "avg_clarity": float, ..., "overall_score": float}.
+    """
+    clauses, params = [], []
+    for column, value, op in (
+        ("role", role, "="),
+        ("candidate", candidate, "="),
+        ("date", since, ">="),
+        ("date", until, "<"),
+    ):
+        if value is not None:
+            clauses.append(f"{column} {op} ?")
+            params.append(str(value))
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+    conn = conn or connect()
+    rows = conn.execute(
+        f"SELECT date, {', '.join(SESSION_COLUMNS)} FROM sessions {where} ORDER BY date",
+        params
+    ).fetchall()
+
+    columns = {"date": np.array([r["date"][:19] for r in rows], dtype="datetime64[s]")}
+    for name in SESSION_COLUMNS:
+        columns[name] = np.array(
+            [np.nan if r[name] is None else r[name] for r in rows],
+            dtype=float
+        )
+    return columns
+
+
+def trend(metric="overall_score", role=None, candidate=None, unit="M", conn=None):
+    """
+    Mean of a session metric per period (unit: "D", "W" or "M") plus the
+    least-squares slope per period. Sessions without the metric are skipped.
+    """
+    cols = load_columns(role=role, candidate=candidate, conn=conn)
+    values = cols[metric]
+    mask = ~np.isnan(values)
+    if not mask.any():
+        return {"periods": [], "means": [], "counts": [], "slope": 0.0}
+
+    periods = cols["date"][mask].astype(f"datetime64[{unit}]")
+    values = values[mask]
+
+    uniq, inverse = np.unique(periods, return_inverse=True)
+    counts = np.bincount(inverse)
+    means = np.bincount(inverse, weights=values) / counts
+
+    # Period index in units since the first period, so gaps count
+    x = (uniq - uniq[0]).astype(float)
+    slope = float(np.polyfit(x, means, 1)[0]) if len(uniq) > 1 else 0.0
+
+    return {
+        "periods": [str(p) for p in uniq],
+        "means": np.round(means, 2).tolist(),
+        "counts": counts.tolist(),
+        "slope": round(slope, 3),
+    }
+
+
+def percentile_bands(metric="overall_score", role=None, percentiles=(10, 25, 50, 75, 90), conn=None):
+    values = load_columns(role=role, conn=conn)[metric]
+    values = values[~np.isnan(values)]
+    if not len(values):
+        return {}
+    bands = np.percentile(values, percentiles)
+    return {f"p{p}": round(float(b), 2) for p, b in zip(percentiles, bands)}
+
+
+def percentile_rank(score, metric="overall_score", role=None, conn=None) -> float:
+    """
+    Share of sessions (0-100) scoring at or below score, for a session-level
+    metric (SESSION_COLUMNS). Read from the rollups, so it costs one row
+    lookup; scores are compared at the rollup's 0.1 resolution.
+    """
+    summary = read_rollup(*(("role", role) if role else ("all", "")), conn=conn).get(metric)
+    if not summary or not summary["count"]:
+        return 0.0
+    at_or_below = sum(summary["hist"][:_session_bin(score) + 1])
+    return round(100.0 * at_or_below / summary["count"], 1)
@@ -0,0 +1,190 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+
+# Expired entries that are never read again are only removed by a full
+# directory scan, run at least this often (seconds) while writing
+SWEEP_INTERVAL_SEC = 600
+
+
+def make_key(*parts) -> str:
+    """
+    Content-addressed key: sha256 over the JSON encoding of parts.
+    """
+    raw = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class DiskCache:
+    """
+    File-per-entry cache with LRU eviction by total size and idle age.
+
+    An entry's mtime is its last use (hits touch it), so the oldest mtime
+    is evicted first when the directory exceeds max_bytes, and anything
+    unused for longer than max_age_sec is dropped. Writes go through a
+    temp file + os.replace, so concurrent readers never see partial data.
+
+    The total size is tracked as entries are written and removed; the
+    directory is only scanned when that total goes over max_bytes, on the
+    first write, and every SWEEP_INTERVAL_SEC (which also corrects for
+    other processes writing to the same directory).
+    """
+
+    def __init__(self, directory, max_bytes: int, max_age_sec: float, suffix: str = ".bin"):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.max_age_sec = max_age_sec
+        self.suffix = suffix
+        self._lock = threading.Lock()
+        # Bytes in the directory as of the last scan plus changes since
+        # (None until the first scan)
+        self._size = None
+        self._swept = 0.0
+
+    def path(self, key: str) -> Path:
+        return self.directory / f"{key}{self.suffix}"
+
+    def get_path(self, key: str):
+        """
+        Path of a fresh entry (marking it as used), or None.
+        """
+        path = self.path(key)
+        try:
+            info = path.stat()
+            if time.time() - info.st_mtime > self.max_age_sec:
+                path.unlink(missing_ok=True)
+                self._track(-info.st_size)
+                return None
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def get(self, key: str):
+        path = self.get_path(key)
+        if path is None:
+            return None
+        try:
+            return path.read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def put(self, key: str, data: bytes):
+        path = self.path(key)
+        try:
+            replaced = path.stat().st_size
+        except FileNotFoundError:
+            replaced = 0
+        tmp = path.with_name(f".{path.name}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+        self._track(len(data) - replaced)
+
+        with self._lock:
+            sweep = (
+                self._size is None
+                or self._size > self.max_bytes
+                or time.time() - self._swept > SWEEP_INTERVAL_SEC
+            )
+        if sweep:
+            self.evict()
+
+    def _track(self, delta: int):
+        with self._lock:
+            if self._size is not None:
+                self._size += delta
+
+    def get_json(self, key: str):
+        data = self.get(key)
+        if data is None:
+            return None
+        try:
+            return json.loads(data.decode("utf-8"))
+        except ValueError:
+            return None
+
+    def put_json(self, key: str, value):
+        self.put(key, json.dumps(value, ensure_ascii=False).encode("utf-8"))
+
+    def delete(self, key: str):
+        path = self.path(key)
+        try:
+            size = path.stat().st_size
+            path.unlink()
+        except FileNotFoundError:
+            return
+        self._track(-size)
+
+    def evict(self):
+        """
+        Scans the directory: drops expired entries, then the least recently
+        used ones until the total fits max_bytes.
+        """
+        with self._lock:
+            now = time.time()
+            entries = []
+            for path in self.directory.glob(f"*{self.suffix}"):
+                try:
+                    info = path.stat()
+                except FileNotFoundError:
+                    continue
+                if now - info.st_mtime > self.max_age_sec:
+                    path.unlink(missing_ok=True)
+                    continue
+                entries.append((info.st_mtime, info.st_size, path))
+
+            total = sum(size for _, size, _ in entries)
+            if total > self.max_bytes:
+                entries.sort()
+                for _, size, path in entries:
+                    if total <= self.max_bytes:
+                        break
+                    path.unlink(missing_ok=True)
+                    total -= size
+
+            self._size = total
+            self._swept = now
+
+
+class TieredCache:
+    """
+    Bounded in-memory LRU for JSON-able values, optionally backed by a
+    DiskCache so entries survive restarts. Disk hits are promoted to memory.
+    """
+
+    def __init__(self, max_items: int, disk: DiskCache = None):
+        self.max_items = max_items
+        self.disk = disk
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                return self._items[key]
+
+        if self.disk is None:
+            return None
+        value = self.disk.get_json(key)
+        if value is not None:
+            self._remember(key, value)
+        return value
+
+    def put(self, key: str, value):
+        self._remember(key, value)
+        if self.disk is not None:
+            self.disk.put_json(key, value)
+
+    def _remember(self, key, value):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
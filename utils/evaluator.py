@@ -1,9 +1,69 @@
 import json
 import re
-from llm.ollama_client import call_ollama_http
+from dataclasses import dataclass, asdict
+from llm import router
+from llm.scheduler import PRIORITY_EVALUATION
+from llm.compaction import estimate_tokens
+from utils.disk_cache import DiskCache, TieredCache, make_key
+from config import (
+    MODEL_CONTEXT_TOKENS,
+    CACHE_DIR,
+    EVAL_CACHE_SIZE,
+    EVAL_CACHE_DISK,
+    EVAL_CACHE_MAX_MB,
+    EVAL_CACHE_MAX_AGE_DAYS,
+    EVAL_NUM_PREDICT,
+    EVAL_MAX_RETRIES,
+)
 
-def evaluate_answer(question: str, answer: str, model: str):
-    prompt = f"""
+# Bump whenever the evaluator prompts change; part of the memo key.
+EVALUATOR_PROMPT_VERSION = 3
+
+SCORE_FIELDS = ("clarity", "confidence", "technical_depth")
+EVAL_FIELDS = SCORE_FIELDS + ("strength", "improvement")
+
+STATUS_OK = "ok"
+STATUS_FAILED = "failed"
+
+_SCORE_SCHEMA = {"type": "integer", "minimum": 0, "maximum": 10}
+
+# Sent as Ollama `format`, so the model can only emit matching JSON
+EVALUATION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        **{k: _SCORE_SCHEMA for k in SCORE_FIELDS},
+        "strength": {"type": "string"},
+        "improvement": {"type": "string"},
+    },
+    "required": list(EVAL_FIELDS),
+}
+
+BATCH_SCHEMA = {
+    "type": "array",
+    "items": {
+        "type": "object",
+        "properties": {"index": {"type": "integer"}, **EVALUATION_SCHEMA["properties"]},
+        "required": ["index"] + list(EVAL_FIELDS),
+    },
+}
+
+
+@dataclass
+class Evaluation:
+    clarity: int = 0
+    confidence: int = 0
+    technical_depth: int = 0
+    strength: str = ""
+    improvement: str = ""
+    status: str = STATUS_OK
+    error: str | None = None
+    model: str | None = None
+    attempts: int = 1
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+EVALUATOR_INSTRUCTIONS = """
 You are an interview evaluator.
 
 Evaluate the following answer on a scale of 0 to 10(integers only) for:
@@ -14,17 +74,73 @@ Evaluate the following answer on a scale of 0 to 10(integers only) for:
 Then provide:
 - One short strength
 - One specific improvement suggestion
+"""
 
+# Static prompt prefixes (instructions + output format). The per-answer
+# part always comes last, so Ollama can reuse the evaluated prefix.
+SINGLE_PREFIX = EVALUATOR_INSTRUCTIONS + """
 Return ONLY valid JSON in this exact format:
 
-{{
+{
   "clarity": 0,
   "confidence": 0,
   "technical_depth": 0,
   "strength": "",
   "improvement": ""
-}}
+}
+"""
 
+BATCH_PREFIX = EVALUATOR_INSTRUCTIONS + """
+Apply this to EACH item below independently.
+
+Return ONLY a valid JSON array with one object per item, in this exact format:
+
+[
+  {
+    "index": 0,
+    "clarity": 0,
+    "confidence": 0,
+    "technical_depth": 0,
+    "strength": "",
+    "improvement": ""
+  }
+]
+
+"index" must be the item number shown in the item heading.
+"""
+
+_eval_cache = TieredCache(
+    EVAL_CACHE_SIZE,
+    disk=DiskCache(
+        f"{CACHE_DIR}/evaluations",
+        max_bytes=EVAL_CACHE_MAX_MB * 1024 * 1024,
+        max_age_sec=EVAL_CACHE_MAX_AGE_DAYS * 86400,
+        suffix=".json"
+    ) if EVAL_CACHE_DISK else None
+)
+
+
+def _cache_key(question: str, answer: str, model: str) -> str:
+    normalized = re.sub(r"\s+", " ", answer or "").strip().lower()
+    return make_key(question.strip(), normalized, model, EVALUATOR_PROMPT_VERSION)
+
+
+def evaluate_answer(question: str, answer: str, model: str = None) -> dict:
+    """
+    Scores one answer. Models come from the "evaluation" route (model, if
+    given, first); the result's "model" names the one that answered.
+
+    Never raises: a reply that doesn't validate is retried up to
+    EVAL_MAX_RETRIES times, and an item that still fails (or a call that
+    fails on every routed model) comes back with status "failed".
+    """
+    model = model or router.primary_model(router.TASK_EVALUATION)
+    key = _cache_key(question, answer, model)
+    cached = _eval_cache.get(key)
+    if cached is not None:
+        return dict(cached)
+
+    prompt = f"""
 Question:
 {question}
 
@@ -32,18 +148,172 @@ Answer:
 {answer}
 """
 
-    ok, response = call_ollama_http(model, prompt)
+    error = None
+    for attempt in range(1, EVAL_MAX_RETRIES + 2):
+        stats = {}
+        ok, response = router.generate(
+            router.TASK_EVALUATION,
+            prompt,
+            model=model,
+            prefix=SINGLE_PREFIX,
+            options={"num_predict": EVAL_NUM_PREDICT},
+            stats=stats,
+            priority=PRIORITY_EVALUATION,
+            response_format=EVALUATION_SCHEMA
+        )
+        if not ok:
+            error = response
+            break
 
-    if not ok:
-        raise RuntimeError(response)
+        try:
+            evaluation = parse_evaluation(response)
+        except ValueError as e:
+            error = str(e)
+            continue
 
-    # ✅ Extract JSON safely
-    match = re.search(r"\{[\s\S]*\}", response)
+        evaluation.model = stats["model"]
+        evaluation.attempts = attempt
+        result = evaluation.to_dict()
+        # Only cache answers from the model the key names
+        if not stats["fallbacks"]:
+            _eval_cache.put(key, result)
+        return dict(result)
 
-    if not match:
-        raise ValueError(f"No JSON found in LLM output:\n{response}")
+    return Evaluation(status=STATUS_FAILED, error=error, attempts=attempt).to_dict()
 
+
+def _extract_json(response: str, opener: str):
+    """
+    The first complete JSON value starting at `opener` ("{" or "["), so
+    chatter before or after it is ignored. Raises ValueError.
+    """
+    text = response.strip()
+    try:
+        return json.loads(text)
+    except ValueError:
+        pass
+
+    decoder = json.JSONDecoder()
+    start = text.find(opener)
+    while start != -1:
+        try:
+            return decoder.raw_decode(text, start)[0]
+        except ValueError:
+            start = text.find(opener, start + 1)
+    raise ValueError(f"No JSON found in LLM output:\n{response}")
+
+
+def _score(value) -> int:
+    return min(10, max(0, int(round(float(value)))))
+
+
+def validate_evaluation(obj) -> Evaluation:
+    """
+    Typed Evaluation from a parsed JSON object; scores are clamped to 0..10.
+    Raises ValueError for missing fields or non-numeric scores.
+    """
+    if not isinstance(obj, dict):
+        raise ValueError(f"Expected a JSON object, got {type(obj).__name__}")
+    missing = [k for k in EVAL_FIELDS if k not in obj]
+    if missing:
+        raise ValueError(f"Evaluation is missing {', '.join(missing)}")
     try:
-        return json.loads(match.group())
-    except json.JSONDecodeError as e:
-        raise ValueError(f"Invalid JSON returned by LLM:\n{match.group()}") from e
+        scores = {k: _score(obj[k]) for k in SCORE_FIELDS}
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Non-numeric score in evaluation: {obj}") from e
+    return Evaluation(
+        **scores,
+        strength=str(obj["strength"] or "").strip(),
+        improvement=str(obj["improvement"] or "").strip()
+    )
+
+
+def parse_evaluation(response: str) -> Evaluation:
+    return validate_evaluation(_extract_json(response, "{"))
+
+
+def build_batch_items(items):
+    """
+    items: list of (index, question, answer) -> the per-call part of a batch prompt
+    """
+    return "\n" + "\n".join(
+        f"### Item {idx}\nQuestion:\n{question}\n\nAnswer:\n{answer}\n"
+        for idx, question, answer in items
+    )
+
+
+def batch_fits(items) -> bool:
+    """
+    True when a batch prompt for items (plus its output) fits the model's context.
+    """
+    prompt = BATCH_PREFIX + build_batch_items(items)
+    needed = estimate_tokens(prompt) + EVAL_NUM_PREDICT * len(items)
+    return needed <= MODEL_CONTEXT_TOKENS
+
+
+def _parse_batch(response: str, wanted):
+    try:
+        data = _extract_json(response, "[")
+    except ValueError:
+        return {}
+    if not isinstance(data, list):
+        return {}
+
+    results = {}
+    for obj in data:
+        try:
+            idx = int(obj.get("index"))
+            evaluation = validate_evaluation(obj)
+        except (AttributeError, TypeError, ValueError):
+            continue
+        if idx in wanted:
+            results[idx] = evaluation
+    return results
+
+
+def evaluate_answers_batch(items, model: str = None):
+    """
+    Scores several (index, question, answer) items in one call.
+
+    Returns {index: evaluation}. Items the batch output doesn't cover
+    (or covers with malformed JSON) are re-scored one by one.
+    """
+    model = model or router.primary_model(router.TASK_EVALUATION)
+    results = {}
+    uncached = []
+    for idx, question, answer in items:
+        cached = _eval_cache.get(_cache_key(question, answer, model))
+        if cached is not None:
+            results[idx] = dict(cached)
+        else:
+            uncached.append((idx, question, answer))
+
+    if len(uncached) > 1:
+        stats = {}
+        # The route's deadline is budgeted for one answer; the batch asks
+        # for len(uncached) times the output
+        ok, response = router.generate(
+            router.TASK_EVALUATION,
+            build_batch_items(uncached),
+            model=model,
+            prefix=BATCH_PREFIX,
+            options={"num_predict": EVAL_NUM_PREDICT * len(uncached)},
+            stats=stats,
+            priority=PRIORITY_EVALUATION,
+            response_format=BATCH_SCHEMA,
+            deadline=router.total_deadline(router.TASK_EVALUATION) * len(uncached)
+        )
+        if ok:
+            parsed = _parse_batch(response, {idx for idx, _, _ in uncached})
+            for idx, question, answer in uncached:
+                if idx in parsed:
+                    parsed[idx].model = stats["model"]
+                    results[idx] = parsed[idx].to_dict()
+                    if not stats["fallbacks"]:
+                        _eval_cache.put(_cache_key(question, answer, model), results[idx])
+
+    for idx, question, answer in items:
+        if idx not in results:
+            results[idx] = evaluate_answer(question, answer, model)
+
+    return results
@@ -0,0 +1,297 @@
+import argparse
+import json
+import sqlite3
+import threading
+from pathlib import Path
+
+from config import SESSIONS_DB_PATH
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id          TEXT PRIMARY KEY,
+    role                TEXT,
+    candidate           TEXT,
+    date                TEXT,
+    total_questions     INTEGER,
+    avg_answer_duration REAL,
+    avg_clarity         REAL,
+    avg_confidence      REAL,
+    avg_technical_depth REAL,
+    overall_score       REAL,
+    meta                TEXT,
+    aggregated_feedback TEXT
+);
+
+CREATE TABLE IF NOT EXISTS questions (
+    session_id            TEXT NOT NULL REFERENCES sessions(session_id) ON DELETE CASCADE,
+    idx                   INTEGER NOT NULL,
+    question              TEXT,
+    answer_text           TEXT,
+    duration_sec          REAL,
+    transcript_confidence REAL,
+    PRIMARY KEY (session_id, idx)
+);
+
+CREATE TABLE IF NOT EXISTS evaluations (
+    session_id      TEXT NOT NULL,
+    idx             INTEGER NOT NULL,
+    clarity         REAL,
+    confidence      REAL,
+    technical_depth REAL,
+    strength        TEXT,
+    improvement     TEXT,
+    raw             TEXT,
+    PRIMARY KEY (session_id, idx),
+    FOREIGN KEY (session_id, idx) REFERENCES questions(session_id, idx) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_sessions_role_date ON sessions(role, date);
+CREATE INDEX IF NOT EXISTS idx_sessions_date ON sessions(date);
+CREATE INDEX IF NOT EXISTS idx_sessions_score ON sessions(overall_score);
+"""
+
+# Columns added after the first release: (table, column, type)
+MIGRATIONS = [
+    ("sessions", "candidate", "TEXT"),
+]
+
+POST_MIGRATION = """
+CREATE INDEX IF NOT EXISTS idx_sessions_candidate_date ON sessions(candidate, date);
+"""
+
+_local = threading.local()
+_init_lock = threading.Lock()
+_initialized = set()
+
+
+def connect(path=SESSIONS_DB_PATH) -> sqlite3.Connection:
+    """
+    Per-thread connection in WAL mode (readers don't block the writer).
+    """
+    path = str(path)
+    conns = getattr(_local, "conns", None)
+    if conns is None:
+        conns = _local.conns = {}
+    if path in conns:
+        return conns[path]
+
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA foreign_keys=ON")
+
+    with _init_lock:
+        if path not in _initialized:
+            conn.executescript(SCHEMA)
+            _migrate(conn)
+            conn.executescript(POST_MIGRATION)
+            _initialized.add(path)
+
+    conns[path] = conn
+    return conn
+
+
+def _migrate(conn):
+    for table, column, col_type in MIGRATIONS:
+        existing = {row["name"] for row in conn.execute(f"PRAGMA table_info({table})")}
+        if column not in existing:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {col_type}")
+    conn.commit()
+
+
+def save_session(session, conn=None):
+    """
+    Inserts or replaces a finalized session with its questions and evaluations.
+    """
+    conn = conn or connect()
+    feedback = session.get("aggregated_feedback") or {}
+    meta = session.get("meta") or {}
+
+    with conn:
+        conn.execute("DELETE FROM sessions WHERE session_id = ?", (session["session_id"],))
+        conn.execute(
+            """
+            INSERT INTO sessions (
+                session_id, role, candidate, date, total_questions, avg_answer_duration,
+                avg_clarity, avg_confidence, avg_technical_depth, overall_score,
+                meta, aggregated_feedback
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                session["session_id"],
+                session.get("role"),
+                session.get("candidate"),
+                session.get("date"),
+                meta.get("total_questions", len(session.get("questions", []))),
+                meta.get("avg_answer_duration"),
+                feedback.get("avg_clarity"),
+                feedback.get("avg_confidence"),
+                feedback.get("avg_technical_depth"),
+                feedback.get("overall_score"),
+                json.dumps(meta, default=str),
+                json.dumps(feedback),
+            )
+        )
+
+        for idx, q in enumerate(session.get("questions", [])):
+            conn.execute(
+                """
+                INSERT INTO questions (
+                    session_id, idx, question, answer_text, duration_sec, transcript_confidence
+                ) VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    session["session_id"],
+                    idx,
+                    q.get("question"),
+                    q.get("answer_text"),
+                    q.get("duration_sec"),
+                    q.get("transcript_confidence"),
+                )
+            )
+
+            ev = q.get("evaluation")
+            if ev:
+                # Failed evaluations keep their record in raw but no scores
+                scored = ev.get("status", "ok") == "ok"
+                conn.execute(
+                    """
+                    INSERT INTO evaluations (
+                        session_id, idx, clarity, confidence, technical_depth,
+                        strength, improvement, raw
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (
+                        session["session_id"],
+                        idx,
+                        ev.get("clarity") if scored else None,
+                        ev.get("confidence") if scored else None,
+                        ev.get("technical_depth") if scored else None,
+                        ev.get("strength"),
+                        ev.get("improvement"),
+                        json.dumps(ev),
+                    )
+                )
+
+
+def load_session(session_id: str, conn=None):
+    """
+    Rebuilds the session dict (same shape as the JSON export), or None.
+    """
+    conn = conn or connect()
+    row = conn.execute("SELECT * FROM sessions WHERE session_id = ?", (session_id,)).fetchone()
+    if row is None:
+        return None
+
+    questions = []
+    for q in conn.execute(
+        """
+        SELECT q.*, e.raw AS evaluation
+        FROM questions q
+        LEFT JOIN evaluations e ON e.session_id = q.session_id AND e.idx = q.idx
+        WHERE q.session_id = ?
+        ORDER BY q.idx
+        """,
+        (session_id,)
+    ):
+        record = {
+            "question": q["question"],
+            "answer_text": q["answer_text"],
+            "duration_sec": q["duration_sec"],
+            "transcript_confidence": q["transcript_confidence"],
+        }
+        if q["evaluation"]:
+            record["evaluation"] = json.loads(q["evaluation"])
+        questions.append(record)
+
+    return {
+        "session_id": row["session_id"],
+        "role": row["role"],
+        "candidate": row["candidate"],
+        "date": row["date"],
+        "questions": questions,
+        "meta": json.loads(row["meta"] or "{}"),
+        "aggregated_feedback": json.loads(row["aggregated_feedback"] or "{}"),
+    }
+
+
+def query_sessions(
+    role=None,
+    candidate=None,
+    since=None,
+    until=None,
+    min_score=None,
+    max_score=None,
+    order_by="date",
+    descending=True,
+    limit=100,
+    conn=None
+):
+    """
+    Session summaries filtered by role, candidate, ISO date range and overall score.
+    """
+    if order_by not in ("date", "overall_score", "role"):
+        raise ValueError(f"Cannot order sessions by {order_by!r}")
+
+    clauses, params = [], []
+    if role is not None:
+        clauses.append("role = ?")
+        params.append(role)
+    if candidate is not None:
+        clauses.append("candidate = ?")
+        params.append(candidate)
+    if since is not None:
+        clauses.append("date >= ?")
+        params.append(str(since))
+    if until is not None:
+        clauses.append("date < ?")
+        params.append(str(until))
+    if min_score is not None:
+        clauses.append("overall_score >= ?")
+        params.append(min_score)
+    if max_score is not None:
+        clauses.append("overall_score <= ?")
+        params.append(max_score)
+
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    sql = f"""
+        SELECT session_id, role, candidate, date, total_questions, avg_answer_duration,
+               avg_clarity, avg_confidence, avg_technical_depth, overall_score
+        FROM sessions
+        {where}
+        ORDER BY {order_by} {"DESC" if descending else "ASC"}
+        LIMIT ?
+    """
+    conn = conn or connect()
+    return [dict(row) for row in conn.execute(sql, (*params, limit))]
+
+
+def import_json_sessions(directory, conn=None) -> int:
+    """
+    One-shot import of session_*.json files. Returns how many were imported.
+    """
+    conn = conn or connect()
+    count = 0
+    for path in sorted(Path(directory).glob("session_*.json")):
+        try:
+            with open(path) as f:
+                session = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if "session_id" not in session:
+            continue
+        save_session(session, conn=conn)
+        count += 1
+    return count
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import JSON interview sessions into SQLite")
+    parser.add_argument("directory", nargs="?", default="sessions")
+    parser.add_argument("--db", default=SESSIONS_DB_PATH)
+    args = parser.parse_args()
+
+    n = import_json_sessions(args.directory, conn=connect(args.db))
+    print(f"Imported {n} sessions into {args.db}")
@@ -2,26 +2,63 @@ import json
 import uuid
 from datetime import datetime
 from pathlib import Path
-from utils.evaluator import evaluate_answer
-from config import DEFAULT_MODEL
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from utils.evaluator import (
+    evaluate_answer,
+    evaluate_answers_batch,
+    batch_fits,
+    Evaluation,
+    STATUS_OK,
+    STATUS_FAILED,
+)
+from config import (
+    EVAL_CONCURRENCY,
+    EVAL_IN_BACKGROUND,
+    EVAL_BATCH_SIZE,
+    SESSIONS_DB_PATH,
+    SESSION_JSON_EXPORT,
+)
 from utils.aggregator import aggregate_feedback
+from utils.session_db import save_session
+from utils.analytics import update_rollups
+from utils.tracing import maybe_span
 
 
 SESSIONS_DIR = Path("sessions")
 SESSIONS_DIR.mkdir(exist_ok=True)
 
+# Process-wide evaluation pool, shared by every Streamlit session.
+_EVAL_EXECUTOR = ThreadPoolExecutor(
+    max_workers=EVAL_CONCURRENCY,
+    thread_name_prefix="evaluator"
+)
 
-def create_new_session(role: str):
+# Futures can't live in the (JSON-serialised) session dict, so in-flight
+# evaluations are tracked here by session_id -> {question index: Future}.
+# Every evaluation future resolves to {question index: evaluation}; a batch
+# future is registered under each of its indexes. Answers saved while the
+# session's previous evaluation is still running wait in _QUEUED
+# (session_id -> [(index, question, answer)]) and go out together when it
+# finishes. Imported modules survive Streamlit reruns, so these do too.
+_PENDING = {}
+_QUEUED = {}
+_PENDING_LOCK = threading.Lock()
+
+
+def create_new_session(role: str, candidate: str = None):
     return {
         "session_id": str(uuid.uuid4()),
         "role": role,
+        "candidate": candidate,
         "date": datetime.now().isoformat(),
         "questions": [],
         "meta": {}
     }
 
 
-def add_answer(session, question, answer_text, duration_sec, transcript_conf=1.0):
+def add_answer(session, question, answer_text, duration_sec, transcript_conf=1.0, tracer=None):
     session["questions"].append({
         "question": question,
         "answer_text": answer_text,
@@ -29,28 +66,185 @@ def add_answer(session, question, answer_text, duration_sec, transcript_conf=1.0
         "transcript_confidence": transcript_conf
     })
 
+    if not EVAL_IN_BACKGROUND:
+        return
+
+    # Scored right away; while the previous evaluation is still running,
+    # answers are held back and batched (up to EVAL_BATCH_SIZE)
+    idx = len(session["questions"]) - 1
+    session_id = session["session_id"]
+    with _PENDING_LOCK:
+        queued = _QUEUED.setdefault(session_id, [])
+        queued.append((idx, question, answer_text))
+        if _busy(session_id) and len(queued) < max(EVAL_BATCH_SIZE, 1):
+            return
+        futures = _submit_queued(session_id, tracer)
+    _flush_when_done(session_id, futures, tracer)
+
+
+def _busy(session_id) -> bool:
+    return any(not future.done() for future in _PENDING.get(session_id, {}).values())
+
+
+def _submit_queued(session_id, tracer=None) -> list:
+    """
+    Submits a session's queued answers; called with _PENDING_LOCK held, so
+    finalize_session sees each answer either queued or pending.
+    """
+    futures = []
+    for batch in _plan_batches(_QUEUED.pop(session_id, [])):
+        future = _EVAL_EXECUTOR.submit(_evaluate_items, batch, tracer)
+        pending = _PENDING.setdefault(session_id, {})
+        for item_idx, _, _ in batch:
+            pending[item_idx] = future
+        futures.append(future)
+    return futures
+
+
+def _flush_when_done(session_id, futures, tracer=None):
+    # Outside _PENDING_LOCK: a callback on a finished future runs at once
+    for future in futures:
+        future.add_done_callback(lambda _: _flush(session_id, tracer))
+
+
+def _flush(session_id, tracer=None):
+    """
+    Sends answers queued behind a session's evaluations once the last one
+    finishes (finalize_session takes them itself if it gets there first).
+    """
+    with _PENDING_LOCK:
+        if _busy(session_id) or not _QUEUED.get(session_id):
+            return
+        futures = _submit_queued(session_id, tracer)
+    _flush_when_done(session_id, futures, tracer)
+
+
+def _evaluate_items(items, tracer=None):
+    """
+    items: list of (index, question, answer) -> {index: evaluation}
+
+    Never raises, so one bad item can't abort finalize_session; anything
+    unexpected marks the whole chunk as failed.
+    """
+    indexes = [idx for idx, _, _ in items]
+    with maybe_span(tracer, "evaluate", questions=indexes) as span:
+        try:
+            if len(items) == 1:
+                idx, question, answer = items[0]
+                results = {idx: evaluate_answer(question=question, answer=answer)}
+            else:
+                results = evaluate_answers_batch(items)
+        except Exception as e:
+            results = {idx: Evaluation(status=STATUS_FAILED, error=str(e)).to_dict() for idx in indexes}
+        span["models"] = sorted({ev.get("model") for ev in results.values() if ev.get("model")})
+        span["failed"] = sum(1 for ev in results.values() if ev.get("status") == STATUS_FAILED)
+        return results
+
+
+def _plan_batches(items):
+    """
+    Groups items into EVAL_BATCH_SIZE chunks; chunks too large for the
+    model's context are split back into single-answer calls.
+    """
+    batches = []
+    for start in range(0, len(items), max(EVAL_BATCH_SIZE, 1)):
+        chunk = items[start:start + EVAL_BATCH_SIZE]
+        if len(chunk) > 1 and batch_fits(chunk):
+            batches.append(chunk)
+        else:
+            batches.extend([item] for item in chunk)
+    return batches
 
-def finalize_session(session):
-    for q in session["questions"]:
-        q["evaluation"] = evaluate_answer(
-            question=q["question"],
-            answer=q["answer_text"],
-            model=DEFAULT_MODEL
-        )
+
+def _take_pending(session):
+    """
+    Removes a session's in-flight futures ({index: Future}) and drops its
+    not-yet-submitted answers, which finalize_session evaluates itself.
+    """
+    with _PENDING_LOCK:
+        _QUEUED.pop(session["session_id"], None)
+        return _PENDING.pop(session["session_id"], {})
+
+
+def discard_session(session):
+    """
+    Drops (and cancels where possible) a session's in-flight evaluations.
+    """
+    if session is None:
+        return
+    for future in _take_pending(session).values():
+        future.cancel()
+
+
+def finalize_session(session, on_result=None, tracer=None):
+    """
+    Waits for in-flight evaluations, evaluates everything else on the
+    shared pool (in batches where they fit), then aggregates.
+
+    on_result(index, question) is called from the calling thread as each
+    evaluation completes, so the UI can render results progressively.
+    Spans recorded in tracer are stored in session["meta"]["spans"], and
+    the models that scored answers in session["meta"]["models"]["evaluation"].
+    """
+    questions = session["questions"]
+    pending = _take_pending(session)
+
+    futures = set()
+    unqueued = []
+    for idx, q in enumerate(questions):
+        # Re-finalizing: keep evaluations that already succeeded
+        if q.get("evaluation") and q["evaluation"].get("status", STATUS_OK) == STATUS_OK:
+            if on_result is not None:
+                on_result(idx, q)
+            continue
+
+        future = pending.get(idx)
+        if future is None or future.cancelled():
+            unqueued.append((idx, q["question"], q["answer_text"]))
+        else:
+            futures.add(future)
+
+    for batch in _plan_batches(unqueued):
+        futures.add(_EVAL_EXECUTOR.submit(_evaluate_items, batch, tracer))
+
+    for future in as_completed(futures):
+        for idx, evaluation in sorted(future.result().items()):
+            questions[idx]["evaluation"] = evaluation
+            if on_result is not None:
+                on_result(idx, questions[idx])
 
     durations = [q["duration_sec"] for q in session["questions"]]
 
-    session["meta"] = {
+    session["meta"].update({
         "total_questions": len(durations),
         "avg_answer_duration": round(sum(durations) / len(durations), 2) if durations else 0
-    }
+    })
+    eval_models = Counter(
+        q["evaluation"]["model"] for q in questions
+        if q.get("evaluation") and q["evaluation"].get("model")
+    )
+    session["meta"].setdefault("models", {})["evaluation"] = dict(eval_models)
+    if tracer is not None:
+        session["meta"]["spans"] = tracer.to_list()
     session["aggregated_feedback"] = aggregate_feedback(session["questions"])
 
+    save_session(session)
+    update_rollups(session)
 
+    if SESSION_JSON_EXPORT:
+        return export_session_json(session)
+    return Path(SESSIONS_DB_PATH)
+
+
+def export_session_json(session, directory=SESSIONS_DIR):
+    """
+    Writes the session as pretty-printed session_<id>.json (export format).
+    """
     filename = f"session_{session['session_id']}.json"
-    path = SESSIONS_DIR / filename
+    path = Path(directory) / filename
 
     with open(path, "w") as f:
         json.dump(session, f, indent=2)
 
     return path
+
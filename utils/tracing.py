@@ -0,0 +1,85 @@
+import json
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+
+class Tracer:
+    """
+    Collects lightweight timing spans for one interview.
+
+    Spans are plain dicts ({"name", "start", "duration_ms", ...attributes}),
+    so they can go straight into session["meta"] and out as JSON lines.
+    Safe to record into from worker threads.
+    """
+
+    def __init__(self):
+        self.spans = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str, **attrs):
+        """
+        Times the block; the yielded dict can be given more attributes.
+        """
+        record = {"name": name, "start": datetime.now().isoformat(timespec="milliseconds")}
+        record.update(attrs)
+        started = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record["duration_ms"] = round((time.perf_counter() - started) * 1000, 2)
+            self._append(record)
+
+    def add(self, name: str, duration_ms: float, **attrs):
+        """
+        Records a span measured elsewhere (e.g. on a background thread).
+        """
+        record = {
+            "name": name,
+            "start": datetime.now().isoformat(timespec="milliseconds"),
+            "duration_ms": round(duration_ms, 2),
+        }
+        record.update(attrs)
+        self._append(record)
+
+    def _append(self, record):
+        with self._lock:
+            self.spans.append(record)
+
+    def to_list(self) -> list:
+        with self._lock:
+            return [dict(s) for s in self.spans]
+
+    def to_jsonl(self) -> str:
+        return "".join(json.dumps(s, default=str) + "\n" for s in self.to_list())
+
+
+@contextmanager
+def maybe_span(tracer, name: str, **attrs):
+    """
+    tracer.span(...) when a tracer is given, otherwise a no-op record.
+    """
+    if tracer is None:
+        yield dict(attrs)
+    else:
+        with tracer.span(name, **attrs) as record:
+            yield record
+
+
+def llm_span_attrs(stats: dict) -> dict:
+    """
+    Derives throughput attributes from Ollama's final-chunk stats.
+    """
+    attrs = dict(stats)
+    eval_count = stats.get("eval_count", 0)
+    eval_ns = stats.get("eval_duration", 0)
+    prompt_count = stats.get("prompt_eval_count", 0)
+    prompt_ns = stats.get("prompt_eval_duration", 0)
+    if eval_count and eval_ns:
+        attrs["tokens_per_sec"] = round(eval_count / (eval_ns / 1e9), 2)
+    if prompt_count and prompt_ns:
+        attrs["prompt_tokens_per_sec"] = round(prompt_count / (prompt_ns / 1e9), 2)
+    return attrs
+